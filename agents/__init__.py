@@ -1,12 +1,34 @@
 # agents package
-from agents.config_ingestion_agent import ConfigIngestionAgent, ConfigValidationError
-from agents.scoping_agent import ScopingAgent
-from agents.plan_agent import PlanAgent
-from agents.conversion_agent import ConversionAgent, AmbiguityException, OutOfBoundaryException
-from agents.conversion_log import ConversionLog
-from agents.approval_gate import ApprovalGate, ApprovalRejectedError, CheckpointManager
+#
+# Public names are resolved lazily (PEP 562) so importing one agent does not
+# pull in the whole pipeline and its heavy dependencies (jsonschema, Jinja2,
+# LLM client SDKs, tree-sitter, ...).
+from typing import TYPE_CHECKING
 
-__all__ = [
+if TYPE_CHECKING:
+    from agents.config_ingestion_agent import ConfigIngestionAgent, ConfigValidationError
+    from agents.scoping_agent import ScopingAgent
+    from agents.plan_agent import PlanAgent
+    from agents.conversion_agent import ConversionAgent, AmbiguityException, OutOfBoundaryException
+    from agents.conversion_log import ConversionLog
+    from agents.approval_gate import ApprovalGate, ApprovalRejectedError, CheckpointManager
+
+# public name -> defining module
+_LAZY: dict[str, str] = {
+    "ConfigIngestionAgent":   "agents.config_ingestion_agent",
+    "ConfigValidationError":  "agents.config_ingestion_agent",
+    "ScopingAgent":           "agents.scoping_agent",
+    "PlanAgent":              "agents.plan_agent",
+    "ConversionAgent":        "agents.conversion_agent",
+    "AmbiguityException":     "agents.conversion_agent",
+    "OutOfBoundaryException": "agents.conversion_agent",
+    "ConversionLog":          "agents.conversion_log",
+    "ApprovalGate":           "agents.approval_gate",
+    "ApprovalRejectedError":  "agents.approval_gate",
+    "CheckpointManager":      "agents.approval_gate",
+}
+
+__all__ = (
     "ConfigIngestionAgent",
     "ConfigValidationError",
     "ScopingAgent",
@@ -18,4 +40,18 @@ __all__ = [
     "ApprovalGate",
     "ApprovalRejectedError",
     "CheckpointManager",
-]
+)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # later lookups bypass __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
@@ -49,6 +49,8 @@ Public API
 ----------
     from agents.agent_context import is_agent_mode, get_agent_name, require_llm_or_raise
 
+    # Detection runs once per process; reset_agent_cache() forces a re-scan.
+
     if is_agent_mode():
         # soft-fail: return template scaffold
         ...
@@ -77,7 +79,7 @@ T = TypeVar("T")
 # Known agent-mode environment variable signals (checked in priority order)
 # ---------------------------------------------------------------------------
 
-_AGENT_ENV_SIGNALS: list[tuple[str, str | None, str]] = [
+_AGENT_ENV_SIGNALS: tuple[tuple[str, str | None, str], ...] = (
     # (env_var_name, required_value_or_None_for_any_truthy, agent_label)
     ("AI_AGENT_MODE",    "1",        "generic-agent"),
     ("CURSOR_AGENT",     "1",        "cursor"),
@@ -86,12 +88,64 @@ _AGENT_ENV_SIGNALS: list[tuple[str, str | None, str]] = [
     ("COPILOT_AGENT",    "1",        "copilot"),
     ("TERM_PROGRAM",     "cursor",   "cursor"),
     ("TERM_PROGRAM",     "windsurf", "windsurf"),
-]
+)
+
+# Lookup tables derived from _AGENT_ENV_SIGNALS once at import time:
+#   _ENV_VAR_NAMES — distinct var names, in priority order
+#   _SIGNAL_TABLE  — (var, required_value) -> label; None means "any truthy value"
+_ENV_VAR_NAMES: tuple[str, ...] = tuple(dict.fromkeys(v for v, _, _ in _AGENT_ENV_SIGNALS))
+_SIGNAL_TABLE: dict[tuple[str, str | None], str] = {}
+for _var, _required, _label in _AGENT_ENV_SIGNALS:
+    _SIGNAL_TABLE.setdefault((_var, _required), _label)
+del _var, _required, _label
+
+# psutil is optional and only needed for the parent-process scan; it is
+# imported at most once per process (see _load_psutil).
+_psutil_mod = None
+_psutil_tried = False
+
+# Sentinel meaning "detection has not run yet" — None is a valid cached result.
+_UNSET = object()
+
+# Agent mode cannot change during a process lifetime, so the first detection
+# result is memoised here.  Call reset_agent_cache() to force re-detection.
+_AGENT_CACHE: "str | None | object" = _UNSET
 
 # ---------------------------------------------------------------------------
 # Custom exception
 # ---------------------------------------------------------------------------
 
+_RULE = "=" * 64
+
+# Static body of the CLI-mode hard-fail message; only context/error vary.
+_LLM_ERROR_TEMPLATE = (
+    f"\n{_RULE}\n"
+    "  LLM CONFIGURATION ERROR\n"
+    f"{_RULE}\n"
+    "  Context: {context}\n"
+    "  Error:   {error}\n"
+    "\n"
+    "  The pipeline cannot continue without a working LLM.\n"
+    "  No output file will be written.\n"
+    "\n"
+    "  How to fix:\n"
+    "    1. Check your API key / provider environment variables:\n"
+    "         ANTHROPIC_API_KEY            — Anthropic Claude\n"
+    "         OPENAI_API_KEY               — OpenAI GPT\n"
+    "         GOOGLE_API_KEY               — Google Gemini\n"
+    "         GOOGLE_CLOUD_PROJECT         — Vertex AI (+ GOOGLE_APPLICATION_CREDENTIALS)\n"
+    "         OLLAMA_MODEL                 — Local Ollama server\n"
+    "         LLM_BASE_URL                 — OpenAI-compatible (LM Studio, vLLM)\n"
+    "         LLAMACPP_MODEL_PATH          — Local GGUF file\n"
+    "    2. Or add to your job YAML:  llm.no_llm: true\n"
+    "       (template-only scaffold mode — no API key required)\n"
+    "    3. Or pass --no-llm on the command line\n"
+    "\n"
+    "  See AGENT.md \u00a7 LLM configuration for the full provider reference.\n"
+    f"{_RULE}\n"
+)
+
+
 class LLMConfigurationError(Exception):
     """
     Raised when the LLM is required but not available / not configured,
@@ -107,22 +161,42 @@ class LLMConfigurationError(Exception):
 
 def _detect_from_env() -> str | None:
     """Return the agent label if any known env var signal matches, else None."""
-    for var, required_val, label in _AGENT_ENV_SIGNALS:
-        actual = os.environ.get(var, "")
+    env = os.environ
+    for var in _ENV_VAR_NAMES:
+        actual = env.get(var)
         if not actual:
             continue
-        if required_val is None or actual.strip() == required_val:
+        label = _SIGNAL_TABLE.get((var, actual.strip())) or _SIGNAL_TABLE.get((var, None))
+        if label:
             return label
     return None
 
 
+def _load_psutil():
+    """Import psutil on first use; return the module or None if unavailable."""
+    global _psutil_mod, _psutil_tried
+    if not _psutil_tried:
+        try:
+            import psutil  # type: ignore
+            _psutil_mod = psutil
+        except ImportError:
+            pass
+        _psutil_tried = True
+    return _psutil_mod
+
+
 def _detect_from_parent_process() -> str | None:
     """
     Try to detect a known IDE as the parent process.
     Returns the agent label or None.  Never raises — any failure is silently ignored.
+    Skipped entirely on Windows.
     """
+    if sys.platform.startswith("win"):
+        return None
+    psutil = _load_psutil()
+    if psutil is None:
+        return None
     try:
-        import psutil  # type: ignore
         parent = psutil.Process(os.getpid()).parent()
         if parent is None:
             return None
@@ -142,11 +216,27 @@ def get_agent_name() -> str | None:
     running inside a recognised agent environment.
 
     Examples: ``"cursor"``, ``"windsurf"``, ``"copilot"``, ``"generic-agent"``
+
+    The result is computed once per process and cached; see
+    :func:`reset_agent_cache`.
+    """
+    global _AGENT_CACHE
+    if _AGENT_CACHE is _UNSET:
+        # Single assignment — atomic under the GIL, no lock needed.
+        _AGENT_CACHE = _detect_from_env() or _detect_from_parent_process()
+    return _AGENT_CACHE  # type: ignore[return-value]
+
+
+def reset_agent_cache() -> None:
+    """
+    Discard the cached agent-mode detection result.
+
+    The next call to :func:`get_agent_name` / :func:`is_agent_mode` re-reads
+    the environment.  Intended for tests and for callers that change the
+    agent env vars after the first detection.
     """
-    label = _detect_from_env()
-    if label:
-        return label
-    return _detect_from_parent_process()
+    global _AGENT_CACHE
+    _AGENT_CACHE = _UNSET
 
 
 def is_agent_mode() -> bool:
@@ -229,29 +319,5 @@ def require_llm_or_raise(
 
     # CLI / human mode — hard fail with actionable message
     raise LLMConfigurationError(
-        f"\n"
-        f"{'='*64}\n"
-        f"  LLM CONFIGURATION ERROR\n"
-        f"{'='*64}\n"
-        f"  Context: {context}\n"
-        f"  Error:   {error}\n"
-        f"\n"
-        f"  The pipeline cannot continue without a working LLM.\n"
-        f"  No output file will be written.\n"
-        f"\n"
-        f"  How to fix:\n"
-        f"    1. Check your API key / provider environment variables:\n"
-        f"         ANTHROPIC_API_KEY            — Anthropic Claude\n"
-        f"         OPENAI_API_KEY               — OpenAI GPT\n"
-        f"         GOOGLE_API_KEY               — Google Gemini\n"
-        f"         GOOGLE_CLOUD_PROJECT         — Vertex AI (+ GOOGLE_APPLICATION_CREDENTIALS)\n"
-        f"         OLLAMA_MODEL                 — Local Ollama server\n"
-        f"         LLM_BASE_URL                 — OpenAI-compatible (LM Studio, vLLM)\n"
-        f"         LLAMACPP_MODEL_PATH          — Local GGUF file\n"
-        f"    2. Or add to your job YAML:  llm.no_llm: true\n"
-        f"       (template-only scaffold mode — no API key required)\n"
-        f"    3. Or pass --no-llm on the command line\n"
-        f"\n"
-        f"  See AGENT.md \u00a7 LLM configuration for the full provider reference.\n"
-        f"{'='*64}\n"
+        _LLM_ERROR_TEMPLATE.format(context=context, error=error)
     ) from error
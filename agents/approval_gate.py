@@ -14,11 +14,26 @@ Checkpoint/Resume:
   - On resume, skips already-completed steps
 """
 
+import io
+import itertools
 import json
 import logging
+import os
 import sys
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping
+
+# Optional orjson for faster checkpoint parsing on resume
+try:
+    import orjson  # type: ignore
+
+    _loads = orjson.loads
+except ImportError:
+    def _loads(data: bytes) -> Any:
+        return json.loads(data.decode("utf-8"))
 
 logger = logging.getLogger(__name__)
 
@@ -39,8 +54,10 @@ class ApprovalGate:
     The pipeline MUST NOT proceed to conversion without this gate passing.
     """
 
-    VALID_APPROVE  = {"y", "yes", "approve", "approved", "accept"}
-    VALID_REJECT   = {"n", "no", "reject", "rejected", "decline"}
+    VALID_APPROVE: frozenset[str] = frozenset({"y", "yes", "approve", "approved", "accept"})
+    VALID_REJECT:  frozenset[str] = frozenset({"n", "no", "reject", "rejected", "decline"})
+
+    _APPROVAL_PROMPT = "\nApprove this migration plan? [yes/no, or 'view' to reprint]: "
 
     def __init__(
         self,
@@ -55,6 +72,15 @@ class ApprovalGate:
         self.mode                 = mode
         self.approval_marker_path = Path(approval_marker_path) if approval_marker_path else None
 
+        separator    = "=" * 72
+        self._banner = f"\n{separator}\n  HUMAN APPROVAL REQUIRED — AI Migration Tool\n{separator}"
+        self._footer = (
+            f"\n{separator}\n"
+            "[!] No code has been written yet.\n"
+            "   The Conversion Agent will only start after your approval.\n"
+            f"{separator}"
+        )
+
     def request_approval(self, plan_path: Path, plan_content: str) -> bool:
         """
         Show the plan to the approver and return True if approved.
@@ -82,33 +108,29 @@ class ApprovalGate:
     # ------------------------------------------------------------------
 
     def _cli_prompt(self, plan_path: Path, plan_content: str) -> bool:
-        separator = "=" * 72
-
-        print(f"\n{separator}")
-        print("  HUMAN APPROVAL REQUIRED — AI Migration Tool")
-        print(separator)
-        print(f"\nPlan document saved at:\n  {plan_path}\n")
-        print("Please review the plan document above before approving.")
-        print("Opening plan summary...\n")
-
-        # Print a condensed summary (first 60 lines)
-        lines = plan_content.splitlines()
-        preview = "\n".join(lines[:60])
-        if len(lines) > 60:
-            preview += f"\n\n... [{len(lines) - 60} more lines — see {plan_path}] ..."
-        print(preview)
-
-        print(f"\n{separator}")
-        print("[!] No code has been written yet.")
-        print("   The Conversion Agent will only start after your approval.")
-        print(separator)
+        # Print a condensed summary (first 60 lines).  Lines are pulled lazily
+        # so only the preview is materialised, not the whole document.
+        buf = io.StringIO(plan_content)
+        preview = "".join(itertools.islice(buf, 60))
+        if not preview.endswith("\n"):
+            preview += "\n"
+        remaining = sum(1 for _ in buf)
+        if remaining:
+            preview += f"\n... [{remaining} more lines — see {plan_path}] ...\n"
+
+        sys.stdout.write(
+            f"{self._banner}\n"
+            f"\nPlan document saved at:\n  {plan_path}\n\n"
+            "Please review the plan document above before approving.\n"
+            "Opening plan summary...\n\n"
+            f"{preview}"
+            f"{self._footer}\n"
+        )
+        sys.stdout.flush()
 
         while True:
             try:
-                answer = input(
-                    "\nApprove this migration plan? "
-                    "[yes/no, or 'view' to reprint]: "
-                ).strip().lower()
+                answer = input(self._APPROVAL_PROMPT).strip().lower()
             except (EOFError, KeyboardInterrupt):
                 print("\nInterrupted — plan NOT approved.")
                 raise ApprovalRejectedError("Approval interrupted by user (Ctrl+C / EOF).")
@@ -173,16 +195,60 @@ class CheckpointManager:
           "block_reason": str | null,
           "checkpoint_at": ISO-8601 str
         }
+
+    Writes are atomic: the state is serialised to a sibling ``.tmp`` file
+    and swapped into place with ``os.replace``, so a crash mid-write never
+    leaves a torn checkpoint behind.
+
+    With ``async_flush=True`` writes are handed to a background thread that
+    coalesces bursts of updates into a single write; call ``close()`` (or use
+    the manager as a context manager) to drain pending writes.
     """
 
-    def __init__(self, checkpoints_dir: str | Path, run_id: str, feature: str) -> None:
+    def __init__(
+        self,
+        checkpoints_dir: str | Path,
+        run_id: str,
+        feature: str,
+        pretty: bool = True,
+        async_flush: bool = False,
+    ) -> None:
+        """
+        Args:
+            checkpoints_dir: Directory that holds the checkpoint files
+            run_id:          Stable run identifier (file name prefix)
+            feature:         Feature name recorded in the checkpoint
+            pretty:          Indent the JSON output; pass False for large plans
+                             to write compact JSON (roughly half the bytes)
+            async_flush:     Write from a background thread instead of
+                             blocking the caller on every update
+        """
         self.dir     = Path(checkpoints_dir)
         self.run_id  = run_id
         self.feature = feature
+        self.pretty  = pretty
         self.dir.mkdir(parents=True, exist_ok=True)
         self.path    = self.dir / f"{run_id}-checkpoint.json"
 
         self._state: dict = self._load_or_init()
+        # O(1) mirrors of the step lists; the lists keep JSON-friendly ordering
+        self._completed_set: set[str] = set(self._state["completed_steps"])
+        self._blocked_set:   set[str] = set(self._state["blocked_steps"])
+
+        # _state_lock guards mutation/snapshot; _io_lock orders file writes
+        self._state_lock = threading.Lock()
+        self._io_lock    = threading.Lock()
+        self._dirty      = threading.Event()   # wakes the writer thread
+        self._pending    = False               # unsaved updates exist
+        self._closing    = False
+        self._writer: threading.Thread | None = None
+        if async_flush:
+            self._writer = threading.Thread(
+                target=self._writer_loop,
+                name=f"checkpoint-{run_id}",
+                daemon=True,
+            )
+            self._writer.start()
 
     # ------------------------------------------------------------------
     # Public API
@@ -190,31 +256,54 @@ class CheckpointManager:
 
     def is_completed(self, step_id: str) -> bool:
         """Return True if this step was already completed in a previous run."""
-        return step_id in self._state["completed_steps"]
+        return step_id in self._completed_set
+
+    def is_blocked(self, step_id: str) -> bool:
+        """Return True if this step was recorded as blocked."""
+        return step_id in self._blocked_set
 
     def mark_completed(self, step_id: str, all_step_ids: list[str]) -> None:
         """Record a step as completed and update pending/last_completed."""
-        if step_id not in self._state["completed_steps"]:
-            self._state["completed_steps"].append(step_id)
-        self._state["last_completed_step"] = step_id
-        self._state["pending_steps"] = [
-            s for s in all_step_ids
-            if s not in self._state["completed_steps"]
-            and s not in self._state["blocked_steps"]
-        ]
-        self._state["checkpoint_at"] = datetime.now(timezone.utc).isoformat()
+        with self._state_lock:
+            if step_id not in self._completed_set:
+                self._completed_set.add(step_id)
+                self._state["completed_steps"].append(step_id)
+            self._state["last_completed_step"] = step_id
+            done = self._completed_set | self._blocked_set
+            self._state["pending_steps"] = [s for s in all_step_ids if s not in done]
+            self._state["checkpoint_at"] = datetime.now(timezone.utc).isoformat()
         self._flush()
 
     def mark_blocked(self, step_id: str, reason: str) -> None:
         """Record a step as blocked (ambiguous/out-of-boundary)."""
-        if step_id not in self._state["blocked_steps"]:
-            self._state["blocked_steps"].append(step_id)
-        self._state["block_reason"] = reason
-        self._state["checkpoint_at"] = datetime.now(timezone.utc).isoformat()
+        with self._state_lock:
+            if step_id not in self._blocked_set:
+                self._blocked_set.add(step_id)
+                self._state["blocked_steps"].append(step_id)
+            self._state["block_reason"] = reason
+            self._state["checkpoint_at"] = datetime.now(timezone.utc).isoformat()
         self._flush()
 
-    def get_state(self) -> dict:
-        return dict(self._state)
+    def get_state(self) -> Mapping:
+        """Return a read-only view of the checkpoint state (no copy)."""
+        return MappingProxyType(self._state)
+
+    def close(self) -> None:
+        """Drain pending background writes and stop the writer thread."""
+        if self._writer is None or self._closing:
+            return
+        self._closing = True
+        self._dirty.set()
+        self._writer.join()
+        if self._pending:
+            self._pending = False
+            self._write()  # an update raced the writer's final pass
+
+    def __enter__(self) -> "CheckpointManager":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def summary(self) -> str:
         s = self._state
@@ -234,8 +323,7 @@ class CheckpointManager:
 
     def _load_or_init(self) -> dict:
         if self.path.exists():
-            with open(self.path, "r", encoding="utf-8") as f:
-                state = json.load(f)
+            state = _loads(self.path.read_bytes())
             logger.info(
                 "Resuming from checkpoint: %s (last completed: %s)",
                 self.path, state.get("last_completed_step")
@@ -253,5 +341,33 @@ class CheckpointManager:
         }
 
     def _flush(self) -> None:
-        with open(self.path, "w", encoding="utf-8") as f:
-            json.dump(self._state, f, indent=2)
+        if self._writer is not None and not self._closing:
+            self._pending = True
+            self._dirty.set()  # picked up by _writer_loop
+            return
+        self._write()
+
+    def _write(self) -> None:
+        # Snapshot under the I/O lock so concurrent writers land in order
+        with self._io_lock:
+            with self._state_lock:
+                if self.pretty:
+                    data = json.dumps(self._state, indent=2)
+                else:
+                    data = json.dumps(self._state, separators=(",", ":"))
+            tmp = self.path.with_suffix(".json.tmp")
+            tmp.write_text(data, encoding="utf-8")
+            os.replace(tmp, self.path)
+
+    def _writer_loop(self) -> None:
+        while True:
+            self._dirty.wait()
+            self._dirty.clear()
+            if self._pending:
+                self._pending = False
+                try:
+                    self._write()
+                except OSError as exc:
+                    logger.error("Checkpoint write failed (%s): %s", self.path, exc)
+            if self._closing:
+                return
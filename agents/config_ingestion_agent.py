@@ -5,19 +5,61 @@ Loads and validates skillset-config.json and rules-config.json against their
 JSON Schemas. Returns a unified config dict used by all downstream agents.
 """
 
+import functools
 import json
 import logging
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
 
 try:
     import jsonschema
-    from jsonschema import ValidationError
+    from jsonschema.exceptions import best_match
 except ImportError:
     raise ImportError("jsonschema is required. Run: pip install jsonschema")
 
+# Optional orjson — several times faster than the stdlib parser for the
+# config/schema files; both raise json.JSONDecodeError subclasses on bad input.
+try:
+    import orjson  # type: ignore
+
+    _loads = orjson.loads
+except ImportError:
+    def _loads(data: bytes) -> Any:
+        return json.loads(data.decode("utf-8"))
+
 logger = logging.getLogger(__name__)
 
+# Process-wide cache of validated configs, keyed by the resolved paths and
+# mtimes of both config files so an edited file is always re-ingested.
+_CONFIG_CACHE: dict[tuple, Mapping[str, Any]] = {}
+
+
+def clear_config_cache() -> None:
+    """Drop every cached config (for tests / long-lived processes)."""
+    _CONFIG_CACHE.clear()
+
+
+@functools.lru_cache(maxsize=8)
+def _load_schema_cached(path_str: str, mtime_ns: int) -> dict:
+    """Parse a schema file; cached per (path, mtime) so edits are picked up."""
+    return _loads(Path(path_str).read_bytes())
+
+
+@functools.lru_cache(maxsize=8)
+def _get_validator(path_str: str, mtime_ns: int):
+    """
+    Return a compiled validator for the schema at *path_str*.
+
+    Cached per (path, mtime) so the schema is read, checked and compiled
+    (including ``$ref`` resolution) once per process rather than on every
+    ``load_and_validate()`` call.
+    """
+    schema = _load_schema_cached(path_str, mtime_ns)
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema)
+
 
 class ConfigValidationError(Exception):
     """Raised when a config file fails schema validation."""
@@ -45,22 +87,40 @@ class ConfigIngestionAgent:
     # Public API
     # ------------------------------------------------------------------
 
-    def load_and_validate(self) -> dict[str, Any]:
+    def load_and_validate(self) -> Mapping[str, Any]:
         """
         Load both config files, validate against schemas, and return merged config.
 
+        The result is cached per process for the same pair of files (keyed by
+        path and mtime) and returned as a read-only mapping shared by every
+        caller; see :func:`clear_config_cache`.
+
         Returns:
             {
               "skillset": <skillset dict>,
               "rules":    <rules dict>,
               "mappings_index": {<id>: <mapping>},   # MAP-001 → mapping dict
               "rules_index":    {<id>: <rule>},       # RULE-001 → rule dict
+              "_mappings_lower": [(<mapping>, <lowercased source_pattern>), ...],
+              "_blocking_by_layer": {<layer>: [<rule>, ...]},  # filled lazily
+              "_flagged_libs":      [<library>, ...],          # RULE-008
             }
 
+            Keys starting with ``_`` are private lookup caches for the
+            convenience helpers below.
+
         Raises:
             FileNotFoundError      – if a config or schema file is missing
             ConfigValidationError  – if a config file fails schema validation
         """
+        key = self._cache_key()
+        cached = _CONFIG_CACHE.get(key) if key is not None else None
+        if cached is not None:
+            logger.info(
+                "Using cached config for: %s, %s", self.skillset_path, self.rules_path
+            )
+            return cached
+
         logger.info("Loading skillset config from: %s", self.skillset_path)
         skillset = self._load_json(self.skillset_path)
 
@@ -73,15 +133,22 @@ class ConfigIngestionAgent:
         logger.info("Validating rules config against schema...")
         self._validate(rules, self.RULES_SCHEMA_PATH)
 
-        # Build fast-lookup indexes
-        mappings_index = {m["id"]: m for m in skillset.get("component_mappings", [])}
-        rules_index    = {r["id"]: r for r in rules.get("guardrails", [])}
+        # Build fast-lookup indexes (one pass per list)
+        mappings_index: dict[str, dict] = {}
+        mappings_lower: list[tuple[dict, str]] = []
+        for m in skillset.get("component_mappings", []):
+            mappings_index[m["id"]] = m
+            mappings_lower.append((m, m["source_pattern"].lower()))
+        rules_index = {r["id"]: r for r in rules.get("guardrails", [])}
 
         config = {
             "skillset": skillset,
             "rules":    rules,
             "mappings_index": mappings_index,
             "rules_index":    rules_index,
+            "_mappings_lower":    mappings_lower,
+            "_blocking_by_layer": {},
+            "_flagged_libs":      rules_index.get("RULE-008", {}).get("flagged_libraries", []),
         }
 
         logger.info(
@@ -89,23 +156,37 @@ class ConfigIngestionAgent:
             len(mappings_index),
             len(rules_index),
         )
-        return config
+        frozen = MappingProxyType(config)
+        if key is not None:
+            _CONFIG_CACHE[key] = frozen
+        return frozen
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
+    def _cache_key(self) -> tuple | None:
+        """Return the cache key for this file pair, or None if a file is missing."""
+        try:
+            return (
+                self.skillset_path.resolve(), self.skillset_path.stat().st_mtime_ns,
+                self.rules_path.resolve(),    self.rules_path.stat().st_mtime_ns,
+            )
+        except OSError:
+            return None  # let _load_json raise the usual FileNotFoundError
+
     def _load_json(self, path: Path) -> dict:
         if not path.exists():
             raise FileNotFoundError(f"Config file not found: {path}")
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return _loads(path.read_bytes())
 
     def _validate(self, config: dict, schema_path: Path) -> None:
-        schema = self._load_json(schema_path)
         try:
-            jsonschema.validate(instance=config, schema=schema)
-        except ValidationError as exc:
+            key = str(schema_path.resolve()), schema_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Config file not found: {schema_path}") from None
+        exc = best_match(_get_validator(*key).iter_errors(config))
+        if exc is not None:
             raise ConfigValidationError(
                 f"Config validation failed at '{exc.json_path}': {exc}"
             ) from exc
@@ -117,23 +198,44 @@ class ConfigIngestionAgent:
     @staticmethod
     def get_mapping_for_pattern(config: dict, source_pattern_keyword: str) -> dict | None:
         """Return the first mapping whose source_pattern contains the keyword."""
-        for mapping in config["skillset"].get("component_mappings", []):
-            if source_pattern_keyword.lower() in mapping["source_pattern"].lower():
+        keyword = source_pattern_keyword.lower()
+        mappings_lower = config.get("_mappings_lower")
+        if mappings_lower is None:
+            # Config not built by load_and_validate() — lowercase on the fly
+            mappings_lower = [
+                (m, m["source_pattern"].lower())
+                for m in config["skillset"].get("component_mappings", [])
+            ]
+        for mapping, pattern in mappings_lower:
+            if keyword in pattern:
                 return mapping
         return None
 
     @staticmethod
     def get_blocking_rules(config: dict, applies_to: str) -> list[dict]:
-        """Return all blocking rules that apply to the given layer."""
-        return [
+        """
+        Return all blocking rules that apply to the given layer.
+
+        Results are memoised per layer on configs built by load_and_validate();
+        the returned list is shared, so callers must not mutate it.
+        """
+        by_layer = config.get("_blocking_by_layer")
+        if by_layer is not None and applies_to in by_layer:
+            return by_layer[applies_to]
+        rules = [
             r for r in config["rules"].get("guardrails", [])
             if r["enforcement"] == "blocking"
             and (applies_to in r["applies_to"] or "all" in r["applies_to"])
         ]
+        if by_layer is not None:
+            by_layer[applies_to] = rules
+        return rules
 
     @staticmethod
     def get_flagged_libraries(config: dict) -> list[str]:
         """Return all libraries flagged by RULE-008 (external library halt)."""
+        if "_flagged_libs" in config:
+            return config["_flagged_libs"]
         rules_index = config.get("rules_index", {})
         rule_008 = rules_index.get("RULE-008", {})
         return rule_008.get("flagged_libraries", [])
@@ -42,23 +42,27 @@ Requires:
     pip install jinja2
 """
 
+import asyncio
+import io
+import json
 import logging
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
-
-try:
-    from jinja2 import Environment, FileSystemLoader, TemplateNotFound  # type: ignore
-except ImportError:
-    raise ImportError("jinja2 is required. pip install jinja2")
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 from agents.agent_context import require_llm_or_raise
 from agents.conversion_log import ConversionLog
+from agents.llm import LLMMessage, LLMNotAvailableError, LLMProviderError, LLMResponse
 from agents.migration_ignore import MigrationIgnore
 from prompts import load_prompt, resolve_prompt_filename
 
 if TYPE_CHECKING:
+    from jinja2 import Environment  # type: ignore
+
     from agents.llm import LLMRouter
+    from agents.llm.response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -76,6 +80,130 @@ class _SkipStep(Exception):
     """Internal sentinel — step silently skipped due to RULE-011 (.migrationignore match)."""
 
 
+# Cache marker for template names the loader could not find
+_MISSING = object()
+
+class Step(NamedTuple):
+    """
+    Typed view of one plan conversion step, parsed once per run.
+    ``raw`` is the original plan dict (templates, log and knowledge
+    extraction still receive it, including any extra fields).
+    """
+    id: str
+    source_file: str
+    target_file: str
+    mapping_id: str
+    rule_ids: tuple[str, ...]
+    rationale: str
+    raw: dict
+
+    @classmethod
+    def from_dict(cls, step: dict) -> "Step":
+        return cls(
+            step.get("id", "?"),
+            step["source_file"],
+            step["target_file"],
+            step.get("mapping_id", ""),
+            tuple(step.get("rule_ids", ("RULE-003",))),
+            step.get("rationale", ""),
+            step,
+        )
+
+
+# Fallback template for mapping-less steps.  It is comment-only (no scaffold:
+# the LLM works from the source directly), so it is never rendered.
+_PASSTHROUGH_TEMPLATE = "passthrough.jinja2"
+
+# Placeholder substituted for {rules_text} when pre-formatting the system prompt
+_RULES_SLOT = "\x00rules_text\x00"
+
+# Upper bound on threads used to read source files ahead of the step loop
+_PREFETCH_WORKERS = 8
+
+# Step fields copied into the wrote_file log entry for KnowledgeExtractor
+_KX_META_KEYS = (
+    "source_imports", "source_hooks",
+    "file_type", "component_type", "source_lang", "feature_name",
+)
+
+# Reply prefix the conversion prompts ask the LLM to use when it cannot
+# convert a file confidently (compared case-insensitively)
+_AMBIGUOUS_PREFIX = "AMBIGUOUS:"
+_AMBIGUOUS_LEN    = len(_AMBIGUOUS_PREFIX)
+
+# _strip_code_fences patterns
+_FENCE_RE = re.compile(r"```[^\n]*\n(.*?)```", re.DOTALL)
+# Matches "---" horizontal rule, or lines starting with common changelog
+# section headers that LLMs append after the generated code.
+_TRAILING_SEPARATOR_RE = re.compile(
+    r"\n(?:---+|===+|\*\*\*+)"          # markdown hr variants
+    r"|(?:\n(?:Key changes|Notes|Note|Changes made|Changes|Summary|Explanation"
+    r"|What changed|Rationale|Changelog):)",
+    re.IGNORECASE,
+)
+_CODE_STARTERS = (
+    # Python
+    "import ",
+    "from ",
+    "#",
+    '"""',
+    "'''",
+    "def ",
+    "class ",
+    "@",
+    # TypeScript / JavaScript
+    "//",
+    "/*",
+    "export ",
+    "const ",
+    "let ",
+    "var ",
+    "type ",
+    "interface ",
+    "function ",
+    "async ",
+)
+
+
+# Branching / import constructs counted by ConversionAgent._complexity()
+_BRANCH_RE = re.compile(r"\b(?:if|elif|else|for|while|switch|case|catch|except|try)\b|&&|\|\||\?\?")
+_IMPORT_RE = re.compile(r"^\s*(?:import|from|using|require\()\b", re.MULTILINE)
+
+# _canonicalize patterns
+_TRAILING_WS_RE = re.compile(r"[ \t]+$", re.MULTILINE)
+_BLANK_RUN_RE   = re.compile(r"\n{4,}")
+
+
+def _is_ambiguous(text: str) -> bool:
+    """True if *text* opens with the AMBIGUOUS: marker (only the prefix is upper-cased)."""
+    return text[:_AMBIGUOUS_LEN].upper() == _AMBIGUOUS_PREFIX
+
+
+def _canonicalize(source: str) -> str:
+    """
+    Normalise *source* so that cosmetic differences do not change the LLM
+    prompt or the response-cache key: drop a leading BOM, convert CRLF/CR
+    to LF, strip trailing whitespace on each line, collapse runs of three
+    or more blank lines to two and end the text with exactly one newline.
+    """
+    if source.startswith("\ufeff"):
+        source = source[1:]
+    if "\r" in source:
+        source = source.replace("\r\n", "\n").replace("\r", "\n")
+    source = _TRAILING_WS_RE.sub("", source).rstrip("\n")
+    return _BLANK_RUN_RE.sub("\n\n\n", source) + "\n" if source else ""
+
+
+def _encode_text(text: str) -> bytes:
+    """
+    Encode *text* as UTF-8 for a single write_bytes() call, translating
+    newlines to os.linesep as write_text() would.
+    """
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)
+    return text.encode("utf-8")
+
+
 class ConversionAgent:
     """
     Executes each conversion step from the approved Plan Document.
@@ -116,10 +244,60 @@ class ConversionAgent:
         Any registered target identifier (e.g. 'simpler_grants', 'hrsa_pprs',
         'modern', 'snake_case', or any wizard-generated id).  The correct
         conversion prompts are resolved dynamically — no mapping is maintained here.
+    max_workers : int
+        Number of steps converted concurrently.  Steps are I/O-bound on the
+        LLM call and write distinct target files, so values > 1 overlap the
+        network waits.  Default 1 runs the steps strictly in sequence.
+    batch_size : int
+        Maximum number of consecutive steps that share a template and rule set
+        to convert in a single LLM request (the static system prompt is then
+        sent once per batch instead of once per step).  Default 1 disables
+        batching.  Batches that fail or come back malformed fall back to
+        per-step requests.
+    max_batch_chars : int
+        Upper bound on the combined source size packed into one batch.
+    cache_marker : bool
+        Mark the system prompt (instructions, rules and target-stack summary)
+        as a cacheable prefix for providers with explicit prompt caching
+        (Anthropic).  It is identical for every step sharing a rule set.
+        Default True.
+    response_cache : ResponseCache | str | Path | bool | None
+        Persistent exact-match cache of LLM conversions (or a path to open
+        one at; True opens the default location, see
+        ``response_cache.default_cache_path``).  Steps whose source, target
+        file, scaffold, prompt and model match a cached entry skip the LLM
+        call.  Replies from a fallback provider are not stored.
+        Default None disables caching.
+    stream : bool
+        Stream LLM replies.  A reply that opens with ``AMBIGUOUS:`` is
+        abandoned after its reason line instead of being generated in full.
+        Default False.
+    llm_skip_threshold : int
+        Sources shorter than this many characters whose template renders a
+        non-empty scaffold (barrel files, one-line re-exports, ...) take the
+        template output directly, without an LLM call — unless an applicable
+        rule sets ``requires_llm``.  Default 0 disables the short-circuit.
+    simple_model : str | None
+        Cheaper model (same provider) for steps whose source scores at most
+        ``complexity_threshold`` (see ``_complexity``).  Steps the cheap model
+        answers AMBIGUOUS or fails on are escalated to the configured model.
+        Default None sends every step to the configured model.
+    complexity_threshold : int
+        Highest complexity score routed to ``simple_model``.
+    max_source_bytes : int
+        When an LLM router is configured, source files larger than this are
+        flagged AMBIGUOUS without being read (too large for a single-shot
+        conversion).  Default 0 disables the cap.
     """
 
     TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
 
+    # Compiled templates shared by every instance, keyed by (templates dir, name).
+    # Misses are cached as _MISSING so the loader is not re-walked.
+    _template_cache: dict[tuple[str, str], Any] = {}
+    # One Jinja2 Environment per templates dir, shared by every instance
+    _environments: dict[str, "Environment"] = {}
+
     def __init__(
         self,
         approved_plan: dict,
@@ -130,15 +308,53 @@ class ConversionAgent:
         llm_router: "LLMRouter | None" = None,
         target: str = "simpler_grants",
         memory_context: "Any | None" = None,
+        max_workers: int = 1,
+        batch_size: int = 1,
+        max_batch_chars: int = 24_000,
+        cache_marker: bool = True,
+        response_cache: "ResponseCache | str | Path | bool | None" = None,
+        stream: bool = False,
+        llm_skip_threshold: int = 0,
+        simple_model: str | None = None,
+        complexity_threshold: int = 20,
+        max_source_bytes: int = 0,
     ) -> None:
         self.plan            = approved_plan
         self.config          = config
         self.log             = log
         self.output_root     = Path(output_root)
+        # Constant for the run: resolve once rather than per step
+        self._feature_root    = Path(approved_plan.get("feature_root", "."))
+        self._output_root_str = os.path.normcase(os.path.realpath(self.output_root))
+        self._output_root_prefix = os.path.join(self._output_root_str, "")  # trailing sep
         self.dry_run         = dry_run
         self._router         = llm_router
         self.target          = target
         self._memory_context = memory_context
+        self.max_workers     = max(1, int(max_workers or 1))
+        self.batch_size      = max(1, int(batch_size or 1))
+        self.max_batch_chars = max_batch_chars
+        self.cache_marker    = cache_marker
+        if response_cache is False:
+            response_cache = None
+        if response_cache is not None and not hasattr(response_cache, "get"):
+            from agents.llm.response_cache import ResponseCache
+            response_cache = ResponseCache(None if response_cache is True else response_cache)
+        self._response_cache = response_cache
+        self.stream          = stream
+        self.llm_skip_threshold = max(0, int(llm_skip_threshold or 0))
+        self.complexity_threshold = complexity_threshold
+        # The cap only protects the LLM prompt; template-only runs read anything
+        self.max_source_bytes = max(0, int(max_source_bytes or 0)) if llm_router is not None else 0
+        self._simple_router = (
+            llm_router.with_model(simple_model)
+            if simple_model and llm_router is not None else None
+        )
+        self._prefetched: dict[str, str] = {}
+        # Source text by path, filled by _prefetch_sources / _read_source so
+        # steps sharing a source file (one file split into several targets)
+        # read it once
+        self._source_cache: dict[Path, str] = {}
 
         # Resolve prompt filenames dynamically — no hardcoded map.
         self._system_prompt_file = resolve_prompt_filename(
@@ -153,11 +369,26 @@ class ConversionAgent:
             self._system_prompt_file,
             self._target_stack_file,
         )
+        # System prompt pre-formatted with the static target-stack summary and
+        # split around {rules_text}; built on first LLM call (see _system_prompt)
+        self._system_prompt_parts: list[str] | None = None
+        # Assembled system prompt per rules text (one per distinct rule set)
+        self._system_prompt_cache: dict[str, str] = {}
+
+        # Per-run memo of rule lookups / rendered rules text, keyed by rule ids.
+        # rules_index does not change during a run.
+        self._rules_cache:      dict[tuple[str, ...], list[dict]] = {}
+        self._rules_text_cache: dict[tuple[str, ...], str]        = {}
+        # Template name per mapping id (mappings_index is fixed for the run too)
+        self._template_names:   dict[str, str]                    = {}
+        # Indexes from ConfigIngestionAgent, fixed for the run
+        self._rules_index:    dict[str, dict] = self.config.get("rules_index", {})
+        self._mappings_index: dict[str, dict] = self.config.get("mappings_index", {})
+        # One pre-rendered bullet line per rule id
+        self._rules_fmt: dict[str, str] = {
+            rid: self._format_rule(rule) for rid, rule in self._rules_index.items()
+        }
 
-        self._jinja = Environment(
-            loader=FileSystemLoader(str(self.TEMPLATES_DIR)),
-            autoescape=False,
-        )
 
         # RULE-011: load ignore patterns (+ optional .local override)
         self._migration_ignore = MigrationIgnore()
@@ -176,26 +407,154 @@ class ConversionAgent:
 
     def execute(self) -> dict[str, Any]:
         """
-        Run all conversion steps in sequence.
+        Run all conversion steps — in sequence, or on a thread pool when
+        ``max_workers > 1``.  Results are reported in plan order either way.
 
         Returns a summary dict with counts of completed / flagged / skipped steps.
         """
-        steps     = self.plan.get("conversion_steps", [])
+        try:
+            steps = self._prepare()
+
+            if self.max_workers > 1 and len(steps) > 1:
+                with ThreadPoolExecutor(
+                    max_workers=min(self.max_workers, len(steps)),
+                    thread_name_prefix="conversion",
+                ) as pool:
+                    futures = [pool.submit(self._run_step, step) for step in steps]
+                    try:
+                        outcomes = [f.result() for f in futures]
+                    except BaseException:
+                        # e.g. LLMConfigurationError in CLI mode — stop queued steps
+                        pool.shutdown(wait=True, cancel_futures=True)
+                        raise
+            else:
+                outcomes = [self._run_step(step) for step in steps]
+        except BaseException:
+            self._finalize_failed()
+            raise
+
+        return self._summarise(steps, outcomes)
+
+    async def execute_async(self) -> dict[str, Any]:
+        """
+        Awaitable variant of execute() for callers that already run an event
+        loop (e.g. async orchestration backends).
+
+        Steps run on worker threads, at most ``max_workers`` at a time, so the
+        loop stays responsive while LLM requests are in flight.  Returns the
+        same summary as execute().
+        """
+        try:
+            steps = await asyncio.to_thread(self._prepare)
+            limit = asyncio.Semaphore(self.max_workers)
+            in_flight: list[asyncio.Future] = []
+
+            async def _run(step: Step) -> tuple[str, str, str | None]:
+                async with limit:
+                    work = asyncio.ensure_future(asyncio.to_thread(self._run_step, step))
+                    in_flight.append(work)
+                    # cancelling the await must not orphan the worker thread
+                    return await asyncio.shield(work)
+
+            tasks = [asyncio.ensure_future(_run(step)) for step in steps]
+            try:
+                outcomes = await asyncio.gather(*tasks)
+            except BaseException:
+                # e.g. LLMConfigurationError in CLI mode — stop steps not yet
+                # started, then let the running ones finish (as execute() does
+                # with pool.shutdown(wait=True)) before the log is finalised
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*in_flight, return_exceptions=True)
+                raise
+        except BaseException:
+            self._finalize_failed()
+            raise
+        return await asyncio.to_thread(self._summarise, steps, outcomes)
+
+    def _finalize_failed(self) -> None:
+        """
+        Write the conversion log with the entries recorded so far (and close
+        its journal) when a run aborts before _summarise() — e.g.
+        LLMConfigurationError in CLI mode, or Ctrl-C.
+        """
+        try:
+            self.log.finalize("failed")
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Could not write conversion log after failure: %s", exc)
+
+    def _prepare(self) -> list[Step]:
+        """Parse the plan's steps and run the optional read-ahead / batching."""
+        steps = [Step.from_dict(s) for s in self.plan.get("conversion_steps", [])]
+
+        if len(steps) > 1:
+            self._prefetch_sources(steps)
+
+        # Optional multi-step LLM requests; step id -> converted code
+        self._prefetched = {}
+        if self.batch_size > 1 and self._router is not None and self._router.is_available:
+            self._prefetched = self._prefetch_batches(steps)
+        return steps
+
+    def _summarise(
+        self,
+        steps: list[Step],
+        outcomes: list[tuple[str, str, str | None]],
+    ) -> dict[str, Any]:
+        """Build the execute() summary from per-step outcomes and finalise the log."""
         completed = []
         flagged   = []
         skipped   = []
+        for step_id, kind, reason in outcomes:
+            if kind == "completed":
+                completed.append(step_id)
+            elif kind == "skipped":
+                skipped.append({"step": step_id, "reason": reason})
+            else:
+                flagged.append({"step": step_id, "reason": reason})
 
-        for step in steps:
-            step_id = step.get("id", "?")
+        # llm_used: True  = at least one step was converted by the LLM
+        #           False = every step used Jinja2 template scaffold (no LLM)
+        _llm_available = bool(
+            self._router is not None
+            and getattr(self._router, "is_available", False)
+        )
+        summary = {
+            "total":           len(steps),
+            "completed":       len(completed),
+            "flagged":         len(flagged),
+            "skipped":         len(skipped),
+            "completed_steps": completed,
+            "flagged_steps":   flagged,
+            "llm_used":        _llm_available,
+        }
+        status = "completed" if not flagged else "completed_with_flags"
+        self.log.finalize(status)
+        return summary
+
+    # ------------------------------------------------------------------
+    # Step execution
+    # ------------------------------------------------------------------
+
+    def _run_step(self, step: Step) -> tuple[str, str, str | None]:
+        """
+        Execute one step and classify the outcome.
+
+        Returns ``(step_id, kind, reason)`` where kind is ``"completed"``,
+        ``"skipped"`` or ``"flagged"``.  Any other exception propagates.
+        """
+        step_id = step.id
+        # one log write per step rather than one per record
+        with self.log.deferred():
             try:
-                self.log.start_step(step)
+                self.log.start_step(step.raw)
                 self._execute_step(step)
-                self.log.complete_step(step)
-                completed.append(step_id)
+                self.log.complete_step(step.raw)
+                return step_id, "completed", None
             except _SkipStep as exc:
                 # RULE-011: silently skipped — not a failure, not a flag
                 logger.info("[%s] SKIPPED (RULE-011) -- %s", step_id, exc)
-                skipped.append({"step": step_id, "reason": str(exc)})
+                return step_id, "skipped", str(exc)
             except AmbiguityException as exc:
                 msg = str(exc)
                 logger.warning("[%s] AMBIGUOUS -- %s", step_id, msg)
@@ -206,7 +565,7 @@ class ConversionAgent:
                     rationale=msg,
                     deviation=f"Step {step_id} incomplete -- ambiguity must be resolved by human.",
                 )
-                flagged.append({"step": step_id, "reason": msg})
+                return step_id, "flagged", msg
             except OutOfBoundaryException as exc:
                 msg = str(exc)
                 logger.error("[%s] OUT-OF-BOUNDARY -- %s", step_id, msg)
@@ -216,86 +575,62 @@ class ConversionAgent:
                     rule_applied="RULE-005",
                     rationale=msg,
                 )
-                flagged.append({"step": step_id, "reason": msg})
-
-        # llm_used: True  = at least one step was converted by the LLM
-        #           False = every step used Jinja2 template scaffold (no LLM)
-        _llm_available = bool(
-            self._router is not None
-            and getattr(self._router, "is_available", False)
-        )
-        summary = {
-            "total":           len(steps),
-            "completed":       len(completed),
-            "flagged":         len(flagged),
-            "skipped":         len(skipped),
-            "completed_steps": completed,
-            "flagged_steps":   flagged,
-            "llm_used":        _llm_available,
-        }
-        status = "completed" if not flagged else "completed_with_flags"
-        self.log.finalize(status)
-        return summary
-
-    # ------------------------------------------------------------------
-    # Step execution
-    # ------------------------------------------------------------------
+                return step_id, "flagged", msg
 
-    def _execute_step(self, step: dict) -> None:
-        source_rel  = step["source_file"]
-        target_rel  = step["target_file"]
-        mapping_id  = step.get("mapping_id", "")
-        rule_ids    = step.get("rule_ids", ["RULE-003"])
-        rationale   = step.get("rationale", "")
+    def _execute_step(self, step: Step) -> None:
+        step_id, source_rel, target_rel, mapping_id, rule_ids, rationale, raw = step
+        log = self.log
 
         # RULE-011: skip files that match .migrationignore patterns
-        feature_root = Path(self.plan["feature_root"])
+        feature_root = self._feature_root
         source_path  = feature_root / source_rel
         if self._migration_ignore.should_skip(source_path, root=feature_root):
             reason = (
                 f"RULE-011: source file '{source_rel}' matches an active .migrationignore "
-                f"pattern — skipping conversion step {step.get('id', '?')}."
+                f"pattern — skipping conversion step {step_id}."
             )
             logger.info(reason)
-            self.log.record(
+            log.record(
                 "skipped_ignored_file",
                 source_file=str(source_path),
-                plan_step_ref=step.get("id", "?"),
+                plan_step_ref=step_id,
                 rule_applied="RULE-011",
                 rationale=reason,
             )
             raise _SkipStep(reason)
 
         # 1. Read source file
-        if not source_path.exists():
+        source_code = self._read_source(source_path)
+        if source_code is None:
             raise AmbiguityException(f"Source file not found: {source_path}")
 
-        source_code = source_path.read_text(encoding="utf-8", errors="replace")
-        self.log.record(
+        log.record(
             "read_file",
             source_file=str(source_path),
-            plan_step_ref=step["id"],
-            rationale=f"Source file read for {step['id']}",
+            plan_step_ref=step_id,
+            rationale=f"Source file read for {step_id}",
         )
 
         # 2. Resolve template
         template_name = self._resolve_template(mapping_id)
-        self.log.record(
+        log.record(
             "resolved_template",
-            plan_step_ref=step["id"],
+            plan_step_ref=step_id,
             rationale=f"Resolved template: {template_name}",
         )
 
         # 3. Build applicable rules
         applicable_rules = self._get_applicable_rules(rule_ids)
 
-        # 4. Generate converted code
-        converted_code = self._generate_code(
-            source_code=source_code,
-            template_name=template_name,
-            applicable_rules=applicable_rules,
-            step=step,
-        )
+        # 4. Generate converted code (possibly already produced by a batch request)
+        converted_code = self._prefetched.pop(step_id, None)
+        if converted_code is None:
+            converted_code = self._generate_code(
+                source_code=source_code,
+                template_name=template_name,
+                applicable_rules=applicable_rules,
+                step=raw,
+            )
 
         # 5. Validate boundary
         target_path = self.output_root / target_rel
@@ -304,54 +639,151 @@ class ConversionAgent:
         # 6. Write target file
         if not self.dry_run:
             target_path.parent.mkdir(parents=True, exist_ok=True)
-            target_path.write_text(converted_code, encoding="utf-8")
+            target_path.write_bytes(_encode_text(converted_code))
 
         # Collect knowledge-extraction metadata from the step dict so
         # KnowledgeExtractor can build rich pattern-library entries later.
         # Fields are only set when non-empty to keep log entries compact.
-        _kx_meta: dict = {}
-        for _kx_key in (
-            "source_imports", "source_hooks",
-            "file_type", "component_type", "source_lang", "feature_name",
-        ):
-            _val = step.get(_kx_key)
-            if _val:
-                _kx_meta[_kx_key] = _val
+        _kx_meta = {key: val for key in _KX_META_KEYS if (val := raw.get(key))}
 
-        self.log.record(
+        log.record(
             "wrote_file",
             source_file=source_rel,
             target_file=str(target_path),
             rule_applied=", ".join(rule_ids),
             transformation=f"Converted {source_rel} -> {target_rel} using {template_name}",
             rationale=rationale,
-            plan_step_ref=step["id"],
+            plan_step_ref=step_id,
             extra=_kx_meta or None,
         )
 
         if self.dry_run:
             logger.info("[DRY RUN] Would write: %s", target_path)
 
+    # ------------------------------------------------------------------
+    # Source reading
+    # ------------------------------------------------------------------
+
+    def _prefetch_sources(self, steps: list[Step]) -> None:
+        """
+        Read every step's source file on a small thread pool so the reads
+        overlap each other instead of running one per step in the loop.
+
+        Missing, unreadable and .migrationignore'd files are left out; the
+        step path handles (and logs) them as before.
+        """
+        feature_root = self._feature_root
+        paths = []
+        for step in steps:
+            source_path = feature_root / step.source_file
+            if (
+                source_path not in self._source_cache
+                and not self._migration_ignore.should_skip(source_path, root=feature_root)
+            ):
+                paths.append(source_path)
+        paths = list(dict.fromkeys(paths))
+        if not paths:
+            return
+
+        def _read(path: Path) -> tuple[Path, str | None]:
+            try:
+                if self._source_size_over_cap(path):
+                    return path, None   # flagged by the step path
+                return path, _canonicalize(path.read_bytes().decode("utf-8", errors="replace"))
+            except OSError:
+                return path, None
+
+        with ThreadPoolExecutor(
+            max_workers=min(_PREFETCH_WORKERS, len(paths)),
+            thread_name_prefix="source-read",
+        ) as pool:
+            for path, text in pool.map(_read, paths):
+                if text is not None:
+                    self._source_cache[path] = text
+
+    def _read_source(self, source_path: Path) -> str | None:
+        """
+        Return the (cached) canonical source text, or None if the file is
+        missing.  Canonicalising once here means templates, the LLM prompt
+        and the response-cache key all see the same text, so files that
+        differ only in BOM / line endings / trailing blanks share a cache
+        entry.
+
+        Raises AmbiguityException, without reading the file, if it is larger
+        than ``max_source_bytes``.
+        """
+        text = self._source_cache.get(source_path)
+        if text is not None:
+            return text
+        if not source_path.exists():
+            return None
+        size = self._source_size_over_cap(source_path)
+        if size:
+            raise AmbiguityException(
+                f"Source {source_path} too large ({size} bytes > {self.max_source_bytes}) "
+                f"for single-shot conversion"
+            )
+        text = _canonicalize(source_path.read_bytes().decode("utf-8", errors="replace"))
+        self._source_cache[source_path] = text
+        return text
+
+    def _source_size_over_cap(self, source_path: Path) -> int:
+        """Return the file size if it exceeds ``max_source_bytes``, else 0."""
+        if not self.max_source_bytes:
+            return 0
+        try:
+            size = source_path.stat().st_size
+        except OSError:
+            return 0
+        return size if size > self.max_source_bytes else 0
+
     # ------------------------------------------------------------------
     # Template resolution
     # ------------------------------------------------------------------
 
     def _resolve_template(self, mapping_id: str) -> str:
-        mapping = self.config.get("mappings_index", {}).get(mapping_id)
+        name = self._template_names.get(mapping_id)
+        if name is not None:
+            return name
+        mapping = self._mappings_index.get(mapping_id)
         if mapping:
             template_path = mapping.get("template", "")
             # Strip leading 'templates/' prefix since Jinja loader is rooted there
-            return Path(template_path).name
-        logger.warning("No template found for mapping %s -- using passthrough.", mapping_id)
-        return "passthrough.jinja2"
+            name = Path(template_path).name
+        else:
+            logger.warning("No template found for mapping %s -- using passthrough.", mapping_id)
+            name = _PASSTHROUGH_TEMPLATE
+        self._template_names[mapping_id] = name
+        return name
 
     # ------------------------------------------------------------------
     # Rules
     # ------------------------------------------------------------------
 
-    def _get_applicable_rules(self, rule_ids: list[str]) -> list[dict]:
-        rules_index = self.config.get("rules_index", {})
-        return [rules_index[rid] for rid in rule_ids if rid in rules_index]
+    def _get_applicable_rules(self, rule_ids: tuple[str, ...] | list[str]) -> list[dict]:
+        key = tuple(rule_ids)
+        rules = self._rules_cache.get(key)
+        if rules is None:
+            rules_index = self._rules_index
+            rules = [rules_index[rid] for rid in rule_ids if rid in rules_index]
+            self._rules_cache[key] = rules
+        return rules
+
+    def _rules_text(self, applicable_rules: list[dict]) -> str:
+        """Render the bullet list injected into the system prompt's {rules_text}."""
+        key = tuple(r["id"] for r in applicable_rules)
+        text = self._rules_text_cache.get(key)
+        if text is None:
+            fmt = self._rules_fmt
+            text = "\n".join(
+                fmt.get(r["id"]) or self._format_rule(r) for r in applicable_rules
+            )
+            self._rules_text_cache[key] = text
+        return text
+
+    @staticmethod
+    def _format_rule(rule: dict) -> str:
+        return f"- {rule['id']} ({rule['name']}): {rule['description']}"
 
     # ------------------------------------------------------------------
     # LLM code generation
@@ -375,6 +807,21 @@ class ConversionAgent:
         # Load template for context injection
         template_context = self._render_template_context(template_name, step, source_code)
 
+        if (
+            len(source_code) < self.llm_skip_threshold
+            and template_context.strip()
+            and not any(r.get("requires_llm") for r in applicable_rules)
+        ):
+            self.log.record(
+                "template_only_short_circuit",
+                plan_step_ref=step["id"],
+                rationale=(
+                    f"Source is {len(source_code)} chars (< {self.llm_skip_threshold}); "
+                    f"using template '{template_name}' output without an LLM call."
+                ),
+            )
+            return template_context
+
         if self._router is not None and self._router.is_available:
             return self._generate_with_llm(source_code, template_context, applicable_rules, step)
         else:
@@ -406,14 +853,57 @@ class ConversionAgent:
                 f"Configure an LLM provider or check the template."
             )
 
+    @property
+    def _jinja(self) -> "Environment":
+        return self._environment(str(self.TEMPLATES_DIR))
+
+    @classmethod
+    def _environment(cls, templates_dir: str) -> "Environment":
+        """
+        Return the shared Environment for *templates_dir*.  Templates are
+        not edited during a run, so auto_reload is off and the loader does
+        not stat the source file on every get_template().
+
+        jinja2 is imported here, on first template use, so importing this
+        module (or running steps that only hit passthrough) does not pay
+        for it.
+        """
+        env = cls._environments.get(templates_dir)
+        if env is None:
+            try:
+                from jinja2 import Environment, FileSystemLoader  # type: ignore
+            except ImportError:
+                raise ImportError("jinja2 is required. pip install jinja2") from None
+            env = cls._environments[templates_dir] = Environment(
+                loader=FileSystemLoader(templates_dir),
+                autoescape=False,
+                auto_reload=False,
+                cache_size=400,
+            )
+        return env
+
     def _render_template_context(self, template_name: str, step: dict, source_code: str) -> str:
         """Render Jinja2 template to produce a code scaffold / prompt hint."""
-        try:
-            tmpl = self._jinja.get_template(template_name)
-            return tmpl.render(step=step, source_code=source_code, config=self.config)
-        except TemplateNotFound:
+        if template_name == _PASSTHROUGH_TEMPLATE:
+            return ""
+        key  = (str(self.TEMPLATES_DIR), template_name)
+        tmpl = self._template_cache.get(key)
+        if tmpl is None:
+            jinja = self._jinja
+            from jinja2 import TemplateNotFound  # type: ignore
+            try:
+                tmpl = jinja.get_template(template_name)
+            except TemplateNotFound:
+                tmpl = _MISSING
+            except Exception as exc:
+                logger.warning("Template render error (%s): %s", template_name, exc)
+                return ""
+            self._template_cache[key] = tmpl
+        if tmpl is _MISSING:
             logger.debug("Template not found: %s -- proceeding without scaffold.", template_name)
             return ""
+        try:
+            return tmpl.render(step=step, source_code=source_code, config=self.config)
         except Exception as exc:
             logger.warning("Template render error (%s): %s", template_name, exc)
             return ""
@@ -425,47 +915,68 @@ class ConversionAgent:
         applicable_rules: list[dict],
         step: dict,
     ) -> str:
-        """Call the configured LLM provider to generate converted code."""
-        from agents.llm import LLMMessage, LLMNotAvailableError, LLMProviderError
+        """
+        Call the configured LLM provider to generate converted code.
 
-        rules_text = "\n".join(
-            f"- {r['id']} ({r['name']}): {r['description']}" for r in applicable_rules
-        )
-        system_prompt = load_prompt(self._system_prompt_file).format(
-            rules_text=rules_text,
-            target_stack_summary=load_prompt(self._target_stack_file),
+        With a ``simple_model`` configured, low-complexity sources go to the
+        cheap model first and are escalated to the configured model if it
+        answers AMBIGUOUS or fails.
+        """
+        args = (source_code, template_context, applicable_rules, step)
+        simple = self._simple_router
+        if simple is not None and simple.is_available:
+            score = self._complexity(source_code)
+            if score <= self.complexity_threshold:
+                try:
+                    return self._generate_with_router(simple, *args, final=False)
+                except (AmbiguityException, LLMNotAvailableError, LLMProviderError) as exc:
+                    logger.info(
+                        "[%s] Escalating from %s to %s (complexity %d): %s",
+                        step["id"], simple.model_name, self._router.model_name, score, exc,
+                    )
+        return self._generate_with_router(self._router, *args)
+
+    @staticmethod
+    def _complexity(source_code: str) -> int:
+        """
+        Cheap structural complexity proxy: one point per ~200 characters,
+        two per import and one per branching construct.
+        """
+        return (
+            len(source_code) // 200
+            + 2 * len(_IMPORT_RE.findall(source_code))
+            + len(_BRANCH_RE.findall(source_code))
         )
 
+    def _generate_with_router(
+        self,
+        router: "LLMRouter",
+        source_code: str,
+        template_context: str,
+        applicable_rules: list[dict],
+        step: dict,
+        final: bool = True,
+    ) -> str:
+        """
+        Generate converted code with *router*.  Provider errors fall back to
+        the template (agent mode) or raise LLMConfigurationError (CLI mode)
+        when *final*; otherwise they propagate so the caller can escalate.
+        """
+        step_id = step["id"]
+        system_prompt = self._system_prompt(self._rules_text(applicable_rules))
         template_hint = (
             f"\n\nSCAFFOLD HINT (from template {Path(step.get('mapping_id', '')).name}):\n"
             f"```\n{template_context}\n```\n"
             if template_context else ""
         )
 
-        # -- Memory context: inject proven patterns for this step's imports --
-        memory_hint = ""
-        if self._memory_context:
-            source_imports = step.get("source_imports", [])
-            source_hooks   = step.get("source_hooks", [])
-            try:
-                matches = self._memory_context.similar_patterns[:3] if source_imports else []
-                if matches:
-                    lines = ["PROVEN PATTERNS FROM PREVIOUS MIGRATIONS:"]
-                    for p in matches:
-                        src_sig = p.get("source_signature", "")
-                        tgt_sig = p.get("target_signature", "")
-                        if src_sig and tgt_sig:
-                            lines.append(f"- {src_sig} → {tgt_sig}")
-                    if len(lines) > 1:
-                        memory_hint = "\n\n" + "\n".join(lines)
-            except Exception:  # noqa: BLE001
-                pass
+        memory_hint = self._memory_hint(step)
 
         user_message = (
             f"TEXT GENERATION TASK — output the translated file text only.\n"
             f"Do NOT use tools. Do NOT write files. Do NOT read files from disk.\n"
             f"Your response text IS the output — it will be captured and saved by the caller.\n\n"
-            f"Conversion Step: {step['id']}\n"
+            f"Conversion Step: {step_id}\n"
             f"Source file: `{step['source_file']}`\n"
             f"Target file: `{step['target_file']}`\n"
             f"Rationale: {step.get('rationale', '')}\n"
@@ -478,14 +989,32 @@ class ConversionAgent:
             f"Do NOT describe changes. Output the code directly."
         )
 
-        try:
-            response = self._router.complete(
-                system=system_prompt,
-                messages=[LLMMessage(role="user", content=user_message)],
+        cache_key = None
+        if self._response_cache is not None:
+            cache_key = self._response_cache_key(
+                router, system_prompt, template_context, memory_hint, source_code, step,
             )
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                logger.info(
+                    "[%s] Code served from response cache (%s / %s)",
+                    step_id, cached.provider, cached.model,
+                )
+                return cached.text
+
+        try:
+            messages = [LLMMessage(role="user", content=user_message)]
+            if self.stream:
+                response = self._complete_streaming(router, system_prompt, messages)
+            else:
+                response = router.complete(
+                    system=system_prompt,
+                    messages=messages,
+                    cache_marker=self.cache_marker,
+                )
             logger.info(
                 "[%s] Code generated via %s / %s  (in=%d out=%d tokens)",
-                step["id"],
+                step_id,
                 response.provider,
                 response.model,
                 response.input_tokens,
@@ -499,27 +1028,311 @@ class ConversionAgent:
             result = self._strip_code_fences(result)
 
             # Detect AMBIGUOUS response from LLM
-            if result.upper().startswith("AMBIGUOUS:"):
-                raise AmbiguityException(result[len("AMBIGUOUS:"):].strip())
-
+            if _is_ambiguous(result):
+                raise AmbiguityException(result[_AMBIGUOUS_LEN:].strip())
+
+            # Keyed by the primary provider: a fallback's reply is not cached
+            if cache_key is not None and not response.fallback:
+                self._response_cache.put(cache_key, LLMResponse(
+                    text=result, model=response.model, provider=response.provider,
+                ))
             return result
 
         except AmbiguityException:
             raise  # re-raise cleanly
 
         except (LLMNotAvailableError, LLMProviderError) as exc:
+            if not final:
+                raise
             def _template_fallback():
                 if template_context.strip():
                     return template_context
                 raise AmbiguityException(
-                    f"LLM unavailable for {step['id']} and template produced no output: {exc}"
+                    f"LLM unavailable for {step_id} and template produced no output: {exc}"
                 )
             return require_llm_or_raise(
-                context=f"code generation for '{step['id']}'",
+                context=f"code generation for '{step_id}'",
                 error=exc,
                 fallback_fn=_template_fallback,
             )
 
+    def _memory_hint(self, step: dict) -> str:
+        """Proven patterns from the memory context for this step's imports."""
+        if not self._memory_context:
+            return ""
+        source_imports = step.get("source_imports", [])
+        try:
+            matches = self._memory_context.similar_patterns[:3] if source_imports else []
+            if matches:
+                lines = ["PROVEN PATTERNS FROM PREVIOUS MIGRATIONS:"]
+                for p in matches:
+                    src_sig = p.get("source_signature", "")
+                    tgt_sig = p.get("target_signature", "")
+                    if src_sig and tgt_sig:
+                        lines.append(f"- {src_sig} → {tgt_sig}")
+                if len(lines) > 1:
+                    return "\n\n" + "\n".join(lines)
+        except Exception:  # noqa: BLE001
+            pass
+        return ""
+
+    def _response_cache_key(
+        self,
+        router: "LLMRouter",
+        system_prompt: str,
+        template_context: str,
+        memory_hint: str,
+        source_code: str,
+        step: dict,
+    ) -> str:
+        """
+        Response-cache key for converting *step* with *router*.  Shared by the
+        per-step and batched paths so a reply cached by one is found by the
+        other.
+        """
+        return self._response_cache.make_key(
+            router.provider_name, router.model_name, self.target,
+            system_prompt, template_context, memory_hint, source_code,
+            step["target_file"], step.get("rationale", ""),
+        )
+
+    def _complete_streaming(
+        self,
+        router: "LLMRouter",
+        system_prompt: str,
+        messages: list[LLMMessage],
+    ) -> LLMResponse:
+        """
+        Collect a streamed reply into an LLMResponse (token counts unknown).
+
+        Stops reading once the reply is known to be ``AMBIGUOUS: <reason>``
+        and the reason line is complete — the rest would be discarded anyway.
+        """
+        buf = io.StringIO()
+        ambiguous: bool | None = None   # undecided until the prefix has arrived
+        fell_back: list[bool] = []
+        chunks = router.stream(
+            system=system_prompt, messages=messages, cache_marker=self.cache_marker,
+            on_fallback=lambda: fell_back.append(True),
+        )
+        try:
+            for chunk in chunks:
+                buf.write(chunk)
+                if ambiguous is None:
+                    head = buf.getvalue().lstrip()
+                    if len(head) < _AMBIGUOUS_LEN:
+                        continue
+                    ambiguous = _is_ambiguous(head)
+                    if ambiguous and "\n" in head:
+                        break
+                elif ambiguous and "\n" in chunk:
+                    break
+        finally:
+            chunks.close()
+
+        text = buf.getvalue()
+        if ambiguous:
+            text = text.lstrip().split("\n", 1)[0]
+        return LLMResponse(
+            text=text,
+            model=router.model_name,
+            provider=router.provider_name,
+            fallback=bool(fell_back),
+        )
+
+    def _system_prompt(self, rules_text: str) -> str:
+        """
+        Return the conversion system prompt for *rules_text*.
+
+        The prompt file and target-stack summary are static per agent, so the
+        ``.format()`` runs once; the rules text is spliced in once per
+        distinct rule set and the result reused by every step that shares it.
+        """
+        prompt = self._system_prompt_cache.get(rules_text)
+        if prompt is not None:
+            return prompt
+        if self._system_prompt_parts is None:
+            formatted = load_prompt(self._system_prompt_file).format(
+                rules_text=_RULES_SLOT,
+                target_stack_summary=load_prompt(self._target_stack_file),
+            )
+            self._system_prompt_parts = formatted.split(_RULES_SLOT)
+        prompt = self._system_prompt_cache[rules_text] = rules_text.join(self._system_prompt_parts)
+        return prompt
+
+    # ------------------------------------------------------------------
+    # Batched LLM code generation
+    # ------------------------------------------------------------------
+
+    def _prefetch_batches(self, steps: list[Step]) -> dict[str, str]:
+        """
+        Convert runs of consecutive steps that share ``(template, rule_ids)``
+        with one LLM request per run.
+
+        Only steps that would reach the LLM are considered (ignored or missing
+        sources are left to the normal per-step path, which logs them).  Runs
+        are packed greedily up to ``batch_size`` steps / ``max_batch_chars``
+        of source, and with ``max_workers > 1`` up to that many batch requests
+        are in flight at once.  Steps already in the response cache are served
+        from it and left out of the batches.  Returns ``{step_id: converted_code}``
+        for every step the cache or a batch reply covered; anything missing is
+        converted individually.
+        """
+        feature_root = self._feature_root
+        results: dict[str, str] = {}
+        groups: list[list[tuple[Step, str]]] = []
+        current: list[tuple[Step, str]] = []
+        current_key: tuple | None = None
+        current_chars = 0
+
+        for step in steps:
+            source_path = feature_root / step.source_file
+            if (
+                "id" not in step.raw
+                or self._migration_ignore.should_skip(source_path, root=feature_root)
+            ):
+                continue
+            try:
+                source_code = self._read_source(source_path)
+            except AmbiguityException:
+                continue
+            if source_code is None or len(source_code) < self.llm_skip_threshold:
+                # small sources may take the template short-circuit instead
+                continue
+            template_name = self._resolve_template(step.mapping_id)
+            if self._response_cache is not None:
+                cached = self._response_cache.get(
+                    self._batch_cache_key(step, source_code, template_name)
+                )
+                if cached is not None:
+                    logger.info(
+                        "[%s] Code served from response cache (%s / %s)",
+                        step.id, cached.provider, cached.model,
+                    )
+                    results[step.id] = cached.text
+                    continue
+            key = (template_name, step.rule_ids)
+            if (
+                key != current_key
+                or len(current) >= self.batch_size
+                or current_chars + len(source_code) > self.max_batch_chars
+            ):
+                if len(current) > 1:
+                    groups.append(current)
+                current, current_key, current_chars = [], key, 0
+            current.append((step, source_code))
+            current_chars += len(source_code)
+        if len(current) > 1:
+            groups.append(current)
+
+        if self.max_workers > 1 and len(groups) > 1:
+            # Batches are independent requests; overlap them like steps
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(groups)),
+                thread_name_prefix="conversion-batch",
+            ) as pool:
+                for batch in pool.map(self._generate_batch_with_llm, groups):
+                    results.update(batch)
+        else:
+            for group in groups:
+                results.update(self._generate_batch_with_llm(group))
+        return results
+
+    def _generate_batch_with_llm(self, group: list[tuple[Step, str]]) -> dict[str, str]:
+        """Send one request for a group of steps; return ``{step_id: code}``."""
+        first_step = group[0][0]
+        template_name = self._resolve_template(first_step.mapping_id)
+        applicable_rules = self._get_applicable_rules(first_step.rule_ids)
+        system_prompt = self._system_prompt(self._rules_text(applicable_rules))
+
+        items = []
+        for step, source_code in group:
+            items.append({
+                "id":            step.id,
+                "source_file":   step.source_file,
+                "target_file":   step.target_file,
+                "rationale":     step.rationale,
+                "scaffold_hint": self._render_template_context(template_name, step.raw, source_code),
+                "source_code":   source_code,
+            })
+        step_ids = [item["id"] for item in items]
+
+        user_message = (
+            f"TEXT GENERATION TASK — translate {len(items)} files in one reply.\n"
+            f"Do NOT use tools. Do NOT write files. Do NOT read files from disk.\n\n"
+            f"Each element of the JSON array below is one conversion step.  Translate "
+            f"every element's source_code (scaffold_hint, when non-empty, is the target "
+            f"template to follow).\n\n"
+            f"Reply with a JSON array and NOTHING ELSE, one object per step, in the same "
+            f"order: [{{\"id\": \"<step id>\", \"code\": \"<complete translated file text>\"}}]\n"
+            f"If a step cannot be converted confidently, set its code to "
+            f"\"AMBIGUOUS: <reason>\".\n\n"
+            f"STEPS:\n{json.dumps(items, indent=2)}"
+        )
+
+        try:
+            response = self._router.complete(
+                system=system_prompt,
+                messages=[LLMMessage(role="user", content=user_message)],
+                cache_marker=self.cache_marker,
+            )
+            replies = json.loads(self._strip_code_fences(response.text.strip()))
+            if not isinstance(replies, list):
+                raise ValueError("batch reply is not a JSON array")
+        except (LLMNotAvailableError, LLMProviderError, ValueError) as exc:
+            logger.warning(
+                "Batch conversion of %s failed (%s) -- converting steps individually.",
+                ", ".join(step_ids), exc,
+            )
+            return {}
+
+        logger.info(
+            "[%s] Code generated via %s / %s in one batch  (in=%d out=%d tokens)",
+            ", ".join(step_ids),
+            response.provider,
+            response.model,
+            response.input_tokens,
+            response.output_tokens,
+        )
+        wanted = set(step_ids)
+        results: dict[str, str] = {}
+        for reply in replies:
+            if not isinstance(reply, dict):
+                continue
+            step_id = reply.get("id")
+            code    = reply.get("code")
+            if step_id not in wanted or not isinstance(code, str):
+                continue
+            code = self._strip_code_fences(code.strip())
+            # Ambiguous / empty replies are retried individually so the normal
+            # path raises and logs AmbiguityException with full context.
+            if code and not _is_ambiguous(code):
+                results[step_id] = code
+        if self._response_cache is not None and not response.fallback:
+            # Keyed by the primary provider, as in _generate_with_router
+            for step, source_code in group:
+                code = results.get(step.id)
+                if code is not None:
+                    self._response_cache.put(
+                        self._batch_cache_key(step, source_code, template_name),
+                        LLMResponse(text=code, model=response.model, provider=response.provider),
+                    )
+        return results
+
+    def _batch_cache_key(self, step: Step, source_code: str, template_name: str) -> str:
+        """The key _generate_with_router would use for *step* on the main router."""
+        system_prompt = self._system_prompt(
+            self._rules_text(self._get_applicable_rules(step.rule_ids))
+        )
+        return self._response_cache_key(
+            self._router,
+            system_prompt,
+            self._render_template_context(template_name, step.raw, source_code),
+            self._memory_hint(step.raw),
+            source_code,
+            step.raw,
+        )
+
     # ------------------------------------------------------------------
     # Post-processing helpers
     # ------------------------------------------------------------------
@@ -557,53 +1370,22 @@ class ConversionAgent:
         If no pass changes the text, the original is returned unchanged.
         """
         # Pass 1: extract from markdown code fences
-        match = re.search(r"```[^\n]*\n(.*?)```", text, re.DOTALL)
+        match = _FENCE_RE.search(text)
         if match:
             extracted = match.group(1).strip()
             if extracted:
                 text = extracted  # continue to pass 2/3
 
         # Pass 2: strip leading prose before the first code line
-        _CODE_STARTERS = (
-            # Python
-            "import ",
-            "from ",
-            "#",
-            '"""',
-            "'''",
-            "def ",
-            "class ",
-            "@",
-            # TypeScript / JavaScript
-            "//",
-            "/*",
-            "export ",
-            "const ",
-            "let ",
-            "var ",
-            "type ",
-            "interface ",
-            "function ",
-            "async ",
-        )
         lines = text.splitlines()
         for i, line in enumerate(lines):
-            stripped = line.strip()
-            if any(stripped.startswith(s) for s in _CODE_STARTERS):
+            if line.strip().startswith(_CODE_STARTERS):
                 if i > 0:
                     text = "\n".join(lines[i:])
                 break  # already starts at a code line — no change needed
 
         # Pass 3: strip trailing explanation prose after code
-        # Matches "---" horizontal rule, or lines starting with common changelog
-        # section headers that LLMs append after the generated code.
-        _TRAILING_SEPARATOR = re.compile(
-            r"\n(?:---+|===+|\*\*\*+)"          # markdown hr variants
-            r"|(?:\n(?:Key changes|Notes|Note|Changes made|Changes|Summary|Explanation"
-            r"|What changed|Rationale|Changelog):)",
-            re.IGNORECASE,
-        )
-        trailer = _TRAILING_SEPARATOR.search(text)
+        trailer = _TRAILING_SEPARATOR_RE.search(text)
         if trailer:
             text = text[:trailer.start()].rstrip()
 
@@ -614,9 +1396,9 @@ class ConversionAgent:
     # ------------------------------------------------------------------
 
     def _assert_within_boundary(self, target_path: Path) -> None:
-        try:
-            target_path.resolve().relative_to(self.output_root.resolve())
-        except ValueError:
+        # realpath (not normpath) so symlinks inside the tree cannot escape it
+        resolved = os.path.normcase(os.path.realpath(target_path))
+        if not (resolved.startswith(self._output_root_prefix) or resolved == self._output_root_str):
             raise OutOfBoundaryException(
                 f"Target file '{target_path}' is outside the declared output boundary "
                 f"'{self.output_root}'. Per RULE-005, write rejected."
@@ -2,28 +2,59 @@
 Conversion Log
 ==============
 Real-time, append-only log of every action taken by the Conversion Agent.
-Persists to a JSON file incrementally and can export a Markdown summary.
+Each entry is appended to an NDJSON journal as it is recorded; the full JSON
+document is written at start, on flush() and on finalize().  Can export a
+Markdown summary.
 """
 
 import json
 import logging
+import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+# Optional orjson — several times faster than the stdlib encoder for the
+# journal lines and the full document
+try:
+    import orjson  # type: ignore
+
+    def _dumps_line(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+
+    def _dumps_document(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _dumps_line(obj: Any) -> bytes:
+        return (json.dumps(obj, separators=(",", ":")) + "\n").encode("utf-8")
+
+    def _dumps_document(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode("utf-8")
+
 logger = logging.getLogger(__name__)
 
 
 class ConversionLog:
     """
-    Thread-safe (single-threaded) log of all conversion actions.
+    Thread-safe log of all conversion actions.  Recording and flushing are
+    serialised by an internal lock so concurrent conversion steps can share
+    one log.
+
+    Files:
+        <log_path>            – JSON document (header + all entries), written
+                                on init, flush() and finalize()
+        <log_path>.ndjson     – journal, one compact JSON entry per line,
+                                appended by every record()
 
     Each entry records:
         sequence      – monotonic counter
         timestamp     – ISO-8601 UTC
         action        – read_file | resolved_template | wrote_file |
                         halted_ambiguous | rejected_out_of_boundary |
-                        flagged | step_started | step_completed | skipped
+                        flagged | step_started | step_completed | skipped |
+                        template_only_short_circuit
         source_file   – (optional) source file path
         target_file   – (optional) target file path
         rule_applied  – (optional) RULE-XXX id
@@ -39,18 +70,36 @@ class ConversionLog:
         run_id: str,
         plan_ref: str,
         log_path: str | Path,
+        flush_interval: float = 0.0,
     ) -> None:
+        """
+        flush_interval: seconds a journal flush may be held back so that
+        records from concurrent steps share one write.  A timer flushes
+        whatever is pending when it expires; finalize() and flush() drain
+        immediately.  Default 0 flushes after every record (or deferred()
+        block).
+        """
         self.feature_name = feature_name
         self.run_id       = run_id
         self.plan_ref     = plan_ref
         self.log_path     = Path(log_path)
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self.journal_path = self.log_path.with_suffix(".ndjson")
 
+        self._lock = threading.RLock()
         self._entries: list[dict[str, Any]] = []
         self._seq: int = 0
         self._status: str = "running"
         self._started_at: str = datetime.now(timezone.utc).isoformat()
         self._completed_at: str | None = None
+        # Journal handle, opened for append on first record()
+        self._journal: Any = None
+        # >0 while inside deferred(); records then stay in the journal buffer
+        # instead of being flushed to disk one by one
+        self._defer_depth: int = 0
+        self._dirty: bool = False
+        self._flush_interval = max(0.0, float(flush_interval or 0.0))
+        self._timer: threading.Timer | None = None
 
         # If a completed log for this run already exists, reload it instead of
         # overwriting it. This prevents duplicate entries on re-runs.
@@ -74,7 +123,8 @@ class ConversionLog:
                     self.log_path, exc,
                 )
 
-        self._flush()   # initialise file
+        self.journal_path.unlink(missing_ok=True)
+        self._write_document()   # initialise file
 
     # ------------------------------------------------------------------
     # Recording API
@@ -93,24 +143,57 @@ class ConversionLog:
         deviation: str | None = None,
         extra: dict | None = None,
     ) -> None:
-        self._seq += 1
-        entry: dict[str, Any] = {
-            "sequence":   self._seq,
-            "timestamp":  datetime.now(timezone.utc).isoformat(),
-            "action":     action,
-        }
-        if source_file:     entry["source_file"]  = source_file
-        if target_file:     entry["target_file"]  = target_file
-        if rule_applied:    entry["rule_applied"] = rule_applied
-        if transformation:  entry["transformation"] = transformation
-        if rationale:       entry["rationale"]    = rationale
-        if plan_step_ref:   entry["plan_step_ref"] = plan_step_ref
-        if deviation:       entry["deviation_from_plan"] = deviation
-        if extra:           entry.update(extra)
-
-        self._entries.append(entry)
-        self._flush()
-        logger.debug("[LOG #%d] %s — %s", self._seq, action, source_file or target_file or "")
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            entry: dict[str, Any] = {
+                "sequence":   seq,
+                "timestamp":  datetime.now(timezone.utc).isoformat(),
+                "action":     action,
+            }
+            if source_file:     entry["source_file"]  = source_file
+            if target_file:     entry["target_file"]  = target_file
+            if rule_applied:    entry["rule_applied"] = rule_applied
+            if transformation:  entry["transformation"] = transformation
+            if rationale:       entry["rationale"]    = rationale
+            if plan_step_ref:   entry["plan_step_ref"] = plan_step_ref
+            if deviation:       entry["deviation_from_plan"] = deviation
+            if extra:           entry.update(extra)
+
+            self._entries.append(entry)
+            if self._journal is None:
+                self._journal = open(self.journal_path, "ab")
+            self._journal.write(_dumps_line(entry))
+            if self._defer_depth:
+                self._dirty = True
+            else:
+                self._request_flush()
+        logger.debug("[LOG #%d] %s — %s", seq, action, source_file or target_file or "")
+
+    @contextmanager
+    def deferred(self):
+        """
+        Hold back journal flushes for records made inside the block and flush
+        once on exit (e.g. once per conversion step instead of once per
+        record).  Blocks may nest and overlap across threads; every exit
+        flushes whatever is pending.
+        """
+        with self._lock:
+            self._defer_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._defer_depth -= 1
+                if self._dirty:
+                    self._request_flush()
+
+    def flush(self) -> None:
+        """Flush the journal and rewrite the JSON document now."""
+        with self._lock:
+            self._cancel_timer()
+            self._flush()
+            self._write_document()
 
     def start_step(self, step: dict) -> None:
         self.record(
@@ -134,9 +217,15 @@ class ConversionLog:
         )
 
     def finalize(self, status: str = "completed") -> None:
-        self._status       = status
-        self._completed_at = datetime.now(timezone.utc).isoformat()
-        self._flush()
+        with self._lock:
+            self._status       = status
+            self._completed_at = datetime.now(timezone.utc).isoformat()
+            self._cancel_timer()
+            self._write_document()
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            self._dirty = False
         logger.info("Conversion log finalised — status: %s", status)
 
     # ------------------------------------------------------------------
@@ -180,7 +269,7 @@ class ConversionLog:
             notes     = e.get("rationale") or e.get("deviation_from_plan") or ""
             lines.append(f"| {e['sequence']} | {ts} | `{action}` | `{src}` | `{tgt}` | {rule} | {notes} |")
 
-        out.write_text("\n".join(lines), encoding="utf-8")
+        out.write_bytes(os.linesep.join(lines).encode("utf-8"))
         logger.info("Conversion log markdown exported to: %s", out)
 
     # ------------------------------------------------------------------
@@ -188,6 +277,33 @@ class ConversionLog:
     # ------------------------------------------------------------------
 
     def _flush(self) -> None:
-        """Write the full log to disk after every change."""
-        with open(self.log_path, "w", encoding="utf-8") as f:
-            json.dump(self.to_dict(), f, indent=2)
+        """Push buffered journal lines to disk (after every record outside deferred())."""
+        if self._journal is not None:
+            self._journal.flush()
+        self._dirty = False
+
+    def _request_flush(self) -> None:
+        """Flush now, or within flush_interval seconds when batching is on."""
+        if not self._flush_interval:
+            self._flush()
+            return
+        self._dirty = True
+        if self._timer is None:
+            self._timer = threading.Timer(self._flush_interval, self._timer_flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _timer_flush(self) -> None:
+        with self._lock:
+            self._timer = None
+            if self._dirty:
+                self._flush()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _write_document(self) -> None:
+        """Write the full JSON document (header + every entry)."""
+        self.log_path.write_bytes(_dumps_document(self.to_dict()))
@@ -8,6 +8,7 @@ from agents.llm.base import (
     LLMNotAvailableError,
 )
 from agents.llm.registry import (
+    CircuitBreakerConfig,
     LLMRouter,
     PROVIDER_ANTHROPIC,
     PROVIDER_OPENAI,
@@ -31,6 +32,7 @@ __all__ = [
     "LLMNotAvailableError",
     # Router
     "LLMRouter",
+    "CircuitBreakerConfig",
     # Provider name constants
     "PROVIDER_ANTHROPIC",
     "PROVIDER_OPENAI",
@@ -18,9 +18,13 @@ Providers handle SDK-specific translation internally.
 from __future__ import annotations
 
 import abc
+import asyncio
+import functools
+import inspect
 import logging
+import threading
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Callable, Iterator
 
 logger = logging.getLogger(__name__)
 
@@ -29,12 +33,21 @@ logger = logging.getLogger(__name__)
 # Data classes
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class LLMMessage:
     """A single chat message."""
     role: str       # "user" | "assistant" | "system"
     content: str
 
+    def as_dict(self) -> dict[str, str]:
+        """The ``{"role": ..., "content": ...}`` mapping chat APIs accept."""
+        return {"role": self.role, "content": self.content}
+
+
+def chat_messages(system: str, messages: list[LLMMessage]) -> list[dict[str, str]]:
+    """SDK message list for OpenAI-style APIs: the system prompt, then *messages*."""
+    return [{"role": "system", "content": system}, *[m.as_dict() for m in messages]]
+
 
 @dataclass
 class LLMResponse:
@@ -44,10 +57,12 @@ class LLMResponse:
     provider: str
     input_tokens: int  = 0
     output_tokens: int = 0
-    raw: Any           = field(default=None, repr=False)
+    raw: Any           = field(default=None, repr=False)   # SDK response; only with LLMConfig.keep_raw
     # Populated only when the provider responds with native tool/function calls.
     # None for all standard text-completion responses (backwards-compatible).
     tool_calls: "list[ToolCall] | None" = field(default=None, repr=False)
+    # Set by LLMRouter when a fallback provider, not the primary, answered
+    fallback: bool = False
 
 
 @dataclass
@@ -96,6 +111,7 @@ class LLMConfig:
     # ---- Local model settings (Ollama, LlamaCpp) ----
     model_path: str      = ""                   # absolute path to .gguf file (LlamaCpp)
     ollama_host: str     = "http://localhost:11434"  # Ollama server URL
+    ollama_keep_alive: str = ""                 # e.g. "30m", "-1m"; blank → $OLLAMA_KEEP_ALIVE or 30m
     n_ctx: int           = 4096                 # context window (LlamaCpp)
     n_gpu_layers: int    = -1                   # GPU layers (-1 = all)
 
@@ -114,8 +130,21 @@ class LLMConfig:
     #       ANTHROPIC_API_KEY: "${ANTHROPIC_API_KEY}"
     #       MY_CUSTOM_VAR:     "some-value"
 
-    # ---- Timeout ----
+    # ---- Timeout / retries ----
     timeout_seconds: int = 120
+    # Retries of rate-limited (429), overloaded (5xx) and dropped requests.
+    # Hosted SDK clients (Anthropic, OpenAI, OpenAI-compat) back off
+    # exponentially with jitter and honour Retry-After between attempts.
+    max_retries: int     = 4
+    # Open the connection to hosted APIs (and preload Ollama's model) in the
+    # background at start-up, off the first real request's critical path.
+    warmup: bool         = True
+
+    # ---- Debugging ----
+    # Attach the full SDK response object to LLMResponse.raw.  Off by default:
+    # those objects carry nested payloads (and sometimes the HTTP response)
+    # that would otherwise stay alive as long as the LLMResponse does.
+    keep_raw: bool       = False
 
 
 # ---------------------------------------------------------------------------
@@ -130,6 +159,8 @@ class BaseLLMProvider(abc.ABC):
     def __init__(self, config: LLMConfig) -> None:
         self.config = config
         self._client: Any = None
+        # (event loop, async SDK client) — see _async_client()
+        self._aclient: tuple[Any, Any] | None = None
         self._setup()
 
     # ------------------------------------------------------------------
@@ -202,6 +233,95 @@ class BaseLLMProvider(abc.ABC):
             "Use the react_text orchestration mode instead."
         )
 
+    async def acomplete(
+        self,
+        system: str,
+        messages: list[LLMMessage],
+        cache_marker: bool = False,
+    ) -> LLMResponse:
+        """
+        Awaitable variant of complete().  The default runs complete() on a
+        worker thread; providers with a native async client override it
+        (see _async_client()).
+        """
+        call = (
+            functools.partial(self.complete, system, messages, cache_marker=True)
+            if cache_marker and self.supports_prompt_cache()
+            else functools.partial(self.complete, system, messages)
+        )
+        return await asyncio.to_thread(call)
+
+    async def acomplete_many(
+        self,
+        system: str,
+        batch: list[list[LLMMessage]],
+        max_concurrency: int = 4,
+    ) -> list[LLMResponse]:
+        """
+        Run acomplete() for every message list in *batch*, at most
+        *max_concurrency* in flight, and return the responses in order.
+        Servers with continuous batching (vLLM, TGI, Ollama with
+        OLLAMA_NUM_PARALLEL) decode the overlapping requests together.
+        The first failure propagates.
+        """
+        gate = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _one(messages: list[LLMMessage]) -> LLMResponse:
+            async with gate:
+                return await self.acomplete(system, messages)
+
+        return list(await asyncio.gather(*(_one(m) for m in batch)))
+
+    def complete_many(
+        self,
+        system: str,
+        batch: list[list[LLMMessage]],
+        max_concurrency: int = 4,
+    ) -> list[LLMResponse]:
+        """
+        Blocking acomplete_many() for callers without an event loop.
+        Must not be called from inside a running loop — await
+        acomplete_many() there instead.
+        """
+        if not batch:
+            return []
+
+        async def _run() -> list[LLMResponse]:
+            # asyncio.run() discards its loop, so close the async clients
+            # built on it rather than leak their connection pools
+            try:
+                return await self.acomplete_many(system, batch, max_concurrency)
+            finally:
+                await self.aclose()
+
+        return asyncio.run(_run())
+
+    def stream(
+        self,
+        system: str,
+        messages: list[LLMMessage],
+        cache_marker: bool = False,
+    ) -> Iterator[str]:
+        """
+        Yield the response text incrementally as the provider produces it.
+
+        Closing the iterator early abandons the request.  The default
+        implementation has no incremental output: it performs a regular
+        complete() call and yields the whole text as one chunk.
+        """
+        if cache_marker and self.supports_prompt_cache():
+            yield self.complete(system, messages, cache_marker=True).text
+        else:
+            yield self.complete(system, messages).text
+
+    def supports_prompt_cache(self) -> bool:
+        """
+        Return True if complete() accepts ``cache_marker=True`` to mark the
+        system prompt as a reusable, provider-cached prefix.  Default: False
+        (providers that cache prefixes automatically, or not at all).
+        """
+        return False
+
     # ------------------------------------------------------------------
     # Common helpers
     # ------------------------------------------------------------------
@@ -211,6 +331,75 @@ class BaseLLMProvider(abc.ABC):
         """Return True if the client was initialised successfully."""
         return self._client is not None
 
+    def close(self) -> None:
+        """
+        Release the client's pooled connections.  Providers keep one client
+        (and its keep-alive pool) for their whole lifetime; after close()
+        the provider reports itself unavailable.
+        """
+        client, self._client = self._client, None
+        aclient, self._aclient = self._aclient, None
+        if aclient is not None:
+            close_async_client(*aclient)
+        close = getattr(client, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as exc:  # noqa: BLE001
+                logger.debug("%s: error closing client: %s", self.__class__.__name__, exc)
+
+    async def aclose(self) -> None:
+        """
+        Close the async client built on the running event loop, if any.
+        The sync client stays open; call this before a loop you created
+        (e.g. with asyncio.run()) finishes.
+        """
+        if self._aclient is not None and self._aclient[0] is asyncio.get_running_loop():
+            aclient, self._aclient = self._aclient[1], None
+            await aclose_client(aclient)
+
+    def _raw(self, response: Any) -> Any:
+        """Value for LLMResponse.raw: *response* only when config.keep_raw is set."""
+        return response if self.config.keep_raw else None
+
+    def _warm_up(self, *probes: Callable[[], Any]) -> None:
+        """
+        Run *probes* — cheap requests such as listing models — on a daemon
+        thread, leaving a warm keep-alive connection in the client's pool.
+        Failures are only logged: the first real request reports them.
+        """
+        if not self.config.warmup or not probes:
+            return
+
+        def _run() -> None:
+            for probe in probes:
+                try:
+                    probe()
+                except Exception as exc:  # noqa: BLE001
+                    logger.debug("%s: warm-up request failed: %s", self.__class__.__name__, exc)
+
+        threading.Thread(
+            target=_run, name=f"{self.config.provider}-warmup", daemon=True,
+        ).start()
+
+    def _async_client(self, factory: Callable[[], Any]) -> Any:
+        """
+        Return the provider's async SDK client for the running event loop,
+        building it with *factory* on first use.  Async clients pool their
+        connections on the loop that created them, so a new loop (another
+        asyncio.run()) gets a fresh client.
+        """
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aclient[0] is not loop:
+            self._aclient = (loop, factory())
+        return self._aclient[1]
+
+    def __enter__(self) -> "BaseLLMProvider":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     @property
     def provider_name(self) -> str:
         return self.config.provider
@@ -228,6 +417,47 @@ class BaseLLMProvider(abc.ABC):
         )
 
 
+# ---------------------------------------------------------------------------
+# Async client shutdown
+# ---------------------------------------------------------------------------
+
+async def aclose_client(client: Any) -> None:
+    """
+    Close an async SDK client: ``aclose()`` on httpx clients, the awaitable
+    ``close()`` on AsyncOpenAI / AsyncAnthropic, or the wrapped httpx client
+    of ``ollama.AsyncClient``.  Errors are only logged.
+    """
+    close = getattr(client, "aclose", None) or getattr(client, "close", None)
+    if not callable(close):
+        inner = getattr(client, "_client", None)
+        close = getattr(inner, "aclose", None) if inner is not None else None
+        if not callable(close):
+            return
+    try:
+        result = close()
+        if inspect.isawaitable(result):
+            await result
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("Error closing async client %r: %s", client, exc)
+
+
+def close_async_client(loop: asyncio.AbstractEventLoop, client: Any) -> None:
+    """
+    Close *client* on the event *loop* it belongs to, from synchronous code:
+    scheduled if that loop is running, run to completion if it is idle.  A
+    closed loop has already dropped the client's connections with it.
+    """
+    if loop.is_closed():
+        return
+    try:
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(aclose_client(client), loop)
+        else:
+            loop.run_until_complete(aclose_client(client))
+    except RuntimeError as exc:   # another loop is running on this thread
+        logger.debug("Could not close async client %r: %s", client, exc)
+
+
 # ---------------------------------------------------------------------------
 # Exceptions
 # ---------------------------------------------------------------------------
@@ -18,7 +18,7 @@ Install:
 from __future__ import annotations
 
 import logging
-from typing import Any
+from typing import Any, Iterator
 
 from agents.llm.base import (
     BaseLLMProvider,
@@ -53,10 +53,13 @@ class AnthropicProvider(BaseLLMProvider):
 
         try:
             import anthropic  # type: ignore
-            kwargs: dict[str, Any] = {"api_key": api_key}
+            kwargs: dict[str, Any] = {"api_key": api_key, "max_retries": self.config.max_retries}
             if self.config.base_url:
                 kwargs["base_url"] = self.config.base_url
             self._client = anthropic.Anthropic(**kwargs)
+            self._client_kwargs = kwargs   # reused for the AsyncAnthropic client
+            self._sdk = anthropic          # exception types, AsyncAnthropic
+            self._warm_up(lambda: self._client.models.list(limit=1))
             logger.info(
                 "AnthropicProvider ready: model=%s base_url=%s",
                 self.config.model,
@@ -73,33 +76,26 @@ class AnthropicProvider(BaseLLMProvider):
         self,
         system: str,
         messages: list[LLMMessage],
+        cache_marker: bool = False,
     ) -> LLMResponse:
+        """
+        With ``cache_marker=True`` the system prompt is sent as a single text
+        block carrying ``cache_control: ephemeral``, so repeated requests that
+        share it are billed / served from Anthropic's prompt cache.
+        """
         if not self._client:
             raise LLMNotAvailableError(
                 "AnthropicProvider is not configured. "
                 "Set ANTHROPIC_API_KEY and pip install anthropic."
             )
 
-        import anthropic  # type: ignore
+        anthropic = self._sdk
 
-        sdk_messages = [{"role": m.role, "content": m.content} for m in messages]
         try:
             response = self._client.messages.create(
-                model=self.config.model,
-                max_tokens=self.config.max_tokens,
-                temperature=self.config.temperature,
-                system=system,
-                messages=sdk_messages,
-            )
-            text = response.content[0].text
-            return LLMResponse(
-                text=text,
-                model=response.model,
-                provider="anthropic",
-                input_tokens=response.usage.input_tokens,
-                output_tokens=response.usage.output_tokens,
-                raw=response,
+                **self._message_kwargs(system, messages, cache_marker)
             )
+            return self._to_response(response, cache_marker)
         except anthropic.APIError as exc:
             raise LLMProviderError(
                 f"Anthropic API error [{exc.status_code}]: {exc}"
@@ -113,6 +109,89 @@ class AnthropicProvider(BaseLLMProvider):
                 f"Anthropic authentication failed — check ANTHROPIC_API_KEY: {exc}"
             ) from exc
 
+    async def acomplete(
+        self,
+        system: str,
+        messages: list[LLMMessage],
+        cache_marker: bool = False,
+    ) -> LLMResponse:
+        """complete() on an ``anthropic.AsyncAnthropic`` client."""
+        if not self._client:
+            raise LLMNotAvailableError(
+                "AnthropicProvider is not configured. "
+                "Set ANTHROPIC_API_KEY and pip install anthropic."
+            )
+
+        anthropic = self._sdk
+
+        client = self._async_client(lambda: anthropic.AsyncAnthropic(**self._client_kwargs))
+        try:
+            response = await client.messages.create(
+                **self._message_kwargs(system, messages, cache_marker)
+            )
+        except anthropic.APIError as exc:
+            raise LLMProviderError(f"Anthropic API error: {exc}") from exc
+        return self._to_response(response, cache_marker)
+
+    def stream(
+        self,
+        system: str,
+        messages: list[LLMMessage],
+        cache_marker: bool = False,
+    ) -> Iterator[str]:
+        """Yield text deltas from the Messages streaming API."""
+        if not self._client:
+            raise LLMNotAvailableError(
+                "AnthropicProvider is not configured. "
+                "Set ANTHROPIC_API_KEY and pip install anthropic."
+            )
+
+        anthropic = self._sdk
+
+        try:
+            with self._client.messages.stream(
+                **self._message_kwargs(system, messages, cache_marker)
+            ) as response_stream:
+                yield from response_stream.text_stream
+        except anthropic.APIError as exc:
+            raise LLMProviderError(f"Anthropic streaming error: {exc}") from exc
+
+    def _message_kwargs(
+        self,
+        system: str,
+        messages: list[LLMMessage],
+        cache_marker: bool,
+    ) -> dict[str, Any]:
+        return {
+            "model":       self.config.model,
+            "max_tokens":  self.config.max_tokens,
+            "temperature": self.config.temperature,
+            "system":      self._system_param(system, cache_marker),
+            "messages":    [m.as_dict() for m in messages],
+        }
+
+    def _to_response(self, response: Any, cache_marker: bool) -> LLMResponse:
+        if cache_marker:
+            logger.debug(
+                "AnthropicProvider prompt cache: read=%s created=%s tokens",
+                getattr(response.usage, "cache_read_input_tokens", None),
+                getattr(response.usage, "cache_creation_input_tokens", None),
+            )
+        return LLMResponse(
+            text=response.content[0].text,
+            model=response.model,
+            provider="anthropic",
+            input_tokens=response.usage.input_tokens,
+            output_tokens=response.usage.output_tokens,
+            raw=self._raw(response),
+        )
+
+    @staticmethod
+    def _system_param(system: str, cache_marker: bool) -> Any:
+        if cache_marker and system:
+            return [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+        return system
+
     # ------------------------------------------------------------------
     # Native tool-use (Anthropic tool_use API)
     # ------------------------------------------------------------------
@@ -120,6 +199,9 @@ class AnthropicProvider(BaseLLMProvider):
     def supports_tool_use(self) -> bool:
         return True
 
+    def supports_prompt_cache(self) -> bool:
+        return True
+
     def complete_with_tools(
         self,
         system: str,
@@ -137,7 +219,7 @@ class AnthropicProvider(BaseLLMProvider):
                 "Set ANTHROPIC_API_KEY and pip install anthropic."
             )
 
-        import anthropic  # type: ignore
+        anthropic = self._sdk
 
         # Convert ToolDefinition → Anthropic tools format
         sdk_tools = [
@@ -148,7 +230,7 @@ class AnthropicProvider(BaseLLMProvider):
             }
             for t in tools
         ]
-        sdk_messages = [{"role": m.role, "content": m.content} for m in messages]
+        sdk_messages = [m.as_dict() for m in messages]
 
         try:
             response = self._client.messages.create(
@@ -182,7 +264,7 @@ class AnthropicProvider(BaseLLMProvider):
                 provider="anthropic",
                 input_tokens=response.usage.input_tokens,
                 output_tokens=response.usage.output_tokens,
-                raw=response,
+                raw=self._raw(response),
                 tool_calls=tool_calls if tool_calls else None,
             )
         except anthropic.APIError as exc:
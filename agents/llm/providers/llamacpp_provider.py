@@ -10,6 +10,11 @@ Required env vars:
 Optional env vars:
     LLAMACPP_N_CTX       – context window size (default: 4096)
     LLAMACPP_N_GPU_LAYERS– GPU layers to offload (-1 = all, 0 = CPU only; default: -1)
+    LLAMACPP_N_THREADS   – decode threads (default: llama.cpp's choice, ~physical cores)
+    LLAMACPP_N_BATCH     – prompt-processing batch size (default: 2048, capped at n_ctx)
+    LLAMACPP_N_UBATCH    – physical micro-batch size (default: 512)
+    LLAMACPP_FLASH_ATTN  – 1/0 to force flash attention (default: on when offloading to GPU)
+    LLAMACPP_POOL_SIZE   – model contexts loaded for parallel requests (default: 1)
     LLM_MAX_TOKENS       – max tokens to generate (default: 8192)
     LLM_TEMPERATURE      – temperature (default: 0.2)
 
@@ -41,7 +46,9 @@ from __future__ import annotations
 
 import logging
 import os
+import queue
 from pathlib import Path
+from typing import Iterator
 
 from agents.llm.base import (
     BaseLLMProvider,
@@ -50,18 +57,59 @@ from agents.llm.base import (
     LLMNotAvailableError,
     LLMProviderError,
     LLMResponse,
+    chat_messages,
 )
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_N_BATCH  = 2048   # prompt prefill is compute-bound: larger batches go faster
+_DEFAULT_N_UBATCH = 512
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning("LlamaCppProvider: ignoring non-integer %s=%r", name, value)
+        return default
+
+
+def _tuning_kwargs(n_ctx: int, n_gpu_layers: int) -> dict:
+    """
+    Throughput settings for ``Llama()``.  Conversion prompts embed whole
+    source files, so prefill dominates: batch up to 2048 prompt tokens per
+    eval instead of llama.cpp's 512.
+    """
+    n_batch = min(_env_int("LLAMACPP_N_BATCH", _DEFAULT_N_BATCH), n_ctx)
+    kwargs: dict = {
+        "n_batch":    n_batch,
+        "n_ubatch":   min(_env_int("LLAMACPP_N_UBATCH", _DEFAULT_N_UBATCH), n_batch),
+        "flash_attn": bool(_env_int("LLAMACPP_FLASH_ATTN", int(n_gpu_layers != 0))),
+    }
+    n_threads = _env_int("LLAMACPP_N_THREADS", 0)
+    if n_threads > 0:
+        kwargs["n_threads"] = n_threads
+    return kwargs
+
 
 class LlamaCppProvider(BaseLLMProvider):
     """
     Local GGUF model inference via llama-cpp-python.
     Uses the ChatML / chatml_function_calling template for system+user messages.
+
+    A ``Llama`` instance is not thread-safe, so each call checks one out of
+    a pool of LLAMACPP_POOL_SIZE contexts (default 1, i.e. calls are
+    serialised); acomplete() (the base worker-thread default) goes through
+    it too.  Weights are mmap'd, so on CPU each extra context costs only its
+    KV cache — but GPU-offloaded layers are duplicated per context.
     """
 
     def _setup(self) -> None:
+        self._pool: queue.Queue = queue.Queue()
+        self._contexts: list = []
         model_path = self.config.model_path or os.environ.get("LLAMACPP_MODEL_PATH", "")
 
         if not model_path:
@@ -81,25 +129,37 @@ class LlamaCppProvider(BaseLLMProvider):
             self._client = None
             return
 
+        # Response label; model_path may have come from LLAMACPP_MODEL_PATH
+        self._model_label = self.config.model or Path(model_path).name
+
         try:
             from llama_cpp import Llama  # type: ignore
 
             n_ctx        = self.config.n_ctx
             n_gpu_layers = self.config.n_gpu_layers
+            tuning       = _tuning_kwargs(n_ctx, n_gpu_layers)
 
             logger.info(
-                "Loading LlamaCpp model: %s (n_ctx=%d, n_gpu_layers=%d) ...",
+                "Loading LlamaCpp model: %s (n_ctx=%d, n_gpu_layers=%d, %s) ...",
                 model_path, n_ctx, n_gpu_layers,
+                ", ".join(f"{k}={v}" for k, v in tuning.items()),
             )
-            self._client = Llama(
-                model_path=model_path,
-                n_ctx=n_ctx,
-                n_gpu_layers=n_gpu_layers,
-                chat_format="chatml",   # works for most instruct models
-                verbose=False,
-            )
+            pool_size = max(1, _env_int("LLAMACPP_POOL_SIZE", 1))
+            for _ in range(pool_size):
+                self._contexts.append(Llama(
+                    model_path=model_path,
+                    n_ctx=n_ctx,
+                    n_gpu_layers=n_gpu_layers,
+                    chat_format="chatml",   # works for most instruct models
+                    verbose=False,
+                    **tuning,
+                ))
+            for llm in self._contexts:
+                self._pool.put(llm)
+            self._client = self._contexts[0]
             logger.info(
-                "LlamaCppProvider ready: model=%s", Path(model_path).name
+                "LlamaCppProvider ready: model=%s (contexts=%d)",
+                Path(model_path).name, pool_size,
             )
         except ImportError:
             logger.warning(
@@ -110,6 +170,7 @@ class LlamaCppProvider(BaseLLMProvider):
         except Exception as exc:
             logger.error("LlamaCppProvider: failed to load model: %s", exc)
             self._client = None
+            self._contexts.clear()
 
     def complete(
         self,
@@ -122,27 +183,81 @@ class LlamaCppProvider(BaseLLMProvider):
                 "Set LLAMACPP_MODEL_PATH to a valid .gguf file and pip install llama-cpp-python."
             )
 
-        sdk_messages = [{"role": "system", "content": system}]
-        sdk_messages += [{"role": m.role, "content": m.content} for m in messages]
+        sdk_messages = chat_messages(system, messages)
 
         try:
-            response = self._client.create_chat_completion(
-                messages=sdk_messages,
-                max_tokens=self.config.max_tokens,
-                temperature=self.config.temperature,
-                top_p=self.config.top_p,
-            )
+            llm = self._pool.get()
+            try:
+                response = llm.create_chat_completion(
+                    messages=sdk_messages,
+                    max_tokens=self.config.max_tokens,
+                    temperature=self.config.temperature,
+                    top_p=self.config.top_p,
+                )
+            finally:
+                self._pool.put(llm)
             text  = response["choices"][0]["message"]["content"] or ""
             usage = response.get("usage", {})
             return LLMResponse(
                 text=text,
-                model=self.config.model or Path(self.config.model_path).name,
+                model=self._model_label,
                 provider="llamacpp",
                 input_tokens=usage.get("prompt_tokens", 0),
                 output_tokens=usage.get("completion_tokens", 0),
-                raw=response,
+                raw=self._raw(response),
+            )
+        except Exception as exc:
+            raise LLMProviderError(
+                f"LlamaCpp inference error: {exc}"
+            ) from exc
+
+    def stream(
+        self,
+        system: str,
+        messages: list[LLMMessage],
+        cache_marker: bool = False,
+    ) -> Iterator[str]:
+        """
+        Yield content deltas from a ``stream=True`` chat completion.  The
+        context stays checked out of the pool until the stream finishes or
+        the iterator is closed.
+        """
+        if not self._client:
+            raise LLMNotAvailableError(
+                "LlamaCppProvider not configured. "
+                "Set LLAMACPP_MODEL_PATH to a valid .gguf file and pip install llama-cpp-python."
             )
+
+        sdk_messages = chat_messages(system, messages)
+
+        llm = self._pool.get()
+        try:
+            for chunk in llm.create_chat_completion(
+                messages=sdk_messages,
+                max_tokens=self.config.max_tokens,
+                temperature=self.config.temperature,
+                top_p=self.config.top_p,
+                stream=True,
+            ):
+                content = chunk["choices"][0]["delta"].get("content")
+                if content:
+                    yield content
         except Exception as exc:
             raise LLMProviderError(
                 f"LlamaCpp inference error: {exc}"
             ) from exc
+        finally:
+            self._pool.put(llm)
+
+    def close(self) -> None:
+        """Free every pooled context (the base close() only knows _client)."""
+        contexts, self._contexts = self._contexts, []
+        self._pool = queue.Queue()
+        super().close()
+        for llm in contexts[1:]:
+            close = getattr(llm, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as exc:  # noqa: BLE001
+                    logger.debug("LlamaCppProvider: error closing context: %s", exc)
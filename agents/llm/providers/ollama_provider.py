@@ -12,6 +12,8 @@ Optional env vars:
     OLLAMA_HOST          – server URL (default: http://localhost:11434)
     LLM_MAX_TOKENS       – max tokens to generate (default: 8192)
     LLM_TEMPERATURE      – temperature (default: 0.2)
+    OLLAMA_KEEP_ALIVE    – how long the server keeps the model loaded after a
+                           request (default: 30m; negative = until restart)
 
 Install (choose one):
     pip install ollama              # official Ollama Python client (preferred)
@@ -31,7 +33,7 @@ from __future__ import annotations
 import json
 import logging
 import os
-from typing import Any
+from typing import Any, Iterator
 
 from agents.llm.base import (
     BaseLLMProvider,
@@ -40,16 +42,59 @@ from agents.llm.base import (
     LLMNotAvailableError,
     LLMProviderError,
     LLMResponse,
+    chat_messages,
 )
 
 logger = logging.getLogger(__name__)
 
+# Optional orjson for the HTTP fallbacks — request bodies embed whole source
+# files, and it encodes/decodes them several times faster than the stdlib
+try:
+    import orjson  # type: ignore
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    _loads = json.loads
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Client library chosen once in _setup()
+_BACKEND_SDK      = "sdk"
+_BACKEND_HTTPX    = "httpx"
+_BACKEND_REQUESTS = "requests"
+
+# Connection pool for the HTTP fallbacks.  Ollama serves OLLAMA_NUM_PARALLEL
+# requests at once (a handful by default), so a small keep-alive pool covers
+# every concurrent conversion worker without reconnecting.
+_POOL_SIZE       = 16
+_CONNECT_TIMEOUT = 5.0   # local server: fail fast when it is not running
+_CONNECT_RETRIES = 2     # connection errors only — a generation is never re-sent
+# Ollama unloads a model 5 min after its last request, and reloading the
+# weights stalls the next call for seconds; steps are often further apart.
+_DEFAULT_KEEP_ALIVE = "30m"
+
+
+def _parse_keep_alive(value: str) -> str | int:
+    """Ollama takes a duration string ("30m") or a number of seconds."""
+    value = str(value).strip()
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
 
 class OllamaProvider(BaseLLMProvider):
     """
     Local Ollama models via:
       1. Official `ollama` Python client (preferred)
       2. Raw HTTP fallback via `httpx` or `requests`
+
+    _setup() resolves the backend once and binds the matching request
+    methods (_complete_impl, _post), so calls do not re-check it.
     """
 
     def _setup(self) -> None:
@@ -65,7 +110,11 @@ class OllamaProvider(BaseLLMProvider):
 
         # Store config for later use
         self._ollama_host  = host
-        self._use_sdk      = False
+        self._keep_alive   = _parse_keep_alive(
+            self.config.ollama_keep_alive
+            or os.environ.get("OLLAMA_KEEP_ALIVE", "")
+            or _DEFAULT_KEEP_ALIVE
+        )
 
         # Try official ollama package first
         try:
@@ -73,7 +122,8 @@ class OllamaProvider(BaseLLMProvider):
             # Pass timeout so long code-generation requests don't time out (default 120s is often too short)
             timeout = getattr(self.config, "timeout_seconds", 120)
             self._client   = ollama.Client(host=host, timeout=timeout)
-            self._use_sdk  = True
+            self._sdk      = ollama   # AsyncClient for acomplete()
+            self._bind_backend(_BACKEND_SDK)
             logger.info(
                 "OllamaProvider ready (SDK): host=%s model=%s", host, model
             )
@@ -84,8 +134,11 @@ class OllamaProvider(BaseLLMProvider):
         # Fall back to httpx
         try:
             import httpx  # type: ignore
-            self._client  = httpx.Client(base_url=host, timeout=self.config.timeout_seconds)
-            self._use_sdk = False
+            self._client  = httpx.Client(
+                base_url=host, **self._httpx_options(httpx, httpx.HTTPTransport),
+            )
+            self._sdk     = httpx   # AsyncClient for acomplete()
+            self._bind_backend(_BACKEND_HTTPX)
             logger.info(
                 "OllamaProvider ready (httpx): host=%s model=%s", host, model
             )
@@ -93,13 +146,22 @@ class OllamaProvider(BaseLLMProvider):
         except ImportError:
             pass
 
-        # Fall back to requests
+        # Fall back to requests — one Session so calls reuse a keep-alive connection
         try:
             import requests as _requests  # type: ignore
-            self._client  = _requests
-            self._http_url = f"{host}/api/chat"
-            self._use_sdk  = False
-            self._use_requests = True
+            from requests.adapters import HTTPAdapter  # type: ignore
+            from urllib3.util.retry import Retry  # type: ignore
+
+            self._client  = _requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=_POOL_SIZE,
+                max_retries=Retry(total=_CONNECT_RETRIES, connect=_CONNECT_RETRIES,
+                                  read=0, status=0, backoff_factor=0.3),
+            )
+            self._client.mount("http://", adapter)
+            self._client.mount("https://", adapter)
+            self._bind_backend(_BACKEND_REQUESTS)
             logger.info(
                 "OllamaProvider ready (requests): host=%s model=%s", host, model
             )
@@ -113,6 +175,27 @@ class OllamaProvider(BaseLLMProvider):
         )
         self._client = None
 
+    def _bind_backend(self, backend: str) -> None:
+        self._backend = backend
+        self._complete_impl = (
+            self._complete_sdk if backend == _BACKEND_SDK else self._complete_http
+        )
+        self._post = self._post_requests if backend == _BACKEND_REQUESTS else self._post_httpx
+        self._warm_up(self._preload)
+
+    def _preload(self) -> None:
+        """
+        Load the model into memory ahead of the first request: an empty
+        /api/generate only loads the weights and starts the keep-alive timer.
+        """
+        model = self.config.model
+        if self._backend == _BACKEND_SDK:
+            self._client.generate(model=model, prompt="", keep_alive=self._keep_alive)
+            return
+        self._post(
+            _dumps({"model": model, "keep_alive": self._keep_alive}), path="/api/generate",
+        ).raise_for_status()
+
     def complete(
         self,
         system: str,
@@ -125,12 +208,169 @@ class OllamaProvider(BaseLLMProvider):
                 "and pip install ollama (or httpx)."
             )
 
+        return self._complete_impl(system, messages, self.config.model)
+
+    def stream(
+        self,
+        system: str,
+        messages: list[LLMMessage],
+        cache_marker: bool = False,
+    ) -> Iterator[str]:
+        """
+        Yield message-content deltas from a streamed /api/chat.  The SDK
+        yields one dict per chunk; the HTTP fallbacks read the NDJSON body
+        line by line.  Closing the iterator early closes the response.
+        """
+        if not self._client:
+            raise LLMNotAvailableError(
+                "OllamaProvider not configured. "
+                "Set OLLAMA_MODEL, ensure Ollama is running, "
+                "and pip install ollama (or httpx)."
+            )
+
         model = self.config.model
+        if self._backend == _BACKEND_SDK:
+            try:
+                for part in self._client.chat(
+                    model=model,
+                    messages=chat_messages(system, messages),
+                    options=self._options(),
+                    keep_alive=self._keep_alive,
+                    stream=True,
+                ):
+                    content = part["message"]["content"]
+                    if content:
+                        yield content
+            except Exception as exc:
+                raise LLMProviderError(
+                    f"Ollama SDK error (model={model}, host={self._ollama_host}): {exc}"
+                ) from exc
+            return
 
-        if self._use_sdk:
-            return self._complete_sdk(system, messages, model)
-        else:
-            return self._complete_http(system, messages, model)
+        payload = {**self._http_payload(system, messages, model), "stream": True}
+        try:
+            resp = self._post(_dumps(payload), stream=True)
+        except Exception as exc:
+            raise LLMProviderError(
+                f"Ollama HTTP error (model={model}, host={self._ollama_host}): {exc}"
+            ) from exc
+        try:
+            resp.raise_for_status()
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                content = _loads(line).get("message", {}).get("content")
+                if content:
+                    yield content
+        except Exception as exc:
+            raise LLMProviderError(
+                f"Ollama HTTP error (model={model}, host={self._ollama_host}): {exc}"
+            ) from exc
+        finally:
+            resp.close()
+
+    async def acomplete(
+        self,
+        system: str,
+        messages: list[LLMMessage],
+        cache_marker: bool = False,
+    ) -> LLMResponse:
+        """
+        complete() on ``ollama.AsyncClient`` (SDK) or ``httpx.AsyncClient``
+        (HTTP fallback).  The requests fallback has no async client and runs
+        complete() on a worker thread.
+        """
+        if not self._client:
+            raise LLMNotAvailableError(
+                "OllamaProvider not configured. "
+                "Set OLLAMA_MODEL, ensure Ollama is running, "
+                "and pip install ollama (or httpx)."
+            )
+        if self._backend == _BACKEND_REQUESTS:
+            return await super().acomplete(system, messages, cache_marker)
+
+        model = self.config.model
+        if self._backend == _BACKEND_SDK:
+            client = self._async_client(lambda: self._sdk.AsyncClient(
+                host=self._ollama_host, timeout=getattr(self.config, "timeout_seconds", 120),
+            ))
+            try:
+                response = await client.chat(
+                    model=model,
+                    messages=chat_messages(system, messages),
+                    options=self._options(),
+                    keep_alive=self._keep_alive,
+                )
+                return self._to_response(response, model)
+            except Exception as exc:
+                raise LLMProviderError(
+                    f"Ollama SDK error (model={model}, host={self._ollama_host}): {exc}"
+                ) from exc
+
+        httpx  = self._sdk
+        client = self._async_client(lambda: httpx.AsyncClient(
+            base_url=self._ollama_host,
+            **self._httpx_options(httpx, httpx.AsyncHTTPTransport),
+        ))
+        try:
+            resp = await client.post(
+                "/api/chat",
+                content=_dumps(self._http_payload(system, messages, model)),
+                headers=_JSON_HEADERS,
+            )
+            resp.raise_for_status()
+            return self._to_response(_loads(resp.content), model)
+        except Exception as exc:
+            raise LLMProviderError(
+                f"Ollama HTTP error (model={model}, host={self._ollama_host}): {exc}"
+            ) from exc
+
+    # ------------------------------------------------------------------
+    # Request / response shapes shared by the sync and async paths
+    # ------------------------------------------------------------------
+
+    def _httpx_options(self, httpx: Any, transport_cls: Any) -> dict[str, Any]:
+        """
+        Timeout and transport shared by the sync and async httpx clients.
+        Pool limits belong to the transport: a client given an explicit
+        transport ignores its own ``limits`` argument.
+        """
+        return {
+            "timeout":   httpx.Timeout(self.config.timeout_seconds, connect=_CONNECT_TIMEOUT),
+            "transport": transport_cls(
+                retries=_CONNECT_RETRIES,
+                limits=httpx.Limits(
+                    max_connections=_POOL_SIZE,
+                    max_keepalive_connections=_POOL_SIZE,
+                ),
+            ),
+        }
+
+    def _options(self) -> dict[str, Any]:
+        return {
+            "num_predict": self.config.max_tokens,
+            "temperature": self.config.temperature,
+        }
+
+    def _http_payload(self, system: str, messages: list[LLMMessage], model: str) -> dict[str, Any]:
+        return {
+            "model":      model,
+            "messages":   chat_messages(system, messages),
+            "options":    self._options(),
+            "keep_alive": self._keep_alive,
+            "stream":     False,
+        }
+
+    def _to_response(self, data: Any, model: str) -> LLMResponse:
+        """Map an /api/chat reply — SDK ChatResponse or decoded JSON dict."""
+        return LLMResponse(
+            text=data["message"]["content"],
+            model=model,
+            provider="ollama",
+            input_tokens=data.get("prompt_eval_count", 0),
+            output_tokens=data.get("eval_count", 0),
+            raw=self._raw(data),
+        )
 
     # ------------------------------------------------------------------
     # SDK path
@@ -142,29 +382,14 @@ class OllamaProvider(BaseLLMProvider):
         messages: list[LLMMessage],
         model: str,
     ) -> LLMResponse:
-        import ollama  # type: ignore
-
-        sdk_messages = [{"role": "system", "content": system}]
-        sdk_messages += [{"role": m.role, "content": m.content} for m in messages]
-
         try:
             response = self._client.chat(
                 model=model,
-                messages=sdk_messages,
-                options={
-                    "num_predict": self.config.max_tokens,
-                    "temperature": self.config.temperature,
-                },
-            )
-            text = response["message"]["content"]
-            return LLMResponse(
-                text=text,
-                model=model,
-                provider="ollama",
-                input_tokens=response.get("prompt_eval_count", 0),
-                output_tokens=response.get("eval_count", 0),
-                raw=response,
+                messages=chat_messages(system, messages),
+                options=self._options(),
+                keep_alive=self._keep_alive,
             )
+            return self._to_response(response, model)
         except Exception as exc:
             raise LLMProviderError(
                 f"Ollama SDK error (model={model}, host={self._ollama_host}): {exc}"
@@ -180,44 +405,26 @@ class OllamaProvider(BaseLLMProvider):
         messages: list[LLMMessage],
         model: str,
     ) -> LLMResponse:
-        payload = {
-            "model": model,
-            "messages": [
-                {"role": "system", "content": system},
-                *[{"role": m.role, "content": m.content} for m in messages],
-            ],
-            "options": {
-                "num_predict": self.config.max_tokens,
-                "temperature": self.config.temperature,
-            },
-            "stream": False,
-        }
-
         try:
-            if getattr(self, "_use_requests", False):
-                resp = self._client.post(
-                    self._http_url,
-                    json=payload,
-                    timeout=self.config.timeout_seconds,
-                )
-                resp.raise_for_status()
-                data = resp.json()
-            else:
-                # httpx
-                resp = self._client.post("/api/chat", json=payload)
-                resp.raise_for_status()
-                data = resp.json()
-
-            text = data["message"]["content"]
-            return LLMResponse(
-                text=text,
-                model=model,
-                provider="ollama",
-                input_tokens=data.get("prompt_eval_count", 0),
-                output_tokens=data.get("eval_count", 0),
-                raw=data,
-            )
+            resp = self._post(_dumps(self._http_payload(system, messages, model)))
+            resp.raise_for_status()
+            return self._to_response(_loads(resp.content), model)
         except Exception as exc:
             raise LLMProviderError(
                 f"Ollama HTTP error (model={model}, host={self._ollama_host}): {exc}"
             ) from exc
+
+    def _post_httpx(self, body: bytes, stream: bool = False, path: str = "/api/chat") -> Any:
+        request = self._client.build_request(
+            "POST", path, content=body, headers=_JSON_HEADERS,
+        )
+        return self._client.send(request, stream=stream)
+
+    def _post_requests(self, body: bytes, stream: bool = False, path: str = "/api/chat") -> Any:
+        return self._client.post(
+            f"{self._ollama_host}{path}",
+            data=body,
+            headers=_JSON_HEADERS,
+            timeout=(_CONNECT_TIMEOUT, self.config.timeout_seconds),
+            stream=stream,
+        )
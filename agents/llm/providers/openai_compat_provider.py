@@ -14,7 +14,8 @@ This covers:
   - Any local proxy or corporate gateway
 
 Required env vars:
-    LLM_BASE_URL         – server base URL (e.g. http://localhost:1234/v1)
+    LLM_BASE_URL         – server base URL (e.g. http://localhost:1234/v1), or a
+                           comma-separated list of replicas to load-balance over
 
 Optional env vars:
     LLM_API_KEY          – API key (default: "not-needed" for local servers)
@@ -28,9 +29,13 @@ Install:
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
-from typing import Any
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
 
 from agents.llm.base import (
     BaseLLMProvider,
@@ -39,20 +44,47 @@ from agents.llm.base import (
     LLMNotAvailableError,
     LLMProviderError,
     LLMResponse,
+    aclose_client,
+    chat_messages,
+    close_async_client,
 )
 
 logger = logging.getLogger(__name__)
 
+_ENDPOINT_COOLDOWN = 30.0   # seconds an unreachable endpoint is passed over
+
+
+@dataclass(eq=False)
+class _Endpoint:
+    """One server behind the provider, with its count of in-flight requests."""
+    url: str
+    client: Any
+    async_factory: Callable[[], Any]
+    in_flight: int = 0
+    down_until: float = 0.0                 # time.monotonic() deadline
+    aclient: tuple[Any, Any] | None = None  # (event loop, async client)
+
 
 class OpenAICompatProvider(BaseLLMProvider):
     """
     OpenAI-compatible endpoint using the openai SDK with a custom base_url.
     Works with LM Studio, vLLM, Ollama /v1, Together AI, Fireworks, etc.
+
+    ``base_url`` may list several replicas of the same model (comma-separated
+    string or a list).  Each request goes to the endpoint with the fewest
+    requests in flight; an endpoint that refuses the connection is skipped
+    for _ENDPOINT_COOLDOWN seconds and the request moves to the next one.
     """
 
     def _setup(self) -> None:
         base_url = self.config.base_url or os.environ.get("LLM_BASE_URL", "")
-        if not base_url:
+        if isinstance(base_url, (list, tuple)):
+            urls = [str(u).strip() for u in base_url if str(u).strip()]
+        else:
+            urls = [u.strip() for u in base_url.split(",") if u.strip()]
+        self._endpoints: list[_Endpoint] = []
+        self._pool_lock = threading.Lock()
+        if not urls:
             logger.warning(
                 "OpenAICompatProvider: LLM_BASE_URL not set. Provider will be unavailable."
             )
@@ -68,61 +100,225 @@ class OpenAICompatProvider(BaseLLMProvider):
 
         try:
             import openai  # type: ignore
-
-            if self.config.api_version:
-                # Azure OpenAI path
-                self._client = openai.AzureOpenAI(
-                    api_key=api_key,
-                    azure_endpoint=base_url,
-                    api_version=self.config.api_version,
-                )
-                logger.info(
-                    "OpenAICompatProvider ready (Azure): endpoint=%s model=%s api_version=%s",
-                    base_url, self.config.model, self.config.api_version,
-                )
-            else:
-                self._client = openai.OpenAI(api_key=api_key, base_url=base_url)
-                logger.info(
-                    "OpenAICompatProvider ready: base_url=%s model=%s",
-                    base_url, self.config.model,
-                )
         except ImportError:
             logger.warning(
                 "OpenAICompatProvider: 'openai' package not installed. pip install openai"
             )
             self._client = None
+            return
+
+        self._sdk = openai
+        self._endpoints = [self._make_endpoint(openai, url, api_key) for url in urls]
+        self._client = self._endpoints[0].client
+        self._async_factory = self._endpoints[0].async_factory
+        self._warm_up(*(lambda c=e.client: c.models.list() for e in self._endpoints))
+        if self.config.api_version:
+            logger.info(
+                "OpenAICompatProvider ready (Azure): endpoint=%s model=%s api_version=%s",
+                ", ".join(urls), self.config.model, self.config.api_version,
+            )
+        else:
+            logger.info(
+                "OpenAICompatProvider ready: base_url=%s model=%s",
+                ", ".join(urls), self.config.model,
+            )
+
+    def _make_endpoint(self, openai: Any, url: str, api_key: str) -> _Endpoint:
+        if self.config.api_version:
+            # Azure OpenAI path
+            kwargs = {
+                "api_key":        api_key,
+                "azure_endpoint": url,
+                "api_version":    self.config.api_version,
+                "max_retries":    self.config.max_retries,
+            }
+            return _Endpoint(
+                url=url,
+                client=openai.AzureOpenAI(**kwargs),
+                async_factory=lambda: openai.AsyncAzureOpenAI(**kwargs),
+            )
+        kwargs = {"api_key": api_key, "base_url": url, "max_retries": self.config.max_retries}
+        return _Endpoint(
+            url=url,
+            client=openai.OpenAI(**kwargs),
+            async_factory=lambda: openai.AsyncOpenAI(**kwargs),
+        )
+
+    # ------------------------------------------------------------------
+    # Endpoint pool
+    # ------------------------------------------------------------------
+
+    def _checkout(self, tried: list[_Endpoint]) -> _Endpoint:
+        """Least-busy endpoint not yet *tried*, preferring ones not cooling down."""
+        now = time.monotonic()
+        with self._pool_lock:
+            candidates = [e for e in self._endpoints if e not in tried]
+            healthy    = [e for e in candidates if e.down_until <= now] or candidates
+            endpoint   = min(healthy, key=lambda e: e.in_flight)
+            endpoint.in_flight += 1
+        return endpoint
+
+    def _checkin(self, endpoint: _Endpoint, unreachable: bool = False) -> None:
+        with self._pool_lock:
+            endpoint.in_flight -= 1
+            if unreachable:
+                endpoint.down_until = time.monotonic() + _ENDPOINT_COOLDOWN
+
+    def _unreachable(self, exc: Exception) -> bool:
+        connection_error = getattr(self._sdk, "APIConnectionError", None)
+        return connection_error is not None and isinstance(exc, connection_error)
+
+    def _fail_over(self, endpoint: _Endpoint, exc: Exception, tried: list[_Endpoint]) -> bool:
+        """
+        Record a failed attempt on *endpoint*.  Returns True when the request
+        should be retried on another endpoint, else raises LLMProviderError.
+        """
+        tried.append(endpoint)
+        if self._unreachable(exc) and len(tried) < len(self._endpoints):
+            logger.warning(
+                "OpenAICompatProvider: %s unreachable (%s) — trying another endpoint",
+                endpoint.url, exc,
+            )
+            return True
+        raise LLMProviderError(
+            f"OpenAI-compat endpoint error ({endpoint.url}): {exc}"
+        ) from exc
+
+    def _require_client(self) -> None:
+        if not self._client:
+            raise LLMNotAvailableError(
+                "OpenAICompatProvider not configured. Set LLM_BASE_URL and pip install openai."
+            )
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
 
     def complete(
         self,
         system: str,
         messages: list[LLMMessage],
     ) -> LLMResponse:
-        if not self._client:
-            raise LLMNotAvailableError(
-                "OpenAICompatProvider not configured. Set LLM_BASE_URL and pip install openai."
-            )
+        self._require_client()
+        kwargs = self._chat_kwargs(system, messages)
+        tried: list[_Endpoint] = []
+        while True:
+            endpoint = self._checkout(tried)
+            unreachable = False
+            try:
+                return self._to_response(endpoint.client.chat.completions.create(**kwargs))
+            except Exception as exc:
+                unreachable = self._unreachable(exc)
+                if self._fail_over(endpoint, exc, tried):
+                    continue
+            finally:
+                self._checkin(endpoint, unreachable)
+
+    async def acomplete(
+        self,
+        system: str,
+        messages: list[LLMMessage],
+        cache_marker: bool = False,
+    ) -> LLMResponse:
+        """complete() on ``openai.AsyncOpenAI`` clients for the same endpoints."""
+        self._require_client()
+        kwargs = self._chat_kwargs(system, messages)
+        tried: list[_Endpoint] = []
+        while True:
+            endpoint = self._checkout(tried)
+            unreachable = False
+            try:
+                client = self._endpoint_async_client(endpoint)
+                return self._to_response(await client.chat.completions.create(**kwargs))
+            except Exception as exc:
+                unreachable = self._unreachable(exc)
+                if self._fail_over(endpoint, exc, tried):
+                    continue
+            finally:
+                self._checkin(endpoint, unreachable)
 
-        sdk_messages: list[dict[str, str]] = [{"role": "system", "content": system}]
-        sdk_messages += [{"role": m.role, "content": m.content} for m in messages]
+    @staticmethod
+    def _endpoint_async_client(endpoint: _Endpoint) -> Any:
+        """Per-endpoint counterpart of BaseLLMProvider._async_client()."""
+        loop = asyncio.get_running_loop()
+        if endpoint.aclient is None or endpoint.aclient[0] is not loop:
+            endpoint.aclient = (loop, endpoint.async_factory())
+        return endpoint.aclient[1]
 
+    def stream(
+        self,
+        system: str,
+        messages: list[LLMMessage],
+        cache_marker: bool = False,
+    ) -> Iterator[str]:
+        """
+        Yield content deltas from a ``stream=True`` chat completion.  Fails
+        over only while opening the stream; the endpoint stays checked out
+        until the stream ends.
+        """
+        self._require_client()
+        kwargs = self._chat_kwargs(system, messages)
+        tried: list[_Endpoint] = []
+        while True:
+            endpoint = self._checkout(tried)
+            try:
+                response_stream = endpoint.client.chat.completions.create(**kwargs, stream=True)
+                break
+            except Exception as exc:
+                self._checkin(endpoint, self._unreachable(exc))
+                self._fail_over(endpoint, exc, tried)
         try:
-            response = self._client.chat.completions.create(
-                model=self.config.model,
-                max_tokens=self.config.max_tokens,
-                temperature=self.config.temperature,
-                messages=sdk_messages,
-            )
-            text = response.choices[0].message.content or ""
-            usage = response.usage
-            return LLMResponse(
-                text=text,
-                model=getattr(response, "model", self.config.model),
-                provider="openai_compat",
-                input_tokens=getattr(usage, "prompt_tokens", 0) if usage else 0,
-                output_tokens=getattr(usage, "completion_tokens", 0) if usage else 0,
-                raw=response,
-            )
+            for chunk in response_stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
         except Exception as exc:
             raise LLMProviderError(
-                f"OpenAI-compat endpoint error ({self.config.base_url}): {exc}"
+                f"OpenAI-compat streaming error ({endpoint.url}): {exc}"
             ) from exc
+        finally:
+            response_stream.close()
+            self._checkin(endpoint)
+
+    def close(self) -> None:
+        """Close every endpoint's clients (the base close() only knows _client)."""
+        endpoints, self._endpoints = self._endpoints, []
+        super().close()
+        for endpoint in endpoints:
+            aclient, endpoint.aclient = endpoint.aclient, None
+            if aclient is not None:
+                close_async_client(*aclient)
+        for endpoint in endpoints[1:]:
+            close = getattr(endpoint.client, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as exc:  # noqa: BLE001
+                    logger.debug("OpenAICompatProvider: error closing %s: %s", endpoint.url, exc)
+
+    async def aclose(self) -> None:
+        """Close the endpoints' async clients built on the running loop."""
+        await super().aclose()
+        loop = asyncio.get_running_loop()
+        for endpoint in self._endpoints:
+            if endpoint.aclient is not None and endpoint.aclient[0] is loop:
+                aclient, endpoint.aclient = endpoint.aclient[1], None
+                await aclose_client(aclient)
+
+    def _chat_kwargs(self, system: str, messages: list[LLMMessage]) -> dict[str, Any]:
+        return {
+            "model":       self.config.model,
+            "max_tokens":  self.config.max_tokens,
+            "temperature": self.config.temperature,
+            "messages":    chat_messages(system, messages),
+        }
+
+    def _to_response(self, response: Any) -> LLMResponse:
+        usage = response.usage
+        return LLMResponse(
+            text=response.choices[0].message.content or "",
+            model=getattr(response, "model", self.config.model),
+            provider="openai_compat",
+            input_tokens=getattr(usage, "prompt_tokens", 0) if usage else 0,
+            output_tokens=getattr(usage, "completion_tokens", 0) if usage else 0,
+            raw=self._raw(response),
+        )
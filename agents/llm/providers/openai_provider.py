@@ -20,7 +20,7 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import Any
+from typing import Any, Iterator
 
 from agents.llm.base import (
     BaseLLMProvider,
@@ -31,6 +31,7 @@ from agents.llm.base import (
     LLMResponse,
     ToolCall,
     ToolDefinition,
+    chat_messages,
 )
 
 logger = logging.getLogger(__name__)
@@ -51,22 +52,26 @@ class OpenAIProvider(BaseLLMProvider):
 
         try:
             import openai  # type: ignore
-            kwargs: dict[str, Any] = {"api_key": api_key}
+            kwargs: dict[str, Any] = {"api_key": api_key, "max_retries": self.config.max_retries}
             if self.config.base_url:
                 kwargs["base_url"] = self.config.base_url
             # Azure OpenAI uses AzureOpenAI client
             if self.config.api_version:
-                self._client = openai.AzureOpenAI(
-                    api_key=api_key,
-                    azure_endpoint=self.config.base_url or os.environ.get("AZURE_OPENAI_ENDPOINT", ""),
-                    api_version=self.config.api_version,
-                )
+                azure_kwargs = {
+                    "api_key":        api_key,
+                    "azure_endpoint": self.config.base_url or os.environ.get("AZURE_OPENAI_ENDPOINT", ""),
+                    "api_version":    self.config.api_version,
+                    "max_retries":    self.config.max_retries,
+                }
+                self._client = openai.AzureOpenAI(**azure_kwargs)
+                self._async_factory = lambda: openai.AsyncAzureOpenAI(**azure_kwargs)
                 logger.info(
                     "OpenAIProvider ready (Azure): model=%s endpoint=%s",
                     self.config.model, self.config.base_url
                 )
             else:
                 self._client = openai.OpenAI(**kwargs)
+                self._async_factory = lambda: openai.AsyncOpenAI(**kwargs)
                 logger.info(
                     "OpenAIProvider ready: model=%s base_url=%s",
                     self.config.model,
@@ -77,6 +82,8 @@ class OpenAIProvider(BaseLLMProvider):
                 "OpenAIProvider: 'openai' package not installed. pip install openai"
             )
             self._client = None
+            return
+        self._warm_up(lambda: self._client.models.list())
 
     def complete(
         self,
@@ -89,29 +96,80 @@ class OpenAIProvider(BaseLLMProvider):
                 "Set OPENAI_API_KEY and pip install openai."
             )
 
-        sdk_messages = [{"role": "system", "content": system}]
-        sdk_messages += [{"role": m.role, "content": m.content} for m in messages]
+        try:
+            response = self._client.chat.completions.create(**self._chat_kwargs(system, messages))
+            return self._to_response(response)
+        except Exception as exc:
+            # openai raises openai.OpenAIError and subclasses
+            raise LLMProviderError(f"OpenAI API error: {exc}") from exc
+
+    async def acomplete(
+        self,
+        system: str,
+        messages: list[LLMMessage],
+        cache_marker: bool = False,
+    ) -> LLMResponse:
+        """complete() on an ``openai.AsyncOpenAI`` (or AsyncAzureOpenAI) client."""
+        if not self._client:
+            raise LLMNotAvailableError(
+                "OpenAIProvider is not configured. "
+                "Set OPENAI_API_KEY and pip install openai."
+            )
 
+        client = self._async_client(self._async_factory)
         try:
-            response = self._client.chat.completions.create(
-                model=self.config.model,
-                max_tokens=self.config.max_tokens,
-                temperature=self.config.temperature,
-                messages=sdk_messages,
+            response = await client.chat.completions.create(**self._chat_kwargs(system, messages))
+            return self._to_response(response)
+        except Exception as exc:
+            raise LLMProviderError(f"OpenAI API error: {exc}") from exc
+
+    def _chat_kwargs(self, system: str, messages: list[LLMMessage]) -> dict[str, Any]:
+        sdk_messages = chat_messages(system, messages)
+        return {
+            "model":       self.config.model,
+            "max_tokens":  self.config.max_tokens,
+            "temperature": self.config.temperature,
+            "messages":    sdk_messages,
+        }
+
+    def _to_response(self, response: Any) -> LLMResponse:
+        usage = response.usage
+        return LLMResponse(
+            text=response.choices[0].message.content or "",
+            model=response.model,
+            provider="openai",
+            input_tokens=usage.prompt_tokens if usage else 0,
+            output_tokens=usage.completion_tokens if usage else 0,
+            raw=self._raw(response),
+        )
+
+    def stream(
+        self,
+        system: str,
+        messages: list[LLMMessage],
+        cache_marker: bool = False,
+    ) -> Iterator[str]:
+        """Yield content deltas from a ``stream=True`` chat completion."""
+        if not self._client:
+            raise LLMNotAvailableError(
+                "OpenAIProvider is not configured. "
+                "Set OPENAI_API_KEY and pip install openai."
             )
-            text = response.choices[0].message.content or ""
-            usage = response.usage
-            return LLMResponse(
-                text=text,
-                model=response.model,
-                provider="openai",
-                input_tokens=usage.prompt_tokens if usage else 0,
-                output_tokens=usage.completion_tokens if usage else 0,
-                raw=response,
+
+        try:
+            response_stream = self._client.chat.completions.create(
+                **self._chat_kwargs(system, messages), stream=True,
             )
         except Exception as exc:
-            # openai raises openai.OpenAIError and subclasses
             raise LLMProviderError(f"OpenAI API error: {exc}") from exc
+        try:
+            for chunk in response_stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as exc:
+            raise LLMProviderError(f"OpenAI streaming error: {exc}") from exc
+        finally:
+            response_stream.close()
 
     # ------------------------------------------------------------------
     # Native tool-use (OpenAI function_calling / tools API)
@@ -149,8 +207,7 @@ class OpenAIProvider(BaseLLMProvider):
             }
             for t in tools
         ]
-        sdk_messages = [{"role": "system", "content": system}]
-        sdk_messages += [{"role": m.role, "content": m.content} for m in messages]
+        sdk_messages = chat_messages(system, messages)
 
         try:
             response = self._client.chat.completions.create(
@@ -189,7 +246,7 @@ class OpenAIProvider(BaseLLMProvider):
                 provider="openai",
                 input_tokens=usage.prompt_tokens if usage else 0,
                 output_tokens=usage.completion_tokens if usage else 0,
-                raw=response,
+                raw=self._raw(response),
                 tool_calls=tool_calls if tool_calls else None,
             )
         except Exception as exc:
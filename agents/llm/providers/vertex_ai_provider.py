@@ -140,7 +140,7 @@ class VertexAIProvider(BaseLLMProvider):
                 provider="vertex_ai",
                 input_tokens=in_tok,
                 output_tokens=out_tok,
-                raw=response,
+                raw=self._raw(response),
             )
         except Exception as exc:
             raise LLMProviderError(f"Vertex AI / Gemini error: {exc}") from exc
@@ -314,7 +314,7 @@ class VertexAIProvider(BaseLLMProvider):
                 provider="vertex_ai",
                 input_tokens=in_tok,
                 output_tokens=out_tok,
-                raw=response,
+                raw=self._raw(response),
                 tool_calls=tool_calls,
             )
 
@@ -329,5 +329,5 @@ class VertexAIProvider(BaseLLMProvider):
             provider="vertex_ai",
             input_tokens=in_tok,
             output_tokens=out_tok,
-            raw=response,
+            raw=self._raw(response),
         )
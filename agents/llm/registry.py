@@ -32,21 +32,35 @@ Interactive probe (for setup wizards):
 
 from __future__ import annotations
 
+import asyncio
+import dataclasses
+import importlib
 import logging
 import os
 import shlex
 import sys
-from typing import TYPE_CHECKING
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Iterator
 
 from agents.llm.base import (
-    LLMConfig, LLMMessage, LLMResponse, LLMNotAvailableError, ToolDefinition,
+    LLMConfig, LLMMessage, LLMResponse, LLMNotAvailableError, LLMProviderError,
+    ToolDefinition,
 )
+from agents.llm.response_cache import ResponseCache
 
 if TYPE_CHECKING:
     from agents.llm.base import BaseLLMProvider
 
 logger = logging.getLogger(__name__)
 
+# Worker threads behind LLMRouter.prefetch()
+_PREFETCH_WORKERS = 4
+
+# HTTP statuses that say the request itself was wrong, not that the provider is down
+_CLIENT_ERROR_STATUSES = frozenset({400, 401, 403, 404, 422})
+
 # ---------------------------------------------------------------------------
 # Provider name constants
 # ---------------------------------------------------------------------------
@@ -63,44 +77,48 @@ PROVIDER_VERTEX_AI       = "vertex_ai"        # Google Gemini API / Vertex AI
 # Provider registry (lazy import to avoid hard SDK dependencies)
 # ---------------------------------------------------------------------------
 
-def _load_provider(config: LLMConfig) -> "BaseLLMProvider":
-    """Instantiate the correct provider class for config.provider."""
-    p = config.provider.lower().replace("-", "_")
-
-    if p == PROVIDER_ANTHROPIC:
-        from agents.llm.providers.anthropic_provider import AnthropicProvider
-        return AnthropicProvider(config)
-
-    if p == PROVIDER_OPENAI:
-        from agents.llm.providers.openai_provider import OpenAIProvider
-        return OpenAIProvider(config)
-
-    if p == PROVIDER_OPENAI_COMPAT:
-        from agents.llm.providers.openai_compat_provider import OpenAICompatProvider
-        return OpenAICompatProvider(config)
-
-    if p == PROVIDER_OLLAMA:
-        from agents.llm.providers.ollama_provider import OllamaProvider
-        return OllamaProvider(config)
-
-    if p == PROVIDER_LLAMACPP:
-        from agents.llm.providers.llamacpp_provider import LlamaCppProvider
-        return LlamaCppProvider(config)
+# Normalised provider name -> (module, class), imported only when requested
+_PROVIDER_LOADERS: dict[str, tuple[str, str]] = {
+    PROVIDER_ANTHROPIC:     ("agents.llm.providers.anthropic_provider",     "AnthropicProvider"),
+    PROVIDER_OPENAI:        ("agents.llm.providers.openai_provider",        "OpenAIProvider"),
+    PROVIDER_OPENAI_COMPAT: ("agents.llm.providers.openai_compat_provider", "OpenAICompatProvider"),
+    PROVIDER_OLLAMA:        ("agents.llm.providers.ollama_provider",        "OllamaProvider"),
+    PROVIDER_LLAMACPP:      ("agents.llm.providers.llamacpp_provider",      "LlamaCppProvider"),
+    PROVIDER_SUBPROCESS:    ("agents.llm.providers.subprocess_provider",    "SubprocessProvider"),
+    PROVIDER_VERTEX_AI:     ("agents.llm.providers.vertex_ai_provider",     "VertexAIProvider"),
+}
+
+# Every accepted provider name, for CLI choices and error messages
+VALID_PROVIDERS: tuple[str, ...] = tuple(_PROVIDER_LOADERS)
+_VALID_PROVIDERS_MSG = ", ".join(VALID_PROVIDERS)
+
+# Provider-name normalisation ("OpenAI-Compat" -> "openai_compat") in one pass
+_PROVIDER_NAME_TABLE = str.maketrans(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ-",
+    "abcdefghijklmnopqrstuvwxyz_",
+)
 
-    if p == PROVIDER_SUBPROCESS:
-        from agents.llm.providers.subprocess_provider import SubprocessProvider
-        return SubprocessProvider(config)
+# Classes already resolved by _load_provider (normalised name -> class)
+_PROVIDER_CLASS_CACHE: dict[str, type["BaseLLMProvider"]] = {}
 
-    if p == PROVIDER_VERTEX_AI:
-        from agents.llm.providers.vertex_ai_provider import VertexAIProvider
-        return VertexAIProvider(config)
 
-    raise ValueError(
-        f"Unknown provider '{config.provider}'. "
-        f"Valid options: {PROVIDER_ANTHROPIC}, {PROVIDER_OPENAI}, "
-        f"{PROVIDER_OPENAI_COMPAT}, {PROVIDER_OLLAMA}, {PROVIDER_LLAMACPP}, "
-        f"{PROVIDER_SUBPROCESS}, {PROVIDER_VERTEX_AI}"
-    )
+def _load_provider(config: LLMConfig) -> "BaseLLMProvider":
+    """Instantiate the correct provider class for config.provider."""
+    p = config.provider.translate(_PROVIDER_NAME_TABLE)
+
+    provider_cls = _PROVIDER_CLASS_CACHE.get(p)
+    if provider_cls is None:
+        loader = _PROVIDER_LOADERS.get(p)
+        if loader is None:
+            raise ValueError(
+                f"Unknown provider '{config.provider}'. "
+                f"Valid options: {_VALID_PROVIDERS_MSG}"
+            )
+        module_name, class_name = loader
+        provider_cls = getattr(importlib.import_module(module_name), class_name)
+        # Idempotent single-key store, so concurrent first loads are harmless
+        _PROVIDER_CLASS_CACHE[p] = provider_cls
+    return provider_cls(config)
 
 
 # ---------------------------------------------------------------------------
@@ -338,6 +356,130 @@ def select_llm_interactively(
         _p(f"  (Enter a number between 1 and {none_idx if allow_none else len(options)})")
 
 
+# ---------------------------------------------------------------------------
+# CLI → LLMConfig mapping used by LLMRouter.from_cli_args
+# ---------------------------------------------------------------------------
+
+# (argparse dest, LLMConfig field, converter, apply when falsy).  Options
+# whose 0 is meaningful apply whenever set; the rest only when truthy.
+# --llm-subprocess-cmd is handled separately (it also switches provider).
+_CLI_FIELD_MAP: tuple[tuple[str, str, "Callable[[object], object] | None", bool], ...] = (
+    ("llm_provider",        "provider",        None,                          False),
+    ("llm_model",           "model",           None,                          False),
+    ("llm_base_url",        "base_url",        None,                          False),
+    ("llm_model_path",      "model_path",      None,                          False),
+    ("ollama_host",         "ollama_host",     None,                          False),
+    ("llm_max_tokens",      "max_tokens",      None,                          False),
+    ("llm_temperature",     "temperature",     None,                          False),
+    ("llm_timeout",         "timeout_seconds", int,                           True),
+    ("llm_max_retries",     "max_retries",     lambda v: max(0, int(v)),      True),
+    ("llm_subprocess_args", "subprocess_args", list,                          False),
+    ("llm_subprocess_env",  "subprocess_env",  dict,                          False),
+)
+
+
+# ---------------------------------------------------------------------------
+# Environment-derived config cache (LLMRouter._config_from_env)
+# ---------------------------------------------------------------------------
+
+# Every variable _build_config_from_env reads; PATH decides CLI auto-detection
+_CONFIG_ENV_KEYS: tuple[str, ...] = (
+    "LLM_PROVIDER", "LLM_MODEL", "LLM_BASE_URL", "LLM_API_KEY", "LLM_API_VERSION",
+    "LLM_MAX_TOKENS", "LLM_TEMPERATURE", "LLM_SUBPROCESS_CMD", "LLM_SUBPROCESS_ARGS",
+    "LLAMACPP_MODEL_PATH", "LLAMACPP_N_CTX", "LLAMACPP_N_GPU_LAYERS",
+    "OLLAMA_MODEL", "OLLAMA_HOST",
+    "OPENAI_API_KEY", "ANTHROPIC_API_KEY", "GOOGLE_API_KEY", "GOOGLE_CLOUD_PROJECT",
+    "PATH",
+)
+
+# (fingerprint of _CONFIG_ENV_KEYS, config built from it)
+_env_config_cache: tuple[tuple[str | None, ...], LLMConfig] | None = None
+
+
+# ---------------------------------------------------------------------------
+# Circuit breaker — stop paying for a provider that keeps failing
+# ---------------------------------------------------------------------------
+
+@dataclasses.dataclass
+class CircuitBreakerConfig:
+    """When LLMRouter stops sending requests to a failing provider, and for how long."""
+    failure_threshold:      int   = 5      # consecutive failures that open the circuit
+    open_duration_secs:     float = 60.0   # how long to skip the provider once open
+    half_open_max_requests: int   = 1      # probes let through after the cooldown
+
+
+def _is_client_error(exc: BaseException) -> bool:
+    """True if *exc* wraps an HTTP 4xx that retrying elsewhere would not fix."""
+    cause = exc.__cause__
+    status = getattr(cause, "status_code", None)
+    if status is None:
+        status = getattr(getattr(cause, "response", None), "status_code", None)
+    return status in _CLIENT_ERROR_STATUSES
+
+
+class _CircuitBreaker:
+    """
+    Three-state breaker: *closed* (normal), *open* (skip the provider) after
+    ``failure_threshold`` consecutive failures, then *half-open* once
+    ``open_duration_secs`` have passed, admitting a few probes whose outcome
+    closes or re-opens the circuit.  A probe that ends without an outcome
+    (cancelled, or a non-provider error) must hand its slot back with
+    release(), or the circuit would stay half-open with no slots left.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, config: CircuitBreakerConfig) -> None:
+        self.config    = config
+        self.state     = self.CLOSED
+        self.failures  = 0
+        self.opened_at = 0.0
+        self._probes   = 0
+        self._lock     = threading.Lock()
+
+    def acquire(self) -> bool | None:
+        """
+        None if the circuit refuses a request now; otherwise whether a
+        half-open probe slot was claimed (hand it back with release()).
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.config.open_duration_secs:
+                    return None
+                self.state, self._probes = self.HALF_OPEN, 0
+            if self.state == self.HALF_OPEN:
+                if self._probes >= self.config.half_open_max_requests:
+                    return None
+                self._probes += 1
+                return True
+            return False
+
+    def release(self) -> None:
+        """Return a probe slot claimed by acquire(); a no-op once the circuit has left half-open."""
+        with self._lock:
+            if self.state == self.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state, self.failures = self.CLOSED, 0
+
+    def record_failure(self, exc: BaseException) -> None:
+        if _is_client_error(exc):
+            # The provider answered; the request was at fault
+            self.record_success()
+            return
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.config.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(
+                        "Circuit opened after %d consecutive failure(s); skipping for %.0fs.",
+                        self.failures, self.config.open_duration_secs,
+                    )
+                self.state, self.opened_at = self.OPEN, time.monotonic()
+
+
 # ---------------------------------------------------------------------------
 # LLMRouter — the single entry point for all agents
 # ---------------------------------------------------------------------------
@@ -346,21 +488,45 @@ class LLMRouter:
     """
     Wraps a provider and exposes the same interface as BaseLLMProvider.
     Also handles:
-      - fallback chain (try primary provider, fall back to secondary)
+      - fallback chain (try each provider in turn: primary, then fallbacks)
+      - a circuit breaker per provider that skips it while it keeps failing
       - availability check
       - logging of every request
+      - prefetching, and coalescing of identical in-flight requests
 
     Agents create one LLMRouter and call router.complete() — they never
     instantiate providers directly.
     """
 
+    __slots__ = ("_chain", "_breakers", "_inflight", "_inflight_lock", "_prefetch_pool")
+
     def __init__(
         self,
-        primary: "BaseLLMProvider",
+        primary: "BaseLLMProvider | list[BaseLLMProvider]",
         fallback: "BaseLLMProvider | None" = None,
+        breaker: CircuitBreakerConfig | None = None,
     ) -> None:
-        self._primary  = primary
-        self._fallback = fallback
+        # primary may be the whole chain, in priority order
+        chain = list(primary) if isinstance(primary, (list, tuple)) else [primary]
+        if fallback is not None:
+            chain.append(fallback)
+        if not chain:
+            raise ValueError("LLMRouter needs at least one provider")
+        self._chain    = chain
+        self._breakers = [_CircuitBreaker(breaker or CircuitBreakerConfig()) for _ in chain]
+        # Request key -> Future of the call currently serving it
+        self._inflight: dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._prefetch_pool: ThreadPoolExecutor | None = None
+
+    @property
+    def _primary(self) -> "BaseLLMProvider":
+        return self._chain[0]
+
+    @property
+    def _fallback(self) -> "BaseLLMProvider | None":
+        """First fallback, or None for a single-provider router."""
+        return self._chain[1] if len(self._chain) > 1 else None
 
     # ------------------------------------------------------------------
     # Factory methods
@@ -370,16 +536,26 @@ class LLMRouter:
     def from_config(
         cls,
         config: LLMConfig,
-        fallback_config: LLMConfig | None = None,
+        fallback_config: LLMConfig | list[LLMConfig] | None = None,
+        breaker: CircuitBreakerConfig | None = None,
     ) -> "LLMRouter":
-        """Build a router directly from LLMConfig object(s)."""
-        primary  = _load_provider(config)
-        fallback = _load_provider(fallback_config) if fallback_config else None
-        logger.info(
-            "LLMRouter created: primary=%s fallback=%s",
-            primary, fallback or "(none)"
-        )
-        return cls(primary, fallback)
+        """
+        Build a router directly from LLMConfig object(s).  *fallback_config*
+        may be a list, tried in order after the primary.
+        """
+        if fallback_config is None:
+            fallback_configs = []
+        elif isinstance(fallback_config, LLMConfig):
+            fallback_configs = [fallback_config]
+        else:
+            fallback_configs = list(fallback_config)
+        chain = [_load_provider(config)] + [_load_provider(c) for c in fallback_configs]
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "LLMRouter created: primary=%s fallback=%s",
+                chain[0], ", ".join(map(str, chain[1:])) or "(none)"
+            )
+        return cls(chain, breaker=breaker)
 
     @classmethod
     def from_env(cls) -> "LLMRouter":
@@ -406,31 +582,21 @@ class LLMRouter:
         Build a router from parsed argparse.Namespace (from main.py).
         Returns None if --no-llm flag is set.
         """
-        if getattr(args, "no_llm", False):
+        opts = args if isinstance(args, dict) else vars(args)
+        if opts.get("no_llm"):
             logger.info("--no-llm flag set. LLM disabled.")
             return None
 
         config = cls._config_from_env()
 
         # CLI args override env vars
-        if getattr(args, "llm_provider", None):
-            config.provider = args.llm_provider
-        if getattr(args, "llm_model", None):
-            config.model = args.llm_model
-        if getattr(args, "llm_base_url", None):
-            config.base_url = args.llm_base_url
-        if getattr(args, "llm_model_path", None):
-            config.model_path = args.llm_model_path
-        if getattr(args, "ollama_host", None):
-            config.ollama_host = args.ollama_host
-        if getattr(args, "llm_max_tokens", None):
-            config.max_tokens = args.llm_max_tokens
-        if getattr(args, "llm_temperature", None):
-            config.temperature = args.llm_temperature
-        if getattr(args, "llm_timeout", None) is not None:
-            config.timeout_seconds = int(args.llm_timeout)
-        if getattr(args, "llm_subprocess_cmd", None):
-            new_cmd = args.llm_subprocess_cmd
+        for arg_name, field, convert, allow_falsy in _CLI_FIELD_MAP:
+            value = opts.get(arg_name)
+            if value is None or not (value or allow_falsy):
+                continue
+            setattr(config, field, convert(value) if convert else value)
+        new_cmd = opts.get("llm_subprocess_cmd")
+        if new_cmd:
             # When the command changes (e.g. auto-detected "claude" → explicit
             # "codex"), clear the stale placeholder model name so the subprocess
             # uses its own default model.  Real model identifiers like "o3" or
@@ -441,10 +607,6 @@ class LLMRouter:
                 config.model = new_cmd   # replace old placeholder with new one
             config.provider        = PROVIDER_SUBPROCESS
             config.subprocess_cmd  = new_cmd
-        if getattr(args, "llm_subprocess_args", None):
-            config.subprocess_args = list(args.llm_subprocess_args)
-        if getattr(args, "llm_subprocess_env", None):
-            config.subprocess_env  = dict(args.llm_subprocess_env)
 
         logger.info(
             "LLM configured from CLI: provider=%s model=%s base_url=%s",
@@ -452,15 +614,24 @@ class LLMRouter:
         )
         return cls.from_config(config)
 
+    def with_model(self, model: str) -> "LLMRouter":
+        """
+        Return a router for the same primary provider configured with a
+        different *model* (e.g. a cheaper tier for simple requests).
+        The fallback providers are shared unchanged.
+        """
+        primary = _load_provider(dataclasses.replace(self._primary.config, model=model))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("LLMRouter derived: primary=%s fallback=%s", primary, self._fallback or "(none)")
+        return type(self)([primary, *self._chain[1:]], breaker=self._breakers[0].config)
+
     # ------------------------------------------------------------------
     # Public API (mirrors BaseLLMProvider)
     # ------------------------------------------------------------------
 
     @property
     def is_available(self) -> bool:
-        return self._primary.is_available or (
-            self._fallback is not None and self._fallback.is_available
-        )
+        return any(p.is_available for p in self._chain)
 
     @property
     def provider_name(self) -> str:
@@ -475,6 +646,23 @@ class LLMRouter:
         """True if the active provider supports native tool/function calling."""
         return self._primary.supports_tool_use()
 
+    def close(self) -> None:
+        """
+        Close every provider in the chain.  Routers made by with_model()
+        share the fallbacks, so close only the outermost one.
+        """
+        if self._prefetch_pool is not None:
+            self._prefetch_pool.shutdown(wait=False, cancel_futures=True)
+            self._prefetch_pool = None
+        for provider in self._chain:
+            provider.close()
+
+    def __enter__(self) -> "LLMRouter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
     def complete_with_tools(
         self,
         system: str,
@@ -483,7 +671,7 @@ class LLMRouter:
     ) -> LLMResponse:
         """
         Send a completion request with tool definitions (native function-calling).
-        Delegates to the primary provider's complete_with_tools() implementation.
+        Delegates to each provider's complete_with_tools() along the chain.
 
         Returns an LLMResponse with .tool_calls populated when the model chose
         to invoke a tool, or .text for a regular text response.
@@ -492,54 +680,305 @@ class LLMRouter:
             NotImplementedError: if the primary provider does not support tool-use.
                 Check supports_tool_use first to avoid this.
         """
-        if not self._primary.is_available:
-            raise LLMNotAvailableError(
-                f"No LLM provider is available. Primary: {self._primary}"
-            )
-        from agents.llm.base import LLMProviderError
-        try:
-            return self._primary.complete_with_tools(system, messages, tools)
-        except LLMProviderError as exc:
-            if self._fallback and self._fallback.is_available:
-                logger.warning(
-                    "Primary provider tool-use error (%s) — retrying with fallback: %s",
-                    exc, self._fallback
+        return self._call_chain(
+            lambda provider: provider.complete_with_tools(system, messages, tools)
+        )
+
+    def complete(
+        self,
+        system: str,
+        messages: list[LLMMessage],
+        cache_marker: bool = False,
+    ) -> LLMResponse:
+        """
+        Send a completion request, trying each provider in the chain in turn.
+
+        ``cache_marker=True`` asks providers with explicit prompt caching
+        (see BaseLLMProvider.supports_prompt_cache) to cache the system
+        prompt as a shared prefix.  Providers that cache prefixes
+        automatically (OpenAI) or not at all ignore it.
+
+        While prefetch() has requests in flight, an identical one is joined
+        rather than sent a second time.  Otherwise the request goes straight
+        to the chain, without hashing the prompt.
+
+        Raises:
+            LLMNotAvailableError: if no provider is configured.
+            LLMProviderError:     if all providers fail.
+        """
+        if not self._inflight:
+            return self._complete(system, messages, cache_marker)
+        key = self._request_key(system, messages, cache_marker)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Joining in-flight LLM request %s", key[:12])
+            return future.result()
+        return self._run_inflight(key, future, system, messages, cache_marker)
+
+    def prefetch(
+        self,
+        system: str,
+        messages: list[LLMMessage],
+        cache_marker: bool = False,
+    ) -> "Future[LLMResponse]":
+        """
+        Start complete() on a background thread and return its Future, so a
+        likely next request overlaps the current one.  A later complete()
+        with the same arguments waits on this call instead of repeating it.
+        """
+        key = self._request_key(system, messages, cache_marker)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = self._inflight[key] = Future()
+            if self._prefetch_pool is None:
+                self._prefetch_pool = ThreadPoolExecutor(
+                    max_workers=_PREFETCH_WORKERS, thread_name_prefix="llm-prefetch",
                 )
-                return self._fallback.complete_with_tools(system, messages, tools)
+            pool = self._prefetch_pool
+        try:
+            pool.submit(self._run_inflight, key, future, system, messages, cache_marker)
+        except RuntimeError as exc:   # pool shut down by close()
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+            future.set_exception(exc)
+        return future
+
+    def _run_inflight(
+        self,
+        key: str,
+        future: Future,
+        system: str,
+        messages: list[LLMMessage],
+        cache_marker: bool,
+    ) -> LLMResponse:
+        """Serve the request owning *future*, publish the outcome, then retire the key."""
+        try:
+            response = self._complete(system, messages, cache_marker)
+        except BaseException as exc:
+            future.set_exception(exc)
             raise
+        else:
+            future.set_result(response)
+            return response
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
 
-    def complete(
+    @staticmethod
+    def _request_key(system: str, messages: list[LLMMessage], cache_marker: bool) -> str:
+        parts = [system, "1" if cache_marker else "0"]
+        for m in messages:
+            parts += (m.role, m.content)
+        return ResponseCache.make_key(*parts)
+
+    def _complete(
         self,
         system: str,
         messages: list[LLMMessage],
+        cache_marker: bool,
     ) -> LLMResponse:
+        return self._call_chain(
+            lambda provider: self._complete_on(provider, system, messages, cache_marker)
+        )
+
+    async def acomplete(
+        self,
+        system: str,
+        messages: list[LLMMessage],
+        cache_marker: bool = False,
+    ) -> LLMResponse:
+        """
+        Awaitable variant of complete(), with the same primary → fallback
+        behaviour.  Delegates to each provider's acomplete().
+        """
+        last_exc: LLMProviderError | None = None
+        for provider, breaker, probe in self._attempts():
+            if last_exc is not None:
+                self._log_fallback(last_exc, provider)
+            try:
+                response = await provider.acomplete(system, messages, cache_marker=cache_marker)
+            except LLMProviderError as exc:
+                breaker.record_failure(exc)
+                last_exc = exc
+                continue
+            finally:
+                if probe:
+                    breaker.release()
+            breaker.record_success()
+            response.fallback = provider is not self._primary
+            return response
+        raise last_exc
+
+    async def acomplete_many(
+        self,
+        system: str,
+        batch: list[list[LLMMessage]],
+        max_concurrency: int = 8,
+        cache_marker: bool = False,
+    ) -> list[LLMResponse]:
+        """
+        Run acomplete() for every message list in *batch*, at most
+        *max_concurrency* in flight, and return the responses in order.
+        Each request walks the fallback chain on its own, and all of them
+        feed the same circuit breakers.  The first failure propagates.
+        """
+        gate = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _one(messages: list[LLMMessage]) -> LLMResponse:
+            async with gate:
+                return await self.acomplete(system, messages, cache_marker=cache_marker)
+
+        return list(await asyncio.gather(*(_one(m) for m in batch)))
+
+    def complete_many(
+        self,
+        system: str,
+        batch: list[list[LLMMessage]],
+        max_concurrency: int = 8,
+        cache_marker: bool = False,
+    ) -> list[LLMResponse]:
+        """
+        Blocking acomplete_many() for callers without an event loop.
+        Must not be called from inside a running loop — await
+        acomplete_many() there instead.
         """
-        Send a completion request, trying primary then fallback.
+        if not batch:
+            return []
+
+        async def _run() -> list[LLMResponse]:
+            # Close the providers' async clients before asyncio.run() drops the loop
+            try:
+                return await self.acomplete_many(
+                    system, batch, max_concurrency, cache_marker=cache_marker,
+                )
+            finally:
+                for provider in self._chain:
+                    await provider.aclose()
+
+        return asyncio.run(_run())
+
+    def stream(
+        self,
+        system: str,
+        messages: list[LLMMessage],
+        cache_marker: bool = False,
+        on_fallback: "Callable[[], None] | None" = None,
+    ) -> Iterator[str]:
+        """
+        Yield the response text incrementally, trying primary then fallback.
+
+        The fallback is only used if the primary fails before producing any
+        output; an error mid-stream propagates.  *on_fallback* is called
+        when a provider other than the primary starts streaming (the
+        counterpart of LLMResponse.fallback).  Close the iterator to
+        abandon the request early.
 
         Raises:
             LLMNotAvailableError: if no provider is configured.
             LLMProviderError:     if all providers fail.
         """
-        if not self._primary.is_available:
-            if self._fallback and self._fallback.is_available:
-                logger.info("Primary provider unavailable — using fallback.")
-                return self._fallback.complete(system, messages)
+        last_exc: LLMProviderError | None = None
+        for provider, breaker, probe in self._attempts():
+            if last_exc is not None:
+                self._log_fallback(last_exc, provider)
+            started = False
+            if on_fallback is not None and provider is not self._primary:
+                on_fallback()
+            try:
+                for chunk in provider.stream(system, messages, cache_marker=cache_marker):
+                    started = True
+                    yield chunk
+            except GeneratorExit:
+                # Consumer abandoned the stream: the provider was answering
+                breaker.record_success()
+                raise
+            except LLMProviderError as exc:
+                breaker.record_failure(exc)
+                if started:
+                    raise
+                last_exc = exc
+                continue
+            finally:
+                if probe:
+                    breaker.release()
+            breaker.record_success()
+            return
+        raise last_exc
+
+    # ------------------------------------------------------------------
+    # Fallback chain
+    # ------------------------------------------------------------------
+
+    def _attempts(self) -> Iterator[tuple["BaseLLMProvider", _CircuitBreaker, bool]]:
+        """
+        Yield ``(provider, breaker, probe)`` for the providers to try, in
+        order: available ones whose circuit admits a request.  If every
+        circuit is open, the last available provider is tried anyway rather
+        than failing without a request.  The caller asks for the next one
+        only after a failure, and must release() the breaker when *probe*
+        is set, whatever the outcome.
+        """
+        live = [(p, b) for p, b in zip(self._chain, self._breakers) if p.is_available]
+        if not live:
             raise LLMNotAvailableError(
                 f"No LLM provider is available. "
-                f"Primary: {self._primary} | Fallback: {self._fallback}"
+                f"Chain: {' | '.join(map(str, self._chain))}"
             )
+        tried = False
+        for i, (provider, breaker) in enumerate(live):
+            probe = breaker.acquire()
+            if probe is not None or (not tried and i == len(live) - 1):
+                tried = True
+                yield provider, breaker, bool(probe)
+            else:
+                logger.info("Circuit open for %s — skipping.", provider)
 
-        from agents.llm.base import LLMProviderError
-        try:
-            return self._primary.complete(system, messages)
-        except LLMProviderError as exc:
-            if self._fallback and self._fallback.is_available:
-                logger.warning(
-                    "Primary provider error (%s) — retrying with fallback: %s",
-                    exc, self._fallback
-                )
-                return self._fallback.complete(system, messages)
-            raise
+    def _call_chain(
+        self,
+        call: "Callable[[BaseLLMProvider], LLMResponse]",
+    ) -> LLMResponse:
+        """Run *call* against each provider from _attempts() until one succeeds."""
+        last_exc: LLMProviderError | None = None
+        for provider, breaker, probe in self._attempts():
+            if last_exc is not None:
+                self._log_fallback(last_exc, provider)
+            try:
+                response = call(provider)
+            except LLMProviderError as exc:
+                breaker.record_failure(exc)
+                last_exc = exc
+                continue
+            finally:
+                if probe:
+                    breaker.release()
+            breaker.record_success()
+            response.fallback = provider is not self._primary
+            return response
+        raise last_exc
+
+    @staticmethod
+    def _log_fallback(exc: LLMProviderError, provider: "BaseLLMProvider") -> None:
+        logger.warning(
+            "Provider error (%s) — retrying with fallback: %s", exc, provider
+        )
+
+    @staticmethod
+    def _complete_on(
+        provider: "BaseLLMProvider",
+        system: str,
+        messages: list[LLMMessage],
+        cache_marker: bool,
+    ) -> LLMResponse:
+        if cache_marker and provider.supports_prompt_cache():
+            return provider.complete(system, messages, cache_marker=True)
+        return provider.complete(system, messages)
 
     # ------------------------------------------------------------------
     # Env-based config builder
@@ -547,116 +986,134 @@ class LLMRouter:
 
     @staticmethod
     def _config_from_env() -> LLMConfig:
+        """
+        LLMConfig derived from the environment.  The result is cached against
+        the variables it depends on (PATH included, for CLI auto-detection);
+        each caller gets its own shallow copy, so reassigning fields cannot
+        leak into the cache.
+        """
+        global _env_config_cache
+
+        fingerprint = tuple(os.environ.get(k) for k in _CONFIG_ENV_KEYS)
+        cached = _env_config_cache
+        if cached is None or cached[0] != fingerprint:
+            # One snapshot instead of a dozen os.environ round-trips
+            config = LLMRouter._build_config_from_env(os.environ.copy())
+            cached = _env_config_cache = (fingerprint, config)
+        return dataclasses.replace(cached[1])
+
+    @staticmethod
+    def _build_config_from_env(env: dict[str, str]) -> LLMConfig:
         import shutil
 
         config = LLMConfig()
 
         # Explicit provider override
-        if os.environ.get("LLM_PROVIDER"):
-            config.provider = os.environ["LLM_PROVIDER"]
+        if env.get("LLM_PROVIDER"):
+            config.provider = env["LLM_PROVIDER"]
             # Carry subprocess_cmd through if applicable
             if config.provider == PROVIDER_SUBPROCESS:
-                config.subprocess_cmd = os.environ.get("LLM_SUBPROCESS_CMD", "")
+                config.subprocess_cmd = env.get("LLM_SUBPROCESS_CMD", "")
 
         # Local LlamaCpp
-        elif os.environ.get("LLAMACPP_MODEL_PATH"):
+        elif env.get("LLAMACPP_MODEL_PATH"):
             config.provider   = PROVIDER_LLAMACPP
-            config.model_path = os.environ["LLAMACPP_MODEL_PATH"]
+            config.model_path = env["LLAMACPP_MODEL_PATH"]
             config.model      = os.path.basename(config.model_path)
-            if os.environ.get("LLAMACPP_N_CTX"):
-                config.n_ctx = int(os.environ["LLAMACPP_N_CTX"])
-            if os.environ.get("LLAMACPP_N_GPU_LAYERS"):
-                config.n_gpu_layers = int(os.environ["LLAMACPP_N_GPU_LAYERS"])
+            if env.get("LLAMACPP_N_CTX"):
+                config.n_ctx = int(env["LLAMACPP_N_CTX"])
+            if env.get("LLAMACPP_N_GPU_LAYERS"):
+                config.n_gpu_layers = int(env["LLAMACPP_N_GPU_LAYERS"])
 
         # Local Ollama
-        elif os.environ.get("OLLAMA_MODEL"):
+        elif env.get("OLLAMA_MODEL"):
             config.provider     = PROVIDER_OLLAMA
-            config.model        = os.environ["OLLAMA_MODEL"]
-            config.ollama_host  = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+            config.model        = env["OLLAMA_MODEL"]
+            config.ollama_host  = env.get("OLLAMA_HOST", "http://localhost:11434")
 
         # OpenAI-compat custom endpoint (LM Studio, vLLM, Anyscale, etc.)
-        elif os.environ.get("LLM_BASE_URL") and not os.environ.get("OPENAI_API_KEY"):
+        elif env.get("LLM_BASE_URL") and not env.get("OPENAI_API_KEY"):
             config.provider  = PROVIDER_OPENAI_COMPAT
-            config.base_url  = os.environ["LLM_BASE_URL"]
-            config.model     = os.environ.get("LLM_MODEL", "local-model")
-            config.api_key   = os.environ.get("LLM_API_KEY", "not-needed")
+            config.base_url  = env["LLM_BASE_URL"]
+            config.model     = env.get("LLM_MODEL", "local-model")
+            config.api_key   = env.get("LLM_API_KEY", "not-needed")
 
         # OpenAI
-        elif os.environ.get("OPENAI_API_KEY"):
+        elif env.get("OPENAI_API_KEY"):
             config.provider = PROVIDER_OPENAI
-            config.model    = os.environ.get("LLM_MODEL", "gpt-4o")
-            config.api_key  = os.environ["OPENAI_API_KEY"]
-            if os.environ.get("LLM_BASE_URL"):
-                config.base_url = os.environ["LLM_BASE_URL"]
+            config.model    = env.get("LLM_MODEL", "gpt-4o")
+            config.api_key  = env["OPENAI_API_KEY"]
+            if env.get("LLM_BASE_URL"):
+                config.base_url = env["LLM_BASE_URL"]
 
         # Anthropic
-        elif os.environ.get("ANTHROPIC_API_KEY"):
+        elif env.get("ANTHROPIC_API_KEY"):
             config.provider = PROVIDER_ANTHROPIC
-            config.model    = os.environ.get("LLM_MODEL", "claude-opus-4-5")
-            config.api_key  = os.environ["ANTHROPIC_API_KEY"]
+            config.model    = env.get("LLM_MODEL", "claude-opus-4-5")
+            config.api_key  = env["ANTHROPIC_API_KEY"]
 
         # Vertex AI / Gemini (GOOGLE_API_KEY → Gemini API)
-        elif os.environ.get("GOOGLE_API_KEY"):
+        elif env.get("GOOGLE_API_KEY"):
             config.provider = PROVIDER_VERTEX_AI
-            config.model    = os.environ.get("LLM_MODEL", "gemini-2.0-flash")
-            config.api_key  = os.environ["GOOGLE_API_KEY"]
+            config.model    = env.get("LLM_MODEL", "gemini-2.0-flash")
+            config.api_key  = env["GOOGLE_API_KEY"]
 
         # Vertex AI (GCP service account / ADC)
-        elif os.environ.get("GOOGLE_CLOUD_PROJECT"):
+        elif env.get("GOOGLE_CLOUD_PROJECT"):
             config.provider = PROVIDER_VERTEX_AI
-            config.model    = os.environ.get("LLM_MODEL", "gemini-2.0-flash")
+            config.model    = env.get("LLM_MODEL", "gemini-2.0-flash")
 
         # Subprocess: explicit env var
-        elif os.environ.get("LLM_SUBPROCESS_CMD"):
-            cmd = os.environ["LLM_SUBPROCESS_CMD"].strip()
+        elif env.get("LLM_SUBPROCESS_CMD"):
+            cmd = env["LLM_SUBPROCESS_CMD"].strip()
             if shutil.which(cmd):
                 config.provider       = PROVIDER_SUBPROCESS
                 config.subprocess_cmd = cmd
-                config.model          = os.environ.get("LLM_MODEL", cmd)
+                config.model          = env.get("LLM_MODEL", cmd)
             else:
                 logger.warning(
                     "LLM_SUBPROCESS_CMD=%r not found in PATH — falling back to Anthropic default.",
                     cmd,
                 )
                 config.provider = PROVIDER_ANTHROPIC
-                config.model    = os.environ.get("LLM_MODEL", "claude-opus-4-5")
-                config.api_key  = os.environ.get("ANTHROPIC_API_KEY", "")
+                config.model    = env.get("LLM_MODEL", "claude-opus-4-5")
+                config.api_key  = env.get("ANTHROPIC_API_KEY", "")
 
         # Subprocess: auto-detect well-known CLIs
         elif shutil.which("claude"):
             config.provider       = PROVIDER_SUBPROCESS
             config.subprocess_cmd = "claude"
-            config.model          = os.environ.get("LLM_MODEL", "claude")
+            config.model          = env.get("LLM_MODEL", "claude")
             logger.info("Auto-detected Claude Code CLI — using subprocess provider.")
 
         elif shutil.which("codex"):
             config.provider       = PROVIDER_SUBPROCESS
             config.subprocess_cmd = "codex"
-            config.model          = os.environ.get("LLM_MODEL", "codex")
+            config.model          = env.get("LLM_MODEL", "codex")
             logger.info("Auto-detected OpenAI Codex CLI — using subprocess provider.")
 
         # No provider found
         else:
             config.provider = PROVIDER_ANTHROPIC
-            config.model    = os.environ.get("LLM_MODEL", "claude-opus-4-5")
-            config.api_key  = os.environ.get("ANTHROPIC_API_KEY", "")
+            config.model    = env.get("LLM_MODEL", "claude-opus-4-5")
+            config.api_key  = env.get("ANTHROPIC_API_KEY", "")
 
         # Universal overrides (always applied)
-        if os.environ.get("LLM_MODEL"):
-            config.model = os.environ["LLM_MODEL"]
-        if os.environ.get("LLM_MAX_TOKENS"):
-            config.max_tokens = int(os.environ["LLM_MAX_TOKENS"])
-        if os.environ.get("LLM_TEMPERATURE"):
-            config.temperature = float(os.environ["LLM_TEMPERATURE"])
-        if os.environ.get("LLM_API_VERSION"):
-            config.api_version = os.environ["LLM_API_VERSION"]
-        if os.environ.get("LLM_SUBPROCESS_ARGS"):
+        if env.get("LLM_MODEL"):
+            config.model = env["LLM_MODEL"]
+        if env.get("LLM_MAX_TOKENS"):
+            config.max_tokens = int(env["LLM_MAX_TOKENS"])
+        if env.get("LLM_TEMPERATURE"):
+            config.temperature = float(env["LLM_TEMPERATURE"])
+        if env.get("LLM_API_VERSION"):
+            config.api_version = env["LLM_API_VERSION"]
+        if env.get("LLM_SUBPROCESS_ARGS"):
             try:
-                config.subprocess_args = shlex.split(os.environ["LLM_SUBPROCESS_ARGS"])
+                config.subprocess_args = shlex.split(env["LLM_SUBPROCESS_ARGS"])
             except ValueError:
                 logger.warning(
                     "Invalid LLM_SUBPROCESS_ARGS value; using whitespace split fallback."
                 )
-                config.subprocess_args = os.environ["LLM_SUBPROCESS_ARGS"].split()
+                config.subprocess_args = env["LLM_SUBPROCESS_ARGS"].split()
 
         return config
@@ -0,0 +1,130 @@
+"""
+LLM Response Cache
+==================
+Persistent exact-match cache of converted code, so re-running a plan (or a
+plan containing identical boilerplate files) does not pay for the same LLM
+request twice.
+
+Entries are keyed by a BLAKE2b digest of everything that determines the
+reply — provider, model, system prompt (which embeds rules and target stack),
+scaffold hint and source code — and stored in a single SQLite file.
+
+Zero new pip dependencies — uses only stdlib: sqlite3, hashlib, threading.
+
+The default location is ``$LLM_CACHE_DIR/llm_cache.db`` when that variable is
+set, else ``~/.cache/ai-migration/llm_cache.db``.
+
+Usage:
+    from agents.llm.response_cache import ResponseCache
+
+    cache = ResponseCache()                       # default_cache_path()
+    key = ResponseCache.make_key(provider, model, system_prompt, source_code)
+    hit = cache.get(key)                          # LLMResponse or None
+    if hit is None:
+        response = router.complete(...)
+        cache.put(key, response)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from agents.llm.base import LLMResponse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "ai-migration" / "llm_cache.db"
+CACHE_DIR_ENV      = "LLM_CACHE_DIR"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key        TEXT PRIMARY KEY,
+    text       TEXT NOT NULL,
+    provider   TEXT NOT NULL,
+    model      TEXT NOT NULL,
+    created_at REAL NOT NULL
+)
+"""
+
+
+def default_cache_path() -> Path:
+    """Cache file used when none is given: ``$LLM_CACHE_DIR`` overrides the directory."""
+    cache_dir = os.environ.get(CACHE_DIR_ENV, "").strip()
+    if cache_dir:
+        return Path(cache_dir).expanduser() / DEFAULT_CACHE_PATH.name
+    return DEFAULT_CACHE_PATH
+
+
+class ResponseCache:
+    """
+    Thread-safe SQLite store of ``key -> LLMResponse`` (text, provider, model).
+
+    One connection is shared across threads (``check_same_thread=False``)
+    and serialised with a lock, so ConversionAgent worker threads can use a
+    single instance.
+    """
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self.path = Path(path).expanduser() if path else default_cache_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock:
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+        self.hits   = 0
+        self.misses = 0
+        logger.debug("ResponseCache opened: %s", self.path)
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Digest *parts* (length-prefixed, so boundaries cannot collide)."""
+        h = hashlib.blake2b(digest_size=32)
+        for part in parts:
+            data = part.encode("utf-8", errors="replace")
+            h.update(len(data).to_bytes(8, "little"))
+            h.update(data)
+        return h.hexdigest()
+
+    def get(self, key: str) -> LLMResponse | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, provider, model FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        text, provider, model = row
+        return LLMResponse(text=text, model=model, provider=provider)
+
+    def put(self, key: str, response: LLMResponse) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, text, provider, model, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, response.text, response.provider, response.model, time.time()),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def __repr__(self) -> str:
+        return f"ResponseCache(path={str(self.path)!r}, hits={self.hits}, misses={self.misses})"
@@ -405,6 +405,8 @@ class OrchestratorAgent:
             run_id=run_id,
             plan_ref=state.get("plan_path", ""),
             log_path=log_path,
+            # parallel steps: coalesce journal flushes instead of one per step
+            flush_interval=1.0 if (getattr(self._args, "llm_concurrency", None) or 1) > 1 else 0.0,
         )
 
         conv_agent = ConversionAgent(
@@ -416,6 +418,14 @@ class OrchestratorAgent:
             llm_router=self._llm_router,
             target=state["target"],
             memory_context=state.get("memory_context"),
+            max_workers=getattr(self._args, "llm_concurrency", None) or 1,
+            batch_size=getattr(self._args, "llm_batch_size", None) or 1,
+            response_cache=getattr(self._args, "llm_cache", None),
+            stream=getattr(self._args, "llm_stream", False),
+            llm_skip_threshold=getattr(self._args, "llm_skip_threshold", None) or 0,
+            simple_model=getattr(self._args, "llm_simple_model", None),
+            complexity_threshold=getattr(self._args, "llm_complexity_threshold", None) or 20,
+            max_source_bytes=getattr(self._args, "llm_max_source_bytes", None) or 0,
         )
 
         try:
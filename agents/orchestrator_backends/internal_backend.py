@@ -17,6 +17,12 @@ Decision rules encoded in _decide():
     - plan_revision_count >= max_plan_revisions → stop revising, proceed/escalate
     - iteration >= max_iterations (hard limit 20) → escalate
 
+History budget:
+    Action results are fed back as JSON, so the conversation can outgrow the
+    model's context window.  Before each LLM call the oldest turns after the
+    initial state message are dropped until the history fits
+    history_char_budget (~4 characters per token).
+
 Caller: OrchestratorAgent.execute()
 """
 
@@ -36,6 +42,39 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 _MAX_ITERATIONS = 20
+_DEFAULT_HISTORY_CHAR_BUDGET = 120_000   # ~30k tokens
+
+
+def _prune_history(messages: list[dict], char_budget: int) -> list[dict]:
+    """
+    Return *messages* trimmed to about *char_budget* characters.
+
+    The initial state message is always kept, followed by the newest turns
+    that fit — starting at an assistant turn so roles still alternate — and
+    at least the latest assistant / result exchange.  The initial message
+    notes how many turns were omitted.
+    """
+    if char_budget <= 0 or len(messages) <= 3:
+        return messages
+    if sum(len(m["content"]) for m in messages) <= char_budget:
+        return messages
+
+    head      = messages[0]
+    remaining = char_budget - len(head["content"])
+    start     = max(i for i, m in enumerate(messages) if m["role"] == "assistant")
+    used      = 0
+    for i in range(len(messages) - 1, 0, -1):
+        used += len(messages[i]["content"])
+        if used > remaining:
+            break
+        if messages[i]["role"] == "assistant":
+            start = min(start, i)
+
+    omitted = start - 1
+    if omitted <= 0:
+        return messages
+    note = f"\n\n[{omitted} earlier message(s) omitted to fit the context budget]"
+    return [{"role": head["role"], "content": head["content"] + note}, *messages[start:]]
 
 
 class InternalOrchestrationBackend:
@@ -67,6 +106,9 @@ class InternalOrchestrationBackend:
 
         self._max_revisions = int(orchestration_config.get("max_plan_revisions", 2))
         self._escalate_on_fail = orchestration_config.get("escalate_on_fail", True)
+        self._history_budget = int(orchestration_config.get(
+            "history_char_budget", _DEFAULT_HISTORY_CHAR_BUDGET,
+        ))
 
         logger.info(
             "InternalOrchestrationBackend: mode=%s max_plan_revisions=%d",
@@ -283,7 +325,10 @@ class InternalOrchestrationBackend:
         """
         from agents.llm.base import LLMMessage
 
-        llm_messages = [LLMMessage(role=m["role"], content=m["content"]) for m in messages]
+        llm_messages = [
+            LLMMessage(role=m["role"], content=m["content"])
+            for m in _prune_history(messages, self._history_budget)
+        ]
 
         if self._mode == "native_tools":
             return self._get_action_via_tools(llm_messages, state)
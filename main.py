@@ -76,6 +76,7 @@ from agents.plan_builder import (
     derive_target_path  as _pb_derive_target_path,
     resolve_project_structure as _pb_resolve_project_structure,
 )
+from agents.llm.registry import VALID_PROVIDERS
 
 # ---------------------------------------------------------------------------
 # Logging configuration
@@ -316,153 +317,166 @@ def run_pipeline(args: argparse.Namespace) -> int:
         checkpoints_dir=DEFAULT_CHECKPOINTS_DIR,
         run_id=run_id,
         feature=args.feature_name,
+        async_flush=True,
     )
-
-    # When force=True, remove any previously-written output files so the LLM
-    # does not see stale intermediate outputs and respond with prose instead of code.
-    if getattr(args, "force", False):
-        _output_root = Path(getattr(args, "output_root", None) or DEFAULT_OUTPUT_DIR / args.feature_name)
-        if _output_root.exists():
-            shutil.rmtree(_output_root, ignore_errors=True)
-            logger.info("force=True — cleared previous output: %s", _output_root)
-
-    # ---- Step 1: Config Ingestion ----
-    print_banner("Step 1: Config Ingestion")
     try:
-        config_agent = ConfigIngestionAgent(
-            skillset_path=args.skillset_config,
-            rules_path=args.rules_config,
+        # When force=True, remove any previously-written output files so the LLM
+        # does not see stale intermediate outputs and respond with prose instead of code.
+        if getattr(args, "force", False):
+            _output_root = Path(getattr(args, "output_root", None) or DEFAULT_OUTPUT_DIR / args.feature_name)
+            if _output_root.exists():
+                shutil.rmtree(_output_root, ignore_errors=True)
+                logger.info("force=True — cleared previous output: %s", _output_root)
+
+        # ---- Step 1: Config Ingestion ----
+        print_banner("Step 1: Config Ingestion")
+        try:
+            config_agent = ConfigIngestionAgent(
+                skillset_path=args.skillset_config,
+                rules_path=args.rules_config,
+            )
+            config = config_agent.load_and_validate()
+            logger.info("[OK] Config loaded and validated.")
+        except (FileNotFoundError, ConfigValidationError) as exc:
+            logger.error("Config ingestion failed: %s", exc)
+            return 1
+
+        # ---- Step 2: Scoping & Analysis ----
+        print_banner("Step 2: Scoping & Analysis")
+        scoping_agent = ScopingAgent(
+            feature_root=args.feature_root,
+            config=config,
         )
-        config = config_agent.load_and_validate()
-        logger.info("[OK] Config loaded and validated.")
-    except (FileNotFoundError, ConfigValidationError) as exc:
-        logger.error("Config ingestion failed: %s", exc)
-        return 1
-
-    # ---- Step 2: Scoping & Analysis ----
-    print_banner("Step 2: Scoping & Analysis")
-    scoping_agent = ScopingAgent(
-        feature_root=args.feature_root,
-        config=config,
-    )
-    try:
-        dependency_graph = scoping_agent.analyze()
-    except FileNotFoundError as exc:
-        logger.error("Scoping failed: %s", exc)
-        return 1
-
-    # Save graph
-    graph_path = DEFAULT_LOGS_DIR / f"{run_id}-dependency-graph.json"
-    scoping_agent.save(graph_path)
-    logger.info("[OK] Dependency graph saved: %s", graph_path)
-
-    # Print flags summary
-    flags = dependency_graph.get("flags", [])
-    if flags:
-        logger.warning("[!]  %d flag(s) detected during scoping:", len(flags))
-        for flag in flags:
-            logger.warning("   [%s] %s -- %s", flag["severity"], flag["rule"], flag["message"])
-
-    if args.mode == "scope":
-        logger.info("Mode=scope -- stopping after analysis. Dependency graph: %s", graph_path)
-        return 0
-
-    # ---- Step 3: Plan Document Generation ----
-    print_banner("Step 3: Plan Document Generation")
-    target_run = getattr(args, "target", "simpler_grants")
-    plan_agent = PlanAgent(
-        dependency_graph=dependency_graph,
-        config=config,
-        run_id=run_id,
-        plans_dir=DEFAULT_PLANS_DIR,
-        llm_router=llm_router,
-        target=target_run,
-    )
-    plan_md, plan_path = plan_agent.generate()
-    logger.info("[OK] Plan document generated: %s", plan_path)
-
-    if args.mode == "plan":
-        logger.info("Mode=plan -- stopping after plan generation. Review: %s", plan_path)
-        print(f"\n{'='*60}")
-        print(f"  Plan saved to: {plan_path}")
-        print(f"  Review and run with --mode full to proceed.")
-        print(f"{'='*60}\n")
-        return 0
-
-    # ---- Step 4: Human Approval Gate ----
-    print_banner("Step 4: Human Approval Gate")
-    approval_mode = "auto_approve" if args.auto_approve else "cli_prompt"
-    if args.auto_approve:
-        logger.warning("[!]  AUTO-APPROVE enabled -- skipping human review. FOR TESTING ONLY.")
-
-    gate = ApprovalGate(mode=approval_mode)
-    try:
-        approved = gate.request_approval(plan_path, plan_md)
-        if not approved:
-            logger.info("Plan not yet approved (pr_merge mode -- marker file not found).")
+        try:
+            dependency_graph = scoping_agent.analyze()
+        except FileNotFoundError as exc:
+            logger.error("Scoping failed: %s", exc)
+            return 1
+
+        # Save graph
+        graph_path = DEFAULT_LOGS_DIR / f"{run_id}-dependency-graph.json"
+        scoping_agent.save(graph_path)
+        logger.info("[OK] Dependency graph saved: %s", graph_path)
+
+        # Print flags summary
+        flags = dependency_graph.get("flags", [])
+        if flags:
+            logger.warning("[!]  %d flag(s) detected during scoping:", len(flags))
+            for flag in flags:
+                logger.warning("   [%s] %s -- %s", flag["severity"], flag["rule"], flag["message"])
+
+        if args.mode == "scope":
+            logger.info("Mode=scope -- stopping after analysis. Dependency graph: %s", graph_path)
+            return 0
+
+        # ---- Step 3: Plan Document Generation ----
+        print_banner("Step 3: Plan Document Generation")
+        target_run = getattr(args, "target", "simpler_grants")
+        plan_agent = PlanAgent(
+            dependency_graph=dependency_graph,
+            config=config,
+            run_id=run_id,
+            plans_dir=DEFAULT_PLANS_DIR,
+            llm_router=llm_router,
+            target=target_run,
+        )
+        plan_md, plan_path = plan_agent.generate()
+        logger.info("[OK] Plan document generated: %s", plan_path)
+
+        if args.mode == "plan":
+            logger.info("Mode=plan -- stopping after plan generation. Review: %s", plan_path)
+            print(f"\n{'='*60}")
+            print(f"  Plan saved to: {plan_path}")
+            print(f"  Review and run with --mode full to proceed.")
+            print(f"{'='*60}\n")
+            return 0
+
+        # ---- Step 4: Human Approval Gate ----
+        print_banner("Step 4: Human Approval Gate")
+        approval_mode = "auto_approve" if args.auto_approve else "cli_prompt"
+        if args.auto_approve:
+            logger.warning("[!]  AUTO-APPROVE enabled -- skipping human review. FOR TESTING ONLY.")
+
+        gate = ApprovalGate(mode=approval_mode)
+        try:
+            approved = gate.request_approval(plan_path, plan_md)
+            if not approved:
+                logger.info("Plan not yet approved (pr_merge mode -- marker file not found).")
+                return 2
+        except ApprovalRejectedError as exc:
+            logger.info("Plan rejected: %s", exc)
+            print(f"\n[X] Plan rejected. Reason: {exc}")
+            print("Modify the plan or re-run scoping and regenerate.")
             return 2
-    except ApprovalRejectedError as exc:
-        logger.info("Plan rejected: %s", exc)
-        print(f"\n[X] Plan rejected. Reason: {exc}")
-        print("Modify the plan or re-run scoping and regenerate.")
-        return 2
 
-    logger.info("[OK] Plan approved. Starting conversion execution.")
+        logger.info("[OK] Plan approved. Starting conversion execution.")
 
-    # ---- Step 5: Conversion Execution ----
-    print_banner("Step 5: Conversion Execution")
+        # ---- Step 5: Conversion Execution ----
+        print_banner("Step 5: Conversion Execution")
 
-    target_local = getattr(args, "target", "simpler_grants")
+        target_local = getattr(args, "target", "simpler_grants")
 
-    # Prepare the approved plan dict (enriched with step data for the agent)
-    approved_plan = _build_approved_plan(
-        dependency_graph=dependency_graph,
-        config=config,
-        run_id=run_id,
-        feature_root=args.feature_root,
-        output_root=args.output_root or str(DEFAULT_OUTPUT_DIR / args.feature_name),
-        target=target_local,
-        project_structure_override=getattr(args, "project_structure", None),
-    )
+        # Prepare the approved plan dict (enriched with step data for the agent)
+        approved_plan = _build_approved_plan(
+            dependency_graph=dependency_graph,
+            config=config,
+            run_id=run_id,
+            feature_root=args.feature_root,
+            output_root=args.output_root or str(DEFAULT_OUTPUT_DIR / args.feature_name),
+            target=target_local,
+            project_structure_override=getattr(args, "project_structure", None),
+        )
 
-    log_path = DEFAULT_LOGS_DIR / f"{run_id}-conversion-log.json"
-    conv_log = ConversionLog(
-        feature_name=dependency_graph["feature_name"],
-        run_id=run_id,
-        plan_ref=str(plan_path),
-        log_path=log_path,
-    )
+        log_path = DEFAULT_LOGS_DIR / f"{run_id}-conversion-log.json"
+        conv_log = ConversionLog(
+            feature_name=dependency_graph["feature_name"],
+            run_id=run_id,
+            plan_ref=str(plan_path),
+            log_path=log_path,
+            # parallel steps: coalesce journal flushes instead of one per step
+            flush_interval=1.0 if (getattr(args, "llm_concurrency", None) or 1) > 1 else 0.0,
+        )
 
-    # Filter out already-completed steps (resume support)
-    all_steps = approved_plan.get("conversion_steps", [])
-    if args.run_id:  # resuming
-        pending_steps = [
-            s for s in all_steps
-            if not checkpoint.is_completed(s["id"])
-               and s["id"] not in checkpoint.get_state()["blocked_steps"]
-        ]
-        skipped = len(all_steps) - len(pending_steps)
-        if skipped:
-            logger.info("Resume: skipping %d already-completed steps.", skipped)
-        approved_plan["conversion_steps"] = pending_steps
-
-    conv_agent = ConversionAgent(
-        approved_plan=approved_plan,
-        config=config,
-        log=conv_log,
-        output_root=approved_plan["output_root"],
-        dry_run=args.dry_run,
-        llm_router=llm_router,
-        target=target_local,
-    )
+        # Filter out already-completed steps (resume support)
+        all_steps = approved_plan.get("conversion_steps", [])
+        if args.run_id:  # resuming
+            pending_steps = [
+                s for s in all_steps
+                if not checkpoint.is_completed(s["id"])
+                   and not checkpoint.is_blocked(s["id"])
+            ]
+            skipped = len(all_steps) - len(pending_steps)
+            if skipped:
+                logger.info("Resume: skipping %d already-completed steps.", skipped)
+            approved_plan["conversion_steps"] = pending_steps
+
+        conv_agent = ConversionAgent(
+            approved_plan=approved_plan,
+            config=config,
+            log=conv_log,
+            output_root=approved_plan["output_root"],
+            dry_run=args.dry_run,
+            llm_router=llm_router,
+            target=target_local,
+            max_workers=getattr(args, "llm_concurrency", None) or 1,
+            batch_size=getattr(args, "llm_batch_size", None) or 1,
+            response_cache=getattr(args, "llm_cache", None),
+            stream=getattr(args, "llm_stream", False),
+            llm_skip_threshold=getattr(args, "llm_skip_threshold", None) or 0,
+            simple_model=getattr(args, "llm_simple_model", None),
+            complexity_threshold=getattr(args, "llm_complexity_threshold", None) or 20,
+            max_source_bytes=getattr(args, "llm_max_source_bytes", None) or 0,
+        )
 
-    summary = conv_agent.execute()
+        summary = conv_agent.execute()
 
-    # Update checkpoint
-    for step_id in summary.get("completed_steps", []):
-        checkpoint.mark_completed(step_id, [s["id"] for s in all_steps])
-    for flagged in summary.get("flagged_steps", []):
-        checkpoint.mark_blocked(flagged["step"], flagged["reason"])
+        # Update checkpoint
+        for step_id in summary.get("completed_steps", []):
+            checkpoint.mark_completed(step_id, [s["id"] for s in all_steps])
+        for flagged in summary.get("flagged_steps", []):
+            checkpoint.mark_blocked(flagged["step"], flagged["reason"])
+    finally:
+        checkpoint.close()  # drain the batched checkpoint writes, even on error
 
     # Export log as Markdown
     md_log_path = DEFAULT_LOGS_DIR / f"{run_id}-conversion-log.md"
@@ -778,10 +792,10 @@ def build_arg_parser() -> argparse.ArgumentParser:
         "--llm-provider",
         type=str,
         default=None,
-        choices=["anthropic", "openai", "openai_compat", "ollama", "llamacpp", "subprocess"],
+        choices=VALID_PROVIDERS,
         metavar="PROVIDER",
         help=(
-            "LLM provider to use. Choices: anthropic, openai, openai_compat, ollama, llamacpp, subprocess. "
+            f"LLM provider to use. Choices: {', '.join(VALID_PROVIDERS)}. "
             "Auto-detected from env vars when omitted."
         ),
     )
@@ -845,6 +859,96 @@ def build_arg_parser() -> argparse.ArgumentParser:
         metavar="SECONDS",
         help="Timeout in seconds per LLM request (default: 120). Increase for Ollama code generation (e.g. 300–600).",
     )
+    llm_group.add_argument(
+        "--llm-max-retries",
+        type=int,
+        default=None,
+        metavar="N",
+        help=(
+            "Retries of rate-limited / overloaded hosted-API requests, with "
+            "exponential backoff and jitter (default: 4; 0 disables)."
+        ),
+    )
+    llm_group.add_argument(
+        "--llm-concurrency",
+        type=int,
+        default=None,
+        metavar="N",
+        help=(
+            "Number of conversion steps sent to the LLM concurrently (default: 1). "
+            "Raise for hosted providers with generous rate limits."
+        ),
+    )
+    llm_group.add_argument(
+        "--llm-batch-size",
+        type=int,
+        default=None,
+        metavar="N",
+        help=(
+            "Convert up to N consecutive steps that share a template and rule set "
+            "in a single LLM request (default: 1 = one request per step)."
+        ),
+    )
+    llm_group.add_argument(
+        "--llm-stream",
+        action="store_true",
+        default=False,
+        help=(
+            "Stream LLM replies during conversion; replies that turn out to be "
+            "AMBIGUOUS are abandoned early instead of generated in full."
+        ),
+    )
+    llm_group.add_argument(
+        "--llm-skip-threshold",
+        type=int,
+        default=None,
+        metavar="CHARS",
+        help=(
+            "Use the template output directly, without an LLM call, for source "
+            "files shorter than CHARS whose template renders a non-empty scaffold "
+            "(default: 0 = always call the LLM)."
+        ),
+    )
+    llm_group.add_argument(
+        "--llm-max-source-bytes",
+        type=int,
+        default=None,
+        metavar="BYTES",
+        help=(
+            "Flag source files larger than BYTES for human review instead of "
+            "sending them to the LLM in one request (default: 0 = no cap)."
+        ),
+    )
+    llm_group.add_argument(
+        "--llm-simple-model",
+        type=str,
+        default=None,
+        metavar="MODEL",
+        help=(
+            "Cheaper model (same provider) for low-complexity conversion steps; "
+            "steps it cannot convert are escalated to --llm-model."
+        ),
+    )
+    llm_group.add_argument(
+        "--llm-complexity-threshold",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Highest source complexity score sent to --llm-simple-model (default: 20).",
+    )
+    llm_group.add_argument(
+        "--llm-cache",
+        nargs="?",
+        const=True,
+        default=None,
+        metavar="PATH",
+        help=(
+            "Reuse LLM conversions from a local SQLite cache when the source, "
+            "scaffold, prompt and model are unchanged (default path when given "
+            "without a value: $LLM_CACHE_DIR/llm_cache.db, else "
+            "~/.cache/ai-migration/llm_cache.db)."
+        ),
+    )
     llm_group.add_argument(
         "--llm-subprocess-cmd",
         type=str,
@@ -967,168 +1071,181 @@ def _run_pipeline_with_router(args: argparse.Namespace, llm_router) -> int:
         checkpoints_dir=DEFAULT_CHECKPOINTS_DIR,
         run_id=run_id,
         feature=args.feature_name,
+        async_flush=True,
     )
-
-    # When force=True, remove any previously-written output files so the LLM
-    # does not see stale intermediate outputs and respond with prose instead of code.
-    if getattr(args, "force", False):
-        _output_root = Path(getattr(args, "output_root", None) or DEFAULT_OUTPUT_DIR / args.feature_name)
-        if _output_root.exists():
-            shutil.rmtree(_output_root, ignore_errors=True)
-            logger.info("force=True — cleared previous output: %s", _output_root)
-
-    # ---- Step 1: Config Ingestion ----
-    print_banner("Step 1: Config Ingestion")
     try:
-        config_agent = ConfigIngestionAgent(
-            skillset_path=args.skillset_config,
-            rules_path=args.rules_config,
+        # When force=True, remove any previously-written output files so the LLM
+        # does not see stale intermediate outputs and respond with prose instead of code.
+        if getattr(args, "force", False):
+            _output_root = Path(getattr(args, "output_root", None) or DEFAULT_OUTPUT_DIR / args.feature_name)
+            if _output_root.exists():
+                shutil.rmtree(_output_root, ignore_errors=True)
+                logger.info("force=True — cleared previous output: %s", _output_root)
+
+        # ---- Step 1: Config Ingestion ----
+        print_banner("Step 1: Config Ingestion")
+        try:
+            config_agent = ConfigIngestionAgent(
+                skillset_path=args.skillset_config,
+                rules_path=args.rules_config,
+            )
+            config = config_agent.load_and_validate()
+            logger.info("[OK] Config loaded and validated.")
+        except (FileNotFoundError, ConfigValidationError) as exc:
+            logger.error("Config ingestion failed: %s", exc)
+            return 1
+
+        # ---- Step 2: Scoping & Analysis ----
+        print_banner("Step 2: Scoping & Analysis")
+        scoping_agent = ScopingAgent(
+            feature_root=args.feature_root,
+            config=config,
         )
-        config = config_agent.load_and_validate()
-        logger.info("[OK] Config loaded and validated.")
-    except (FileNotFoundError, ConfigValidationError) as exc:
-        logger.error("Config ingestion failed: %s", exc)
-        return 1
-
-    # ---- Step 2: Scoping & Analysis ----
-    print_banner("Step 2: Scoping & Analysis")
-    scoping_agent = ScopingAgent(
-        feature_root=args.feature_root,
-        config=config,
-    )
-    try:
-        dependency_graph = scoping_agent.analyze()
-    except FileNotFoundError as exc:
-        logger.error("Scoping failed: %s", exc)
-        return 1
-
-    graph_path = DEFAULT_LOGS_DIR / f"{run_id}-dependency-graph.json"
-    scoping_agent.save(graph_path)
-    logger.info("[OK] Dependency graph saved: %s", graph_path)
-
-    flags = dependency_graph.get("flags", [])
-    if flags:
-        logger.warning("[!]  %d flag(s) detected during scoping:", len(flags))
-        for flag in flags:
-            logger.warning("   [%s] %s -- %s", flag["severity"], flag["rule"], flag["message"])
-
-    if args.mode == "scope":
-        logger.info("Mode=scope -- stopping after analysis. Dependency graph: %s", graph_path)
-        return 0
+        try:
+            dependency_graph = scoping_agent.analyze()
+        except FileNotFoundError as exc:
+            logger.error("Scoping failed: %s", exc)
+            return 1
+
+        graph_path = DEFAULT_LOGS_DIR / f"{run_id}-dependency-graph.json"
+        scoping_agent.save(graph_path)
+        logger.info("[OK] Dependency graph saved: %s", graph_path)
+
+        flags = dependency_graph.get("flags", [])
+        if flags:
+            logger.warning("[!]  %d flag(s) detected during scoping:", len(flags))
+            for flag in flags:
+                logger.warning("   [%s] %s -- %s", flag["severity"], flag["rule"], flag["message"])
+
+        if args.mode == "scope":
+            logger.info("Mode=scope -- stopping after analysis. Dependency graph: %s", graph_path)
+            return 0
+
+        # ---- Memory: initialise store and load context ----
+        _memory_store = None
+        _memory_context = None
+        try:
+            from agents.memory_store import MemoryStore  # noqa: PLC0415
+            _memory_store = MemoryStore()
+            _memory_context = _memory_store.get_context(
+                feature_name=args.feature_name,
+                dependency_graph=dependency_graph,
+                target=target,
+            )
+            if _memory_context.context_summary:
+                logger.info(
+                    "Memory context loaded: %d pattern(s), %d preference(s).",
+                    len(_memory_context.similar_patterns),
+                    len(_memory_context.user_preferences),
+                )
+        except (ImportError, OSError, Exception) as _mem_exc:  # noqa: BLE001
+            # Non-fatal: memory is optional — pipeline proceeds without it.
+            logger.debug("Memory store unavailable (non-fatal): %s", _mem_exc)
 
-    # ---- Memory: initialise store and load context ----
-    _memory_store = None
-    _memory_context = None
-    try:
-        from agents.memory_store import MemoryStore  # noqa: PLC0415
-        _memory_store = MemoryStore()
-        _memory_context = _memory_store.get_context(
-            feature_name=args.feature_name,
+        # ---- Step 3: Plan Document Generation ----
+        print_banner("Step 3: Plan Document Generation")
+        plan_agent = _pa.PlanAgent(
             dependency_graph=dependency_graph,
+            config=config,
+            run_id=run_id,
+            plans_dir=DEFAULT_PLANS_DIR,
+            llm_router=llm_router,
             target=target,
+            memory_context=_memory_context,
         )
-        if _memory_context.context_summary:
-            logger.info(
-                "Memory context loaded: %d pattern(s), %d preference(s).",
-                len(_memory_context.similar_patterns),
-                len(_memory_context.user_preferences),
-            )
-    except (ImportError, OSError, Exception) as _mem_exc:  # noqa: BLE001
-        # Non-fatal: memory is optional — pipeline proceeds without it.
-        logger.debug("Memory store unavailable (non-fatal): %s", _mem_exc)
-
-    # ---- Step 3: Plan Document Generation ----
-    print_banner("Step 3: Plan Document Generation")
-    plan_agent = _pa.PlanAgent(
-        dependency_graph=dependency_graph,
-        config=config,
-        run_id=run_id,
-        plans_dir=DEFAULT_PLANS_DIR,
-        llm_router=llm_router,
-        target=target,
-        memory_context=_memory_context,
-    )
-    plan_md, plan_path = plan_agent.generate()
-    logger.info("[OK] Plan document generated: %s", plan_path)
-
-    if args.mode == "plan":
-        logger.info("Mode=plan -- stopping after plan generation. Review: %s", plan_path)
-        print(f"\n{'='*60}")
-        print(f"  Plan saved to: {plan_path}")
-        print(f"  Review and run with --mode full to proceed.")
-        print(f"{'='*60}\n")
-        return 0
-
-    # ---- Step 4: Human Approval Gate ----
-    print_banner("Step 4: Human Approval Gate")
-    approval_mode = "auto_approve" if args.auto_approve else "cli_prompt"
-    if args.auto_approve:
-        logger.warning("[!]  AUTO-APPROVE enabled -- skipping human review. FOR TESTING ONLY.")
-
-    gate = ApprovalGate(mode=approval_mode)
-    try:
-        approved = gate.request_approval(plan_path, plan_md)
-        if not approved:
-            logger.info("Plan not yet approved (pr_merge mode -- marker file not found).")
+        plan_md, plan_path = plan_agent.generate()
+        logger.info("[OK] Plan document generated: %s", plan_path)
+
+        if args.mode == "plan":
+            logger.info("Mode=plan -- stopping after plan generation. Review: %s", plan_path)
+            print(f"\n{'='*60}")
+            print(f"  Plan saved to: {plan_path}")
+            print(f"  Review and run with --mode full to proceed.")
+            print(f"{'='*60}\n")
+            return 0
+
+        # ---- Step 4: Human Approval Gate ----
+        print_banner("Step 4: Human Approval Gate")
+        approval_mode = "auto_approve" if args.auto_approve else "cli_prompt"
+        if args.auto_approve:
+            logger.warning("[!]  AUTO-APPROVE enabled -- skipping human review. FOR TESTING ONLY.")
+
+        gate = ApprovalGate(mode=approval_mode)
+        try:
+            approved = gate.request_approval(plan_path, plan_md)
+            if not approved:
+                logger.info("Plan not yet approved (pr_merge mode -- marker file not found).")
+                return 2
+        except ApprovalRejectedError as exc:
+            logger.info("Plan rejected: %s", exc)
+            print(f"\n[X] Plan rejected. Reason: {exc}")
+            print("Modify the plan or re-run scoping and regenerate.")
             return 2
-    except ApprovalRejectedError as exc:
-        logger.info("Plan rejected: %s", exc)
-        print(f"\n[X] Plan rejected. Reason: {exc}")
-        print("Modify the plan or re-run scoping and regenerate.")
-        return 2
 
-    logger.info("[OK] Plan approved. Starting conversion execution.")
+        logger.info("[OK] Plan approved. Starting conversion execution.")
 
-    # ---- Step 5: Conversion Execution ----
-    print_banner("Step 5: Conversion Execution")
+        # ---- Step 5: Conversion Execution ----
+        print_banner("Step 5: Conversion Execution")
 
-    approved_plan = _build_approved_plan(
-        dependency_graph=dependency_graph,
-        config=config,
-        run_id=run_id,
-        feature_root=args.feature_root,
-        output_root=args.output_root or str(DEFAULT_OUTPUT_DIR / args.feature_name),
-        target=target,
-        project_structure_override=getattr(args, "project_structure", None),
-    )
+        approved_plan = _build_approved_plan(
+            dependency_graph=dependency_graph,
+            config=config,
+            run_id=run_id,
+            feature_root=args.feature_root,
+            output_root=args.output_root or str(DEFAULT_OUTPUT_DIR / args.feature_name),
+            target=target,
+            project_structure_override=getattr(args, "project_structure", None),
+        )
 
-    log_path = DEFAULT_LOGS_DIR / f"{run_id}-conversion-log.json"
-    conv_log = ConversionLog(
-        feature_name=dependency_graph["feature_name"],
-        run_id=run_id,
-        plan_ref=str(plan_path),
-        log_path=log_path,
-    )
+        log_path = DEFAULT_LOGS_DIR / f"{run_id}-conversion-log.json"
+        conv_log = ConversionLog(
+            feature_name=dependency_graph["feature_name"],
+            run_id=run_id,
+            plan_ref=str(plan_path),
+            log_path=log_path,
+            # parallel steps: coalesce journal flushes instead of one per step
+            flush_interval=1.0 if (getattr(args, "llm_concurrency", None) or 1) > 1 else 0.0,
+        )
 
-    all_steps = approved_plan.get("conversion_steps", [])
-    if args.run_id:
-        pending_steps = [
-            s for s in all_steps
-            if not checkpoint.is_completed(s["id"])
-               and s["id"] not in checkpoint.get_state()["blocked_steps"]
-        ]
-        skipped = len(all_steps) - len(pending_steps)
-        if skipped:
-            logger.info("Resume: skipping %d already-completed steps.", skipped)
-        approved_plan["conversion_steps"] = pending_steps
-
-    conv_agent = _ca.ConversionAgent(
-        approved_plan=approved_plan,
-        config=config,
-        log=conv_log,
-        output_root=approved_plan["output_root"],
-        dry_run=args.dry_run,
-        llm_router=llm_router,
-        target=target,
-        memory_context=_memory_context,
-    )
+        all_steps = approved_plan.get("conversion_steps", [])
+        if args.run_id:
+            pending_steps = [
+                s for s in all_steps
+                if not checkpoint.is_completed(s["id"])
+                   and not checkpoint.is_blocked(s["id"])
+            ]
+            skipped = len(all_steps) - len(pending_steps)
+            if skipped:
+                logger.info("Resume: skipping %d already-completed steps.", skipped)
+            approved_plan["conversion_steps"] = pending_steps
+
+        conv_agent = _ca.ConversionAgent(
+            approved_plan=approved_plan,
+            config=config,
+            log=conv_log,
+            output_root=approved_plan["output_root"],
+            dry_run=args.dry_run,
+            llm_router=llm_router,
+            target=target,
+            memory_context=_memory_context,
+            max_workers=getattr(args, "llm_concurrency", None) or 1,
+            batch_size=getattr(args, "llm_batch_size", None) or 1,
+            response_cache=getattr(args, "llm_cache", None),
+            stream=getattr(args, "llm_stream", False),
+            llm_skip_threshold=getattr(args, "llm_skip_threshold", None) or 0,
+            simple_model=getattr(args, "llm_simple_model", None),
+            complexity_threshold=getattr(args, "llm_complexity_threshold", None) or 20,
+            max_source_bytes=getattr(args, "llm_max_source_bytes", None) or 0,
+        )
 
-    summary = conv_agent.execute()
+        summary = conv_agent.execute()
 
-    for step_id in summary.get("completed_steps", []):
-        checkpoint.mark_completed(step_id, [s["id"] for s in all_steps])
-    for flagged in summary.get("flagged_steps", []):
-        checkpoint.mark_blocked(flagged["step"], flagged["reason"])
+        for step_id in summary.get("completed_steps", []):
+            checkpoint.mark_completed(step_id, [s["id"] for s in all_steps])
+        for flagged in summary.get("flagged_steps", []):
+            checkpoint.mark_blocked(flagged["step"], flagged["reason"])
+    finally:
+        checkpoint.close()  # drain the batched checkpoint writes, even on error
 
     md_log_path = DEFAULT_LOGS_DIR / f"{run_id}-conversion-log.md"
     conv_log.export_markdown(md_log_path)
@@ -195,6 +195,12 @@ def _job_to_args(job: dict, overrides: dict | None = None) -> argparse.Namespace
         v = section.get(key, default)
         return default if v is None else v
 
+    def _llm_cache_path(value):
+        # llm.cache: true → default location ($LLM_CACHE_DIR aware), a string → that path, else off
+        if value is True:
+            return True
+        return value or None
+
     ns = argparse.Namespace(
         # --- Feature ---
         feature_root    = _get(pipeline, "feature_root"),
@@ -225,6 +231,15 @@ def _job_to_args(job: dict, overrides: dict | None = None) -> argparse.Namespace
         llm_max_tokens      = _get(llm, "max_tokens"),
         llm_temperature     = _get(llm, "temperature"),
         llm_timeout         = _get(llm, "timeout"),
+        llm_max_retries     = _get(llm, "max_retries"),
+        llm_concurrency     = _get(llm, "concurrency", 1),
+        llm_batch_size      = _get(llm, "batch_size", 1),
+        llm_cache           = _llm_cache_path(_get(llm, "cache")),
+        llm_stream          = _get(llm, "stream", False),
+        llm_skip_threshold  = _get(llm, "skip_threshold", 0),
+        llm_max_source_bytes = _get(llm, "max_source_bytes", 0),
+        llm_simple_model    = _get(llm, "simple_model"),
+        llm_complexity_threshold = _get(llm, "complexity_threshold", 20),
         llm_subprocess_cmd  = _get(llm, "subprocess_cmd"),
         llm_subprocess_args = _get(llm, "subprocess_args", []),
         llm_subprocess_env  = _get(llm, "subprocess_env", {}),  # {KEY: val} injected into subprocess
@@ -268,6 +283,7 @@ def _job_to_args(job: dict, overrides: dict | None = None) -> argparse.Namespace
             "escalate_on_fail":   _get(job.get("orchestration", {}), "escalate_on_fail",    True),
             "backend":            _get(job.get("orchestration", {}), "backend",             "internal"),
             "tool_use":           _get(job.get("orchestration", {}), "tool_use",            "auto"),
+            "history_char_budget": _get(job.get("orchestration", {}), "history_char_budget", 120_000),
         },
 
         # --- Project structure path overrides (optional) ---
@@ -1443,6 +1459,8 @@ def main() -> int:
 
     # Signal agent mode — soft-fail on LLM errors (template scaffold instead of hard crash)
     os.environ["AI_AGENT_MODE"] = "1"
+    from agents.agent_context import reset_agent_cache
+    reset_agent_cache()  # detection result is cached per process
 
     return _run_pipeline_with_router(ns, llm_router)
 
@@ -0,0 +1,76 @@
+"""
+Tests for agents.agent_context — agent-mode detection and its process cache.
+"""
+
+import pytest
+
+from agents import agent_context
+from agents.agent_context import get_agent_name, is_agent_mode, reset_agent_cache
+
+_SIGNAL_VARS = (
+    "AI_AGENT_MODE", "CURSOR_AGENT", "CURSOR_CLI", "WINDSURF_AGENT",
+    "COPILOT_AGENT", "TERM_PROGRAM",
+)
+
+
+@pytest.fixture(autouse=True)
+def _clean_env(monkeypatch):
+    for var in _SIGNAL_VARS:
+        monkeypatch.delenv(var, raising=False)
+    # Keep the parent-process scan out of the picture (e.g. tests run from VS Code)
+    monkeypatch.setattr(agent_context, "_detect_from_parent_process", lambda: None)
+    reset_agent_cache()
+    yield
+    reset_agent_cache()
+
+
+class TestGetAgentName:
+    def test_no_signals(self):
+        assert get_agent_name() is None
+        assert is_agent_mode() is False
+
+    def test_explicit_opt_in(self, monkeypatch):
+        monkeypatch.setenv("AI_AGENT_MODE", "1")
+        assert get_agent_name() == "generic-agent"
+
+    def test_any_truthy_value(self, monkeypatch):
+        monkeypatch.setenv("CURSOR_CLI", "whatever")
+        assert get_agent_name() == "cursor"
+
+    def test_required_value_mismatch(self, monkeypatch):
+        monkeypatch.setenv("CURSOR_AGENT", "0")
+        assert get_agent_name() is None
+
+    def test_term_program(self, monkeypatch):
+        monkeypatch.setenv("TERM_PROGRAM", "windsurf")
+        assert get_agent_name() == "windsurf"
+
+
+class TestAgentCache:
+    def test_result_is_cached(self, monkeypatch):
+        assert get_agent_name() is None
+        monkeypatch.setenv("AI_AGENT_MODE", "1")
+        # Cached "not agent mode" survives the env change
+        assert get_agent_name() is None
+
+    def test_reset_forces_redetection(self, monkeypatch):
+        assert get_agent_name() is None
+        monkeypatch.setenv("AI_AGENT_MODE", "1")
+        reset_agent_cache()
+        assert get_agent_name() == "generic-agent"
+
+
+class TestRequireLlmOrRaise:
+    def test_cli_mode_raises_with_context(self):
+        err = RuntimeError("bad key")
+        with pytest.raises(agent_context.LLMConfigurationError) as exc_info:
+            agent_context.require_llm_or_raise("plan generation", err, lambda: "scaffold")
+        msg = str(exc_info.value)
+        assert "Context: plan generation" in msg
+        assert "Error:   bad key" in msg
+        assert exc_info.value.__cause__ is err
+
+    def test_agent_mode_uses_fallback(self, monkeypatch):
+        monkeypatch.setenv("AI_AGENT_MODE", "1")
+        result = agent_context.require_llm_or_raise("x", RuntimeError("boom"), lambda: "scaffold")
+        assert result == "scaffold"
@@ -0,0 +1,113 @@
+"""
+Tests for agents.approval_gate — CheckpointManager state tracking and resume.
+"""
+
+import json
+
+import pytest
+
+from agents.approval_gate import ApprovalGate, ApprovalRejectedError, CheckpointManager
+
+
+STEPS = ["B1", "B2", "F1", "F2"]
+
+
+def _answers(monkeypatch, *replies):
+    it = iter(replies)
+    monkeypatch.setattr("builtins.input", lambda _prompt="": next(it))
+
+
+class TestCliPrompt:
+    def test_approve(self, monkeypatch, capsys, tmp_path):
+        _answers(monkeypatch, "  YES ")
+        gate = ApprovalGate()
+        assert gate.request_approval(tmp_path / "plan.md", "# Plan\nline") is True
+        out = capsys.readouterr().out
+        assert "HUMAN APPROVAL REQUIRED" in out
+        assert "# Plan\nline\n" in out
+
+    def test_reject_with_feedback(self, monkeypatch, tmp_path):
+        _answers(monkeypatch, "no", "split step B2")
+        with pytest.raises(ApprovalRejectedError, match="split step B2"):
+            ApprovalGate().request_approval(tmp_path / "plan.md", "# Plan")
+
+    def test_preview_truncated(self, monkeypatch, capsys, tmp_path):
+        _answers(monkeypatch, "y")
+        content = "\n".join(f"line {i}" for i in range(100))
+        ApprovalGate().request_approval(tmp_path / "plan.md", content)
+        out = capsys.readouterr().out
+        assert "line 59\n" in out
+        assert "line 60\n" not in out
+        assert "[40 more lines" in out
+
+    def test_view_reprints_and_unrecognised(self, monkeypatch, capsys, tmp_path):
+        _answers(monkeypatch, "view", "maybe", "approve")
+        content = "\n".join(f"line {i}" for i in range(70))
+        assert ApprovalGate().request_approval(tmp_path / "plan.md", content) is True
+        out = capsys.readouterr().out
+        assert "line 69" in out
+        assert "Unrecognised input 'maybe'" in out
+
+
+class TestCheckpointManager:
+    def test_fresh_state(self, tmp_path):
+        cp = CheckpointManager(tmp_path, "run-1", "Foo")
+        assert cp.is_completed("B1") is False
+        assert cp.get_state()["completed_steps"] == []
+
+    def test_mark_completed_updates_pending(self, tmp_path):
+        cp = CheckpointManager(tmp_path, "run-1", "Foo")
+        cp.mark_completed("B1", STEPS)
+        cp.mark_blocked("F1", "ambiguous")
+        cp.mark_completed("B2", STEPS)
+        state = cp.get_state()
+        assert state["completed_steps"] == ["B1", "B2"]
+        assert state["pending_steps"] == ["F2"]
+        assert state["last_completed_step"] == "B2"
+        assert cp.is_completed("B2") is True
+
+    def test_mark_completed_is_idempotent(self, tmp_path):
+        cp = CheckpointManager(tmp_path, "run-1", "Foo")
+        cp.mark_completed("B1", STEPS)
+        cp.mark_completed("B1", STEPS)
+        assert cp.get_state()["completed_steps"] == ["B1"]
+
+    def test_resume_from_file(self, tmp_path):
+        cp = CheckpointManager(tmp_path, "run-1", "Foo")
+        cp.mark_completed("B1", STEPS)
+        cp.mark_blocked("F1", "out of boundary")
+
+        on_disk = json.loads(cp.path.read_text(encoding="utf-8"))
+        assert on_disk["completed_steps"] == ["B1"]
+
+        resumed = CheckpointManager(tmp_path, "run-1", "Foo")
+        assert resumed.is_completed("B1") is True
+        assert resumed.is_completed("B2") is False
+        assert resumed.get_state()["blocked_steps"] == ["F1"]
+        assert resumed.is_blocked("F1") is True
+        assert resumed.is_blocked("F2") is False
+
+    def test_flush_is_atomic_and_compact(self, tmp_path):
+        cp = CheckpointManager(tmp_path, "run-1", "Foo", pretty=False)
+        cp.mark_completed("B1", STEPS)
+        assert not cp.path.with_suffix(".json.tmp").exists()
+        assert "\n" not in cp.path.read_text(encoding="utf-8")
+
+    def test_async_flush_drained_on_close(self, tmp_path):
+        with CheckpointManager(tmp_path, "run-1", "Foo", async_flush=True) as cp:
+            for step in STEPS:
+                cp.mark_completed(step, STEPS)
+        on_disk = json.loads(cp.path.read_text(encoding="utf-8"))
+        assert on_disk["completed_steps"] == STEPS
+        assert on_disk["pending_steps"] == []
+
+    def test_writes_after_close_are_synchronous(self, tmp_path):
+        cp = CheckpointManager(tmp_path, "run-1", "Foo", async_flush=True)
+        cp.close()
+        cp.mark_blocked("F1", "ambiguous")
+        on_disk = json.loads(cp.path.read_text(encoding="utf-8"))
+        assert on_disk["blocked_steps"] == ["F1"]
+
+    def test_close_without_updates_writes_nothing(self, tmp_path):
+        CheckpointManager(tmp_path, "run-1", "Foo", async_flush=True).close()
+        assert not (tmp_path / "run-1-checkpoint.json").exists()
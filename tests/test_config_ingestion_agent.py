@@ -0,0 +1,114 @@
+"""
+Tests for agents.config_ingestion_agent — config loading, validation and
+the lookup helpers used by downstream agents.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from agents.config_ingestion_agent import (
+    ConfigIngestionAgent,
+    ConfigValidationError,
+    clear_config_cache,
+)
+
+_CONFIG_DIR = Path(__file__).resolve().parent.parent / "config"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_config_cache()
+    yield
+    clear_config_cache()
+
+
+@pytest.fixture
+def config():
+    return ConfigIngestionAgent(
+        _CONFIG_DIR / "skillset-config.json",
+        _CONFIG_DIR / "rules-config.json",
+    ).load_and_validate()
+
+
+class TestLoadAndValidate:
+    def test_indexes_built(self, config):
+        mappings = config["skillset"]["component_mappings"]
+        assert set(config["mappings_index"]) == {m["id"] for m in mappings}
+        assert "RULE-008" in config["rules_index"]
+
+    def test_missing_file(self, tmp_path):
+        agent = ConfigIngestionAgent(tmp_path / "nope.json", _CONFIG_DIR / "rules-config.json")
+        with pytest.raises(FileNotFoundError):
+            agent.load_and_validate()
+
+    def test_invalid_config(self, tmp_path):
+        bad = tmp_path / "skillset.json"
+        bad.write_text('{"component_mappings": "not-a-list"}', encoding="utf-8")
+        agent = ConfigIngestionAgent(bad, _CONFIG_DIR / "rules-config.json")
+        with pytest.raises(ConfigValidationError):
+            agent.load_and_validate()
+
+
+class TestConfigCache:
+    def _agent(self, tmp_path):
+        skillset = tmp_path / "skillset.json"
+        rules    = tmp_path / "rules.json"
+        skillset.write_bytes((_CONFIG_DIR / "skillset-config.json").read_bytes())
+        rules.write_bytes((_CONFIG_DIR / "rules-config.json").read_bytes())
+        return ConfigIngestionAgent(skillset, rules)
+
+    def test_repeat_load_returns_same_object(self, tmp_path):
+        agent = self._agent(tmp_path)
+        assert agent.load_and_validate() is agent.load_and_validate()
+
+    def test_result_is_read_only(self, config):
+        with pytest.raises(TypeError):
+            config["skillset"] = {}
+
+    def test_mtime_change_invalidates(self, tmp_path):
+        agent = self._agent(tmp_path)
+        first = agent.load_and_validate()
+        st = agent.rules_path.stat()
+        os.utime(agent.rules_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert agent.load_and_validate() is not first
+
+    def test_clear_config_cache(self, tmp_path):
+        agent = self._agent(tmp_path)
+        first = agent.load_and_validate()
+        clear_config_cache()
+        assert agent.load_and_validate() is not first
+
+
+class TestHelpers:
+    def test_get_mapping_for_pattern_case_insensitive(self, config):
+        first = config["skillset"]["component_mappings"][0]
+        keyword = first["source_pattern"][:6].upper()
+        assert ConfigIngestionAgent.get_mapping_for_pattern(config, keyword) is first
+
+    def test_get_mapping_for_pattern_without_private_index(self, config):
+        bare = {"skillset": config["skillset"]}
+        first = config["skillset"]["component_mappings"][0]
+        assert ConfigIngestionAgent.get_mapping_for_pattern(bare, first["source_pattern"]) is first
+
+    def test_get_mapping_for_pattern_no_match(self, config):
+        assert ConfigIngestionAgent.get_mapping_for_pattern(config, "zz-no-such-pattern-zz") is None
+
+    def test_get_blocking_rules(self, config):
+        expected = [
+            r for r in config["rules"]["guardrails"]
+            if r["enforcement"] == "blocking"
+            and ("backend" in r["applies_to"] or "all" in r["applies_to"])
+        ]
+        got = ConfigIngestionAgent.get_blocking_rules(config, "backend")
+        assert sorted(r["id"] for r in got) == sorted(r["id"] for r in expected)
+
+    def test_get_blocking_rules_memoised(self, config):
+        first = ConfigIngestionAgent.get_blocking_rules(config, "frontend")
+        assert ConfigIngestionAgent.get_blocking_rules(config, "frontend") is first
+
+    def test_get_flagged_libraries(self, config):
+        expected = config["rules_index"]["RULE-008"].get("flagged_libraries", [])
+        assert ConfigIngestionAgent.get_flagged_libraries(config) == expected
+        assert ConfigIngestionAgent.get_flagged_libraries({"rules_index": {}}) == []
@@ -0,0 +1,566 @@
+"""
+Tests for agents.conversion_agent — step execution in template-only and
+LLM modes (using a fake router), boundary checks and prompt caching.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from agents.config_ingestion_agent import ConfigIngestionAgent
+from agents.conversion_agent import ConversionAgent, OutOfBoundaryException, Step, _canonicalize
+from agents.conversion_log import ConversionLog
+from agents.llm import LLMResponse
+from prompts import load_prompt
+
+_CONFIG_DIR = Path(__file__).resolve().parent.parent / "config"
+
+
+class FakeRouter:
+    """Minimal stand-in for LLMRouter that records every request."""
+
+    is_available  = True
+    provider_name = "fake"
+    model_name    = "fake-model"
+
+    def __init__(self, reply="export const x = 1;"):
+        self.reply = reply
+        self.calls = []
+
+    def complete(self, system, messages, **kwargs):
+        self.calls.append({"system": system, "messages": messages, **kwargs})
+        return LLMResponse(text=self.reply, model="fake", provider="fake")
+
+    def with_model(self, model):
+        derived = type(self)(self.reply)
+        derived.model_name = model
+        derived.calls = self.calls
+        return derived
+
+    def stream(self, system, messages, **kwargs):
+        self.calls.append({"system": system, "messages": messages, "stream": True, **kwargs})
+        self.chunks_sent = 0
+        for i in range(0, len(self.reply), 4):
+            self.chunks_sent += 1
+            yield self.reply[i:i + 4]
+
+
+@pytest.fixture(scope="module")
+def config():
+    return ConfigIngestionAgent(
+        _CONFIG_DIR / "skillset-config.json",
+        _CONFIG_DIR / "rules-config.json",
+    ).load_and_validate()
+
+
+@pytest.fixture
+def feature(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.service.ts").write_text("export class AService {}\n", encoding="utf-8")
+    (src / "b.service.ts").write_text("export class BService {}\n", encoding="utf-8")
+    return tmp_path
+
+
+def _step(step_id, source, target, mapping_id="MAP-999", rule_ids=("RULE-003",)):
+    return {
+        "id": step_id,
+        "description": f"convert {source}",
+        "source_file": source,
+        "target_file": target,
+        "mapping_id": mapping_id,
+        "rule_ids": list(rule_ids),
+        "rationale": "test",
+    }
+
+
+def _agent(feature, config, steps, router=None, **kwargs):
+    plan = {
+        "feature_name": "Demo",
+        "feature_root": str(feature / "src"),
+        "output_root": str(feature / "out"),
+        "conversion_steps": steps,
+    }
+    log = ConversionLog("Demo", "run-1", "plan.md", feature / "logs" / "log.json")
+    return ConversionAgent(
+        approved_plan=plan,
+        config=config,
+        log=log,
+        output_root=feature / "out",
+        llm_router=router,
+        **kwargs,
+    )
+
+
+class TestExecute:
+    def test_llm_mode_writes_output(self, feature, config):
+        router = FakeRouter()
+        agent = _agent(feature, config, [_step("S1", "a.service.ts", "a.ts")], router)
+        summary = agent.execute()
+        assert summary["completed_steps"] == ["S1"]
+        assert (feature / "out" / "a.ts").read_text(encoding="utf-8") == "export const x = 1;"
+        assert len(router.calls) == 1
+        assert router.calls[0]["cache_marker"] is True
+
+    def test_ambiguous_reply_is_flagged(self, feature, config):
+        router = FakeRouter(reply="AMBIGUOUS: cannot map decorator")
+        agent = _agent(feature, config, [_step("S1", "a.service.ts", "a.ts")], router)
+        summary = agent.execute()
+        assert summary["flagged_steps"][0]["reason"] == "cannot map decorator"
+        assert not (feature / "out" / "a.ts").exists()
+
+    def test_missing_source_is_flagged(self, feature, config):
+        agent = _agent(feature, config, [_step("S1", "nope.ts", "nope.ts")], FakeRouter())
+        summary = agent.execute()
+        assert summary["flagged"] == 1
+
+    def test_out_of_boundary_is_flagged(self, feature, config):
+        agent = _agent(
+            feature, config, [_step("S1", "a.service.ts", "../escape.ts")], FakeRouter()
+        )
+        summary = agent.execute()
+        assert summary["flagged"] == 1
+        assert not (feature / "escape.ts").exists()
+
+    def test_dry_run_writes_nothing(self, feature, config):
+        agent = _agent(
+            feature, config, [_step("S1", "a.service.ts", "a.ts")], FakeRouter(), dry_run=True
+        )
+        assert agent.execute()["completed"] == 1
+        assert not (feature / "out" / "a.ts").exists()
+
+
+class TestAbortedRun:
+    def test_log_written_when_execute_raises(self, feature, config):
+        class Interrupting(FakeRouter):
+            def complete(self, system, messages, **kwargs):
+                raise KeyboardInterrupt
+
+        agent = _agent(feature, config, [_step("S1", "a.service.ts", "a.ts")], Interrupting())
+        with pytest.raises(KeyboardInterrupt):
+            agent.execute()
+        doc = json.loads((feature / "logs" / "log.json").read_text(encoding="utf-8"))
+        assert doc["status"] == "failed"
+        assert doc["entries"][0]["action"] == "step_started"
+        assert agent.log._journal is None
+
+
+class TestResponseCache:
+    def test_repeat_run_served_from_cache(self, feature, config):
+        cache_path = feature / "cache.db"
+        steps = [_step("S1", "a.service.ts", "a.ts")]
+        router = FakeRouter()
+        _agent(feature, config, steps, router, response_cache=cache_path).execute()
+        summary = _agent(feature, config, steps, router, response_cache=cache_path).execute()
+        assert summary["completed_steps"] == ["S1"]
+        assert len(router.calls) == 1
+
+    def test_changed_source_misses(self, feature, config):
+        cache_path = feature / "cache.db"
+        steps = [_step("S1", "a.service.ts", "a.ts")]
+        router = FakeRouter()
+        _agent(feature, config, steps, router, response_cache=cache_path).execute()
+        (feature / "src" / "a.service.ts").write_text("export class Changed {}\n", encoding="utf-8")
+        _agent(feature, config, steps, router, response_cache=cache_path).execute()
+        assert len(router.calls) == 2
+
+    def test_cosmetic_source_change_hits(self, feature, config):
+        cache_path = feature / "cache.db"
+        steps = [_step("S1", "a.service.ts", "a.ts")]
+        router = FakeRouter()
+        _agent(feature, config, steps, router, response_cache=cache_path).execute()
+        src = feature / "src" / "a.service.ts"
+        text = src.read_text(encoding="utf-8")
+        src.write_text("\ufeff" + text.replace("\n", "  \n") + "\n\n\n\n", encoding="utf-8")
+        _agent(feature, config, steps, router, response_cache=cache_path).execute()
+        assert len(router.calls) == 1
+
+    def test_ambiguous_reply_not_cached(self, feature, config):
+        cache_path = feature / "cache.db"
+        steps = [_step("S1", "a.service.ts", "a.ts")]
+        router = FakeRouter(reply="AMBIGUOUS: unclear")
+        _agent(feature, config, steps, router, response_cache=cache_path).execute()
+        _agent(feature, config, steps, router, response_cache=cache_path).execute()
+        assert len(router.calls) == 2
+
+    def test_same_source_different_target_misses(self, feature, config):
+        cache_path = feature / "cache.db"
+        router = FakeRouter()
+        _agent(feature, config, [_step("S1", "a.service.ts", "a.ts")], router,
+               response_cache=cache_path).execute()
+        _agent(feature, config, [_step("S1", "a.service.ts", "other.ts")], router,
+               response_cache=cache_path).execute()
+        assert len(router.calls) == 2
+
+    def test_fallback_reply_not_cached(self, feature, config):
+        class FallingBack(FakeRouter):
+            def complete(self, system, messages, **kwargs):
+                response = super().complete(system, messages, **kwargs)
+                response.fallback = True
+                return response
+
+        cache_path = feature / "cache.db"
+        steps = [_step("S1", "a.service.ts", "a.ts")]
+        router = FallingBack()
+        _agent(feature, config, steps, router, response_cache=cache_path).execute()
+        _agent(feature, config, steps, router, response_cache=cache_path).execute()
+        assert len(router.calls) == 2
+
+
+class TestStreaming:
+    def test_streamed_reply_written(self, feature, config):
+        router = FakeRouter(reply="export const streamed = true;\n")
+        steps = [_step("S1", "a.service.ts", "a.ts")]
+        summary = _agent(feature, config, steps, router, stream=True).execute()
+        assert summary["completed_steps"] == ["S1"]
+        assert router.calls[0]["stream"] is True
+        assert (feature / "out" / "a.ts").read_text(encoding="utf-8") == "export const streamed = true;"
+
+    def test_ambiguous_reply_abandoned_early(self, feature, config):
+        router = FakeRouter(reply="AMBIGUOUS: no equivalent\n" + "x" * 400)
+        steps = [_step("S1", "a.service.ts", "a.ts")]
+        summary = _agent(feature, config, steps, router, stream=True).execute()
+        assert summary["flagged_steps"][0]["reason"] == "no equivalent"
+        assert router.chunks_sent < 10
+
+
+class TestBoundary:
+    def test_inside(self, feature, config):
+        agent = _agent(feature, config, [])
+        agent._assert_within_boundary(feature / "out" / "x" / "y.ts")
+
+    def test_outside(self, feature, config):
+        agent = _agent(feature, config, [])
+        with pytest.raises(OutOfBoundaryException):
+            agent._assert_within_boundary(feature / "outside.ts")
+
+    def test_sibling_prefix_is_outside(self, feature, config):
+        agent = _agent(feature, config, [])
+        with pytest.raises(OutOfBoundaryException):
+            agent._assert_within_boundary(feature / "out-other" / "y.ts")
+
+    def test_symlink_escape_is_outside(self, feature, config):
+        (feature / "out").mkdir()
+        (feature / "elsewhere").mkdir()
+        (feature / "out" / "link").symlink_to(feature / "elsewhere", target_is_directory=True)
+        agent = _agent(feature, config, [])
+        with pytest.raises(OutOfBoundaryException):
+            agent._assert_within_boundary(feature / "out" / "link" / "y.ts")
+
+
+class TestMaxSourceBytes:
+    def test_oversized_source_flagged_without_llm_call(self, feature, config):
+        (feature / "src" / "big.ts").write_text("x" * 500, encoding="utf-8")
+        steps = [_step("S1", "big.ts", "big.ts"), _step("S2", "a.service.ts", "a.ts")]
+        router = FakeRouter()
+        summary = _agent(feature, config, steps, router, max_source_bytes=100).execute()
+        assert summary["completed_steps"] == ["S2"]
+        assert "too large" in summary["flagged_steps"][0]["reason"]
+        assert len(router.calls) == 1
+
+    def test_no_cap_without_llm(self, feature, config):
+        (feature / "src" / "big.ts").write_text("x" * 500, encoding="utf-8")
+        steps = [_step("S1", "big.ts", "big.ts")]
+        agent = _agent(feature, config, steps, None, max_source_bytes=100)
+        assert agent._read_source(feature / "src" / "big.ts") == "x" * 500 + "\n"
+
+
+class TestSkipThreshold:
+    def _steps(self, config):
+        mapping_id = next(iter(config["mappings_index"]))
+        return [_step("S1", "a.service.ts", "a.ts", mapping_id=mapping_id)]
+
+    def test_small_source_uses_template(self, feature, config):
+        router = FakeRouter()
+        agent = _agent(feature, config, self._steps(config), router, llm_skip_threshold=1000)
+        assert agent.execute()["completed"] == 1
+        assert router.calls == []
+        actions = [e["action"] for e in agent.log.to_dict()["entries"]]
+        assert "template_only_short_circuit" in actions
+
+    def test_disabled_by_default(self, feature, config):
+        router = FakeRouter()
+        _agent(feature, config, self._steps(config), router).execute()
+        assert len(router.calls) == 1
+
+    def test_requires_llm_rule_opts_out(self, feature, config):
+        router = FakeRouter()
+        agent = _agent(feature, config, self._steps(config), router, llm_skip_threshold=1000)
+        agent._rules_cache[("RULE-003",)] = [{**config["rules_index"]["RULE-003"], "requires_llm": True}]
+        agent.execute()
+        assert len(router.calls) == 1
+
+
+class TestModelCascade:
+    def test_simple_source_uses_cheap_model(self, feature, config):
+        router = FakeRouter()
+        agent = _agent(feature, config, [_step("S1", "a.service.ts", "a.ts")], router,
+                       simple_model="cheap")
+        summary = agent.execute()
+        assert summary["completed"] == 1
+        assert len(router.calls) == 1
+        assert agent._simple_router.model_name == "cheap"
+
+    def test_ambiguous_cheap_reply_escalates(self, feature, config):
+        router = FakeRouter()
+        agent = _agent(feature, config, [_step("S1", "a.service.ts", "a.ts")], router,
+                       simple_model="cheap")
+        agent._simple_router.reply = "AMBIGUOUS: too hard"
+        summary = agent.execute()
+        assert summary["completed"] == 1
+        assert len(router.calls) == 2
+
+    def test_complex_source_skips_cheap_model(self, feature, config):
+        router = FakeRouter()
+        agent = _agent(feature, config, [_step("S1", "a.service.ts", "a.ts")], router,
+                       simple_model="cheap", complexity_threshold=-1)
+        agent._simple_router.reply = "AMBIGUOUS: should not be asked"
+        assert agent.execute()["completed"] == 1
+        assert len(router.calls) == 1
+
+    def test_complexity_score(self):
+        simple = "export const a = 1;\n"
+        branchy = "import x from 'y';\n" + "if (a && b) { for (;;) {} }\n" * 5
+        assert ConversionAgent._complexity(simple) == 0
+        assert ConversionAgent._complexity(branchy) > ConversionAgent._complexity(simple)
+
+
+class TestStep:
+    def test_from_dict_defaults(self):
+        step = Step.from_dict({"source_file": "a.ts", "target_file": "b.ts", "extra": 1})
+        assert (step.id, step.mapping_id, step.rule_ids, step.rationale) == ("?", "", ("RULE-003",), "")
+        assert step.raw["extra"] == 1
+
+
+class TestSourcePrefetch:
+    def test_reads_each_existing_source_once(self, feature, config):
+        steps = [
+            _step("S1", "a.service.ts", "a1.ts"),
+            _step("S2", "a.service.ts", "a2.ts"),
+            _step("S3", "b.service.ts", "b.ts"),
+            _step("S4", "missing.ts", "m.ts"),
+        ]
+        agent = _agent(feature, config, steps)
+        agent._prefetch_sources([Step.from_dict(s) for s in steps])
+        src = feature / "src"
+        assert set(agent._source_cache) == {src / "a.service.ts", src / "b.service.ts"}
+        assert agent._read_source(src / "missing.ts") is None
+
+    def test_shared_source_read_once(self, feature, config):
+        agent = _agent(feature, config, [])
+        path = feature / "src" / "a.service.ts"
+        first = agent._read_source(path)
+        path.unlink()
+        assert agent._read_source(path) is first
+
+
+class TestTemplates:
+    def test_missing_template_renders_empty(self, feature, config):
+        agent = _agent(feature, config, [])
+        step = _step("S1", "a.service.ts", "a.ts")
+        assert agent._render_template_context("no-such.jinja2", step, "x") == ""
+        assert agent._render_template_context("no-such.jinja2", step, "x") == ""
+
+    def test_resolve_template_memoised(self, feature, config, caplog):
+        agent = _agent(feature, config, [])
+        with caplog.at_level("WARNING", logger="agents.conversion_agent"):
+            assert agent._resolve_template("NO-SUCH-MAPPING") == "passthrough.jinja2"
+            assert agent._resolve_template("NO-SUCH-MAPPING") == "passthrough.jinja2"
+        assert len(caplog.records) == 1
+
+    def test_environment_shared(self, feature, config):
+        first = _agent(feature, config, [])
+        second = _agent(feature, config, [])
+        assert first._jinja is second._jinja
+        assert first._jinja.auto_reload is False
+
+    def test_passthrough_not_rendered(self, feature, config, monkeypatch):
+        agent = _agent(feature, config, [])
+        monkeypatch.setattr(agent._jinja, "get_template", None)
+        step = _step("S1", "a.service.ts", "a.ts")
+        assert agent._render_template_context("passthrough.jinja2", step, "x") == ""
+
+
+class TestStripCodeFences:
+    def test_fenced_with_prose(self):
+        text = "Here you go:\n```ts\nexport const a = 1;\n```\nDone."
+        assert ConversionAgent._strip_code_fences(text) == "export const a = 1;"
+
+    def test_leading_and_trailing_prose(self):
+        text = "Converted below\nimport os\nx = 1\n---\nKey changes: none"
+        assert ConversionAgent._strip_code_fences(text) == "import os\nx = 1"
+
+
+class TestCanonicalize:
+    def test_bom_line_endings_and_trailing_whitespace(self):
+        assert _canonicalize("\ufeffa = 1  \r\nb = 2\t\rc") == "a = 1\nb = 2\nc\n"
+
+    def test_blank_runs_collapsed_to_two(self):
+        assert _canonicalize("a\n\n\n\n\n\nb\n\n\nc") == "a\n\n\nb\n\n\nc\n"
+
+    def test_single_trailing_newline(self):
+        assert _canonicalize("a\n\n\n") == _canonicalize("a") == "a\n"
+        assert _canonicalize("\n\n") == ""
+
+
+class TestSystemPrompt:
+    def test_matches_direct_format(self, feature, config):
+        agent = _agent(feature, config, [])
+        rules_text = "- RULE-003 (x): y"
+        expected = load_prompt(agent._system_prompt_file).format(
+            rules_text=rules_text,
+            target_stack_summary=load_prompt(agent._target_stack_file),
+        )
+        assert agent._system_prompt(rules_text) == expected
+        assert agent._system_prompt("") != expected
+
+    def test_reused_per_rules_text(self, feature, config):
+        agent = _agent(feature, config, [])
+        assert agent._system_prompt("- a") is agent._system_prompt("- a")
+
+
+class TestParallelExecute:
+    def test_results_in_plan_order(self, feature, config):
+        steps = [
+            _step("S1", "a.service.ts", "a.ts"),
+            _step("S2", "missing.ts", "m.ts"),
+            _step("S3", "b.service.ts", "b.ts"),
+        ]
+        router = FakeRouter()
+        agent = _agent(feature, config, steps, router, max_workers=4)
+        summary = agent.execute()
+        assert summary["completed_steps"] == ["S1", "S3"]
+        assert [f["step"] for f in summary["flagged_steps"]] == ["S2"]
+        assert len(router.calls) == 2
+        assert (feature / "out" / "b.ts").exists()
+
+        sequences = [e["sequence"] for e in agent.log.to_dict()["entries"]]
+        assert sequences == list(range(1, len(sequences) + 1))
+
+
+class TestExecuteAsync:
+    def test_matches_execute(self, feature, config):
+        steps = [
+            _step("S1", "a.service.ts", "a.ts"),
+            _step("S2", "missing.ts", "m.ts"),
+            _step("S3", "b.service.ts", "b.ts"),
+        ]
+        router = FakeRouter()
+        agent = _agent(feature, config, steps, router, max_workers=2)
+        summary = asyncio.run(agent.execute_async())
+        assert summary["completed_steps"] == ["S1", "S3"]
+        assert [f["step"] for f in summary["flagged_steps"]] == ["S2"]
+        assert (feature / "out" / "b.ts").exists()
+        assert agent.log.to_dict()["status"] == "completed_with_flags"
+
+    def test_failure_waits_for_in_flight_steps(self, feature, config):
+        other_started = threading.Event()
+
+        class FailingFirst(FakeRouter):
+            def complete(self, system, messages, **kwargs):
+                if "AService" in messages[-1].content:
+                    other_started.wait(timeout=5)
+                    raise RuntimeError("boom")
+                other_started.set()
+                time.sleep(0.2)  # still in its LLM call when S1 fails
+                return super().complete(system, messages, **kwargs)
+
+        steps = [_step("S1", "a.service.ts", "a.ts"), _step("S2", "b.service.ts", "b.ts")]
+        agent = _agent(feature, config, steps, FailingFirst(), max_workers=2)
+        with pytest.raises(RuntimeError):
+            asyncio.run(agent.execute_async())
+        assert (feature / "out" / "b.ts").exists()
+        assert agent.log._journal is None
+        doc = json.loads((feature / "logs" / "log.json").read_text(encoding="utf-8"))
+        assert doc["status"] == "failed"
+        journal = agent.log.journal_path.read_bytes().splitlines()
+        assert len(journal) == len(doc["entries"])
+
+
+class BatchRouter(FakeRouter):
+    """Answers batch requests with a JSON array and single requests with text."""
+
+    def complete(self, system, messages, **kwargs):
+        self.calls.append({"system": system, "messages": messages, **kwargs})
+        content = messages[-1].content
+        if "STEPS:" in content:
+            items = json.loads(content.split("STEPS:\n", 1)[1])
+            reply = json.dumps([{"id": i["id"], "code": f"// {i['id']}"} for i in items])
+        else:
+            reply = self.reply
+        return LLMResponse(text=reply, model="fake", provider="fake")
+
+
+class TestBatching:
+    def test_matching_steps_share_one_request(self, feature, config):
+        steps = [
+            _step("S1", "a.service.ts", "a.ts"),
+            _step("S2", "b.service.ts", "b.ts"),
+        ]
+        router = BatchRouter()
+        summary = _agent(feature, config, steps, router, batch_size=4).execute()
+        assert summary["completed_steps"] == ["S1", "S2"]
+        assert len(router.calls) == 1
+        assert (feature / "out" / "b.ts").read_text(encoding="utf-8") == "// S2"
+
+    def test_batches_sent_concurrently(self, feature, config):
+        steps = [
+            _step(f"S{i}", f"{'ab'[i % 2]}.service.ts", f"{i}.ts") for i in range(1, 5)
+        ]
+        router = BatchRouter()
+        summary = _agent(feature, config, steps, router, batch_size=2, max_workers=2).execute()
+        assert summary["completed_steps"] == ["S1", "S2", "S3", "S4"]
+        assert len(router.calls) == 2
+        assert (feature / "out" / "4.ts").read_text(encoding="utf-8") == "// S4"
+
+    def test_different_rules_not_batched(self, feature, config):
+        steps = [
+            _step("S1", "a.service.ts", "a.ts"),
+            _step("S2", "b.service.ts", "b.ts", rule_ids=("RULE-001",)),
+        ]
+        router = BatchRouter()
+        _agent(feature, config, steps, router, batch_size=4).execute()
+        assert len(router.calls) == 2
+
+    def test_malformed_batch_falls_back(self, feature, config):
+        steps = [
+            _step("S1", "a.service.ts", "a.ts"),
+            _step("S2", "b.service.ts", "b.ts"),
+        ]
+        router = FakeRouter(reply="not json")
+        summary = _agent(feature, config, steps, router, batch_size=4).execute()
+        assert summary["completed"] == 2
+        assert len(router.calls) == 3  # failed batch + one per step
+
+    def test_batch_replies_cached(self, feature, config):
+        cache_path = feature / "cache.db"
+        steps = [_step("S1", "a.service.ts", "a.ts"), _step("S2", "b.service.ts", "b.ts")]
+        router = BatchRouter()
+        _agent(feature, config, steps, router, batch_size=2, response_cache=cache_path).execute()
+        summary = _agent(feature, config, steps, router, batch_size=2,
+                         response_cache=cache_path).execute()
+        assert summary["completed_steps"] == ["S1", "S2"]
+        assert len(router.calls) == 1
+        assert (feature / "out" / "b.ts").read_text(encoding="utf-8") == "// S2"
+
+    def test_batch_reply_served_to_single_step(self, feature, config):
+        cache_path = feature / "cache.db"
+        steps = [_step("S1", "a.service.ts", "a.ts"), _step("S2", "b.service.ts", "b.ts")]
+        router = BatchRouter()
+        _agent(feature, config, steps, router, batch_size=2, response_cache=cache_path).execute()
+        _agent(feature, config, steps[1:], router, response_cache=cache_path).execute()
+        assert len(router.calls) == 1
+
+    def test_cached_steps_left_out_of_batch(self, feature, config):
+        cache_path = feature / "cache.db"
+        steps = [_step("S1", "a.service.ts", "a.ts"), _step("S2", "b.service.ts", "b.ts")]
+        router = BatchRouter()
+        _agent(feature, config, steps[:1], router, response_cache=cache_path).execute()
+        _agent(feature, config, steps, router, batch_size=2, response_cache=cache_path).execute()
+        # S1 from the cache; S2 alone is no batch, so one single request
+        assert len(router.calls) == 2
+        assert "STEPS:" not in router.calls[1]["messages"][-1].content
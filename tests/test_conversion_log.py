@@ -0,0 +1,109 @@
+"""
+Tests for agents.conversion_log — recording, persistence and deferred flushing.
+"""
+
+import json
+
+from agents.conversion_log import ConversionLog
+
+
+def _log(tmp_path):
+    return ConversionLog("Demo", "run-1", "plan.md", tmp_path / "logs" / "log.json")
+
+
+def _on_disk(log):
+    return json.loads(log.log_path.read_text(encoding="utf-8"))
+
+
+def _journal(log):
+    if not log.journal_path.exists():
+        return []
+    return [json.loads(line) for line in log.journal_path.read_text(encoding="utf-8").splitlines()]
+
+
+class TestRecord:
+    def test_each_record_journaled(self, tmp_path):
+        log = _log(tmp_path)
+        log.record("read_file", source_file="a.ts")
+        entries = _journal(log)
+        assert [(e["sequence"], e["action"]) for e in entries] == [(1, "read_file")]
+        assert _on_disk(log)["entries"] == []
+
+    def test_finalize_writes_document(self, tmp_path):
+        log = _log(tmp_path)
+        log.record("read_file")
+        log.record("wrote_file")
+        log.finalize("completed_with_flags")
+        doc = _on_disk(log)
+        assert doc["status"] == "completed_with_flags"
+        assert [e["action"] for e in doc["entries"]] == ["read_file", "wrote_file"]
+        assert doc["entries"] == _journal(log)
+
+    def test_flush_writes_document(self, tmp_path):
+        log = _log(tmp_path)
+        log.record("read_file")
+        log.flush()
+        assert len(_on_disk(log)["entries"]) == 1
+
+    def test_new_run_truncates_journal(self, tmp_path):
+        _log(tmp_path).record("read_file")
+        log = _log(tmp_path)
+        log.record("wrote_file")
+        assert [e["action"] for e in _journal(log)] == ["wrote_file"]
+
+
+class TestDeferred:
+    def test_single_flush_on_exit(self, tmp_path, monkeypatch):
+        log = _log(tmp_path)
+        flushes = []
+        original = log._flush
+        monkeypatch.setattr(log, "_flush", lambda: (flushes.append(1), original()))
+        with log.deferred():
+            log.record("read_file")
+            log.record("wrote_file")
+            assert _journal(log) == []
+        assert len(flushes) == 1
+        assert len(_journal(log)) == 2
+
+    def test_nested_blocks_flush_on_each_exit(self, tmp_path):
+        log = _log(tmp_path)
+        with log.deferred():
+            with log.deferred():
+                log.record("read_file")
+            assert len(_journal(log)) == 1
+            log.record("wrote_file")
+        assert len(_journal(log)) == 2
+
+    def test_flushed_when_block_raises(self, tmp_path):
+        log = _log(tmp_path)
+        try:
+            with log.deferred():
+                log.record("read_file")
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        assert len(_journal(log)) == 1
+
+
+class TestFlushInterval:
+    def test_flushes_coalesced_until_timer(self, tmp_path):
+        log = ConversionLog(
+            "Demo", "run-1", "plan.md", tmp_path / "logs" / "log.json", flush_interval=60
+        )
+        log.record("read_file")
+        log.record("wrote_file")
+        assert _journal(log) == []
+        log._timer_flush()
+        assert len(_journal(log)) == 2
+        log.finalize()
+
+    def test_finalize_drains_and_cancels_timer(self, tmp_path):
+        log = ConversionLog(
+            "Demo", "run-1", "plan.md", tmp_path / "logs" / "log.json", flush_interval=60
+        )
+        log.record("read_file")
+        timer = log._timer
+        log.finalize()
+        assert not timer.is_alive() or timer.finished.is_set()
+        assert len(_journal(log)) == 1
+        assert len(_on_disk(log)["entries"]) == 1
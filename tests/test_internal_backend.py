@@ -0,0 +1,36 @@
+"""
+Tests for agents.orchestrator_backends.internal_backend — history budgeting.
+"""
+
+from agents.orchestrator_backends.internal_backend import _prune_history
+
+
+def _history(turns, size=100):
+    messages = [{"role": "user", "content": "S" * size}]
+    for i in range(turns):
+        messages.append({"role": "assistant", "content": f"a{i}".ljust(size)})
+        messages.append({"role": "user", "content": f"r{i}".ljust(size)})
+    return messages
+
+
+class TestPruneHistory:
+    def test_within_budget_unchanged(self):
+        messages = _history(3)
+        assert _prune_history(messages, 10_000) is messages
+
+    def test_zero_budget_disables(self):
+        messages = _history(10)
+        assert _prune_history(messages, 0) is messages
+
+    def test_drops_oldest_turns_and_keeps_alternation(self):
+        messages = _history(10)
+        pruned = _prune_history(messages, 550)
+        assert pruned[0]["content"].startswith("S" * 100)
+        assert "[16 earlier message(s) omitted" in pruned[0]["content"]
+        assert [m["content"][:2] for m in pruned[1:]] == ["a8", "r8", "a9", "r9"]
+        roles = [m["role"] for m in pruned]
+        assert all(a != b for a, b in zip(roles, roles[1:]))
+
+    def test_always_keeps_latest_exchange(self):
+        pruned = _prune_history(_history(4, size=1000), 500)
+        assert [m["content"][:2] for m in pruned[1:]] == ["a3", "r3"]
@@ -0,0 +1,414 @@
+"""
+Tests for agents.llm.providers — request plumbing against a stand-in SDK module.
+"""
+
+import asyncio
+import sys
+import types
+from types import SimpleNamespace
+
+import pytest
+
+from agents.llm.base import LLMConfig, LLMMessage
+from agents.llm.providers.openai_compat_provider import OpenAICompatProvider
+
+_MSGS = [LLMMessage(role="user", content="hi")]
+
+
+def _completion(text):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+        usage=SimpleNamespace(prompt_tokens=3, completion_tokens=5),
+        model="m",
+    )
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    module = types.ModuleType("openai")
+    module.created = []
+
+    class OpenAI:
+        def __init__(self, **kwargs):
+            self.chat = SimpleNamespace(completions=SimpleNamespace(
+                create=lambda **kw: _completion("sync:" + kw["messages"][-1]["content"])
+            ))
+
+    class AsyncOpenAI:
+        def __init__(self, **kwargs):
+            module.created.append(self)
+
+            async def create(**kw):
+                return _completion("async:" + kw["messages"][-1]["content"])
+
+            self.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+
+    module.OpenAI = OpenAI
+    module.AsyncOpenAI = AsyncOpenAI
+    monkeypatch.setitem(sys.modules, "openai", module)
+    return module
+
+
+def _provider():
+    return OpenAICompatProvider(LLMConfig(provider="openai_compat", model="m", base_url="http://x/v1"))
+
+
+class TestOpenAICompatAsync:
+    def test_complete_and_acomplete(self, fake_openai):
+        provider = _provider()
+        assert provider.complete("sys", _MSGS).text == "sync:hi"
+        response = asyncio.run(provider.acomplete("sys", _MSGS))
+        assert (response.text, response.input_tokens, response.output_tokens) == ("async:hi", 3, 5)
+
+    def test_async_client_reused_per_loop(self, fake_openai):
+        provider = _provider()
+
+        async def twice():
+            await provider.acomplete("sys", _MSGS)
+            await provider.acomplete("sys", _MSGS)
+
+        asyncio.run(twice())
+        assert len(fake_openai.created) == 1
+        asyncio.run(twice())
+        assert len(fake_openai.created) == 2
+
+
+class TestCompleteMany:
+    def test_preserves_order_and_bounds_concurrency(self, fake_openai):
+        provider = _provider()
+        in_flight = peak = 0
+
+        async def create(**kw):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _completion(kw["messages"][-1]["content"])
+
+        fake_openai.AsyncOpenAI = lambda **kw: SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+        )
+        batch = [[LLMMessage(role="user", content=str(i))] for i in range(6)]
+        responses = provider.complete_many("sys", batch, max_concurrency=2)
+        assert [r.text for r in responses] == [str(i) for i in range(6)]
+        assert peak == 2
+
+    def test_empty_batch(self, fake_openai):
+        assert _provider().complete_many("sys", []) == []
+
+    def test_async_clients_closed_after_each_batch(self, fake_openai):
+        closed = []
+
+        async def aclose_(self):
+            closed.append(self)
+
+        fake_openai.AsyncOpenAI.close = aclose_
+        provider = _provider()
+        provider.complete_many("sys", [_MSGS, _MSGS])
+        provider.complete_many("sys", [_MSGS])
+        assert closed == fake_openai.created
+        assert len(closed) == 2
+
+
+class TestAsyncClientClose:
+    def test_close_closes_live_async_client(self, fake_openai):
+        closed = []
+
+        async def aclose_(self):
+            closed.append(self)
+
+        fake_openai.AsyncOpenAI.close = aclose_
+        provider = _provider()
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(provider.acomplete("sys", _MSGS))
+            provider.close()
+        finally:
+            loop.close()
+        assert closed == fake_openai.created
+
+    def test_close_after_loop_closed(self, fake_openai):
+        provider = _provider()
+        asyncio.run(provider.acomplete("sys", _MSGS))
+        provider.close()   # loop already gone; nothing to await, must not raise
+        assert not provider.is_available
+
+    def test_base_provider_async_client_closed(self, fake_openai):
+        from agents.llm.providers.openai_provider import OpenAIProvider
+        closed = []
+
+        async def aclose_(self):
+            closed.append(self)
+
+        fake_openai.AsyncOpenAI.close = aclose_
+        provider = OpenAIProvider(LLMConfig(provider="openai", model="m", api_key="k", warmup=False))
+        provider.complete_many("sys", [_MSGS])
+        assert closed == fake_openai.created and provider._aclient is None
+
+
+class TestLlamaCppTuning:
+    def test_defaults_cap_batch_at_context(self, monkeypatch):
+        from agents.llm.providers.llamacpp_provider import _tuning_kwargs
+
+        for name in ("LLAMACPP_N_BATCH", "LLAMACPP_N_UBATCH", "LLAMACPP_N_THREADS", "LLAMACPP_FLASH_ATTN"):
+            monkeypatch.delenv(name, raising=False)
+        assert _tuning_kwargs(4096, -1) == {"n_batch": 2048, "n_ubatch": 512, "flash_attn": True}
+        assert _tuning_kwargs(1024, 0) == {"n_batch": 1024, "n_ubatch": 512, "flash_attn": False}
+
+    def test_env_overrides(self, monkeypatch):
+        from agents.llm.providers.llamacpp_provider import _tuning_kwargs
+
+        monkeypatch.setenv("LLAMACPP_N_THREADS", "8")
+        monkeypatch.setenv("LLAMACPP_N_UBATCH", "256")
+        monkeypatch.setenv("LLAMACPP_FLASH_ATTN", "0")
+        monkeypatch.setenv("LLAMACPP_N_BATCH", "lots")
+        kwargs = _tuning_kwargs(4096, -1)
+        assert kwargs == {"n_batch": 2048, "n_ubatch": 256, "flash_attn": False, "n_threads": 8}
+
+
+class TestLlamaCppPool:
+    @pytest.fixture
+    def fake_llama(self, monkeypatch):
+        import threading
+
+        module = types.ModuleType("llama_cpp")
+        state = {"in_flight": 0, "peak": 0, "instances": 0}
+        lock = threading.Lock()
+
+        class Llama:
+            def __init__(self, **kwargs):
+                state["instances"] += 1
+
+            def create_chat_completion(self, messages, **kwargs):
+                import time
+
+                with lock:
+                    state["in_flight"] += 1
+                    state["peak"] = max(state["peak"], state["in_flight"])
+                time.sleep(0.02)
+                with lock:
+                    state["in_flight"] -= 1
+                if kwargs.get("stream"):
+                    return iter([{"choices": [{"delta": {"content": c}}]} for c in messages[-1]["content"]])
+                return {"choices": [{"message": {"content": messages[-1]["content"]}}]}
+
+        module.Llama = Llama
+        monkeypatch.setitem(sys.modules, "llama_cpp", module)
+        return state
+
+    def _provider(self, tmp_path):
+        from agents.llm.providers.llamacpp_provider import LlamaCppProvider
+
+        model = tmp_path / "m.gguf"
+        model.write_bytes(b"")
+        return LlamaCppProvider(LLMConfig(provider="llamacpp", model_path=str(model)))
+
+    def _run_parallel(self, provider, n):
+        from concurrent.futures import ThreadPoolExecutor
+
+        batch = [[LLMMessage(role="user", content=str(i))] for i in range(n)]
+        with ThreadPoolExecutor(max_workers=n) as pool:
+            return [r.text for r in pool.map(lambda m: provider.complete("sys", m), batch)]
+
+    def test_single_context_serialises(self, fake_llama, tmp_path, monkeypatch):
+        monkeypatch.delenv("LLAMACPP_POOL_SIZE", raising=False)
+        provider = self._provider(tmp_path)
+        assert self._run_parallel(provider, 4) == ["0", "1", "2", "3"]
+        assert (fake_llama["instances"], fake_llama["peak"]) == (1, 1)
+
+    def test_pool_runs_contexts_in_parallel(self, fake_llama, tmp_path, monkeypatch):
+        monkeypatch.setenv("LLAMACPP_POOL_SIZE", "2")
+        provider = self._provider(tmp_path)
+        assert self._run_parallel(provider, 4) == ["0", "1", "2", "3"]
+        assert (fake_llama["instances"], fake_llama["peak"]) == (2, 2)
+        provider.close()
+        assert not provider.is_available
+
+    def test_response_labelled_with_model_file(self, fake_llama, tmp_path, monkeypatch):
+        from agents.llm.providers.llamacpp_provider import LlamaCppProvider
+
+        model = tmp_path / "coder-7b.gguf"
+        model.write_bytes(b"")
+        monkeypatch.setenv("LLAMACPP_MODEL_PATH", str(model))
+        provider = LlamaCppProvider(LLMConfig(provider="llamacpp", model=""))
+        assert provider.complete("sys", _MSGS).model == "coder-7b.gguf"
+
+    def test_stream_yields_deltas_and_returns_context(self, fake_llama, tmp_path, monkeypatch):
+        monkeypatch.delenv("LLAMACPP_POOL_SIZE", raising=False)
+        provider = self._provider(tmp_path)
+        chunks = list(provider.stream("sys", [LLMMessage(role="user", content="abc")]))
+        assert chunks == ["a", "b", "c"]
+        assert provider._pool.qsize() == 1
+
+
+class TestOpenAICompatStream:
+    def test_stream_yields_non_empty_deltas(self, fake_openai):
+        closed = []
+
+        class _Stream:
+            def __iter__(self):
+                for text in ("he", None, "llo"):
+                    yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+            def close(self):
+                closed.append(True)
+
+        provider = _provider()
+        provider._client.chat.completions.create = lambda **kw: _Stream()
+        assert list(provider.stream("sys", _MSGS)) == ["he", "llo"]
+        assert closed == [True]
+
+
+class TestOllamaHttpFallback:
+    @pytest.fixture
+    def fake_httpx(self, monkeypatch):
+        module = types.ModuleType("httpx")
+        module.posts = []
+
+        class Client:
+            def __init__(self, **kwargs):
+                self.kwargs = kwargs
+
+            def build_request(self, method, url, content=None, headers=None):
+                return (method, url, content, headers)
+
+            def send(self, request, stream=False):
+                module.posts.append(request[1:])
+                return SimpleNamespace(
+                    raise_for_status=lambda: None,
+                    content=b'{"message":{"content":"ok \\u00e9"},"eval_count":2}',
+                )
+
+        module.Client = Client
+        module.Timeout = lambda *a, **kw: ("timeout", a, kw)
+        module.Limits = lambda **kw: ("limits", kw)
+        module.HTTPTransport = lambda **kw: ("transport", kw)
+        monkeypatch.setitem(sys.modules, "ollama", None)
+        monkeypatch.setitem(sys.modules, "httpx", module)
+        return module
+
+    def test_posts_encoded_body_and_decodes_reply(self, fake_httpx):
+        import json
+
+        from agents.llm.providers.ollama_provider import OllamaProvider
+
+        provider = OllamaProvider(LLMConfig(
+            provider="ollama", model="m", ollama_host="http://h", warmup=False,
+        ))
+        response = provider.complete("sys", [LLMMessage(role="user", content="héllo")])
+        assert (response.text, response.output_tokens) == ("ok é", 2)
+
+        url, body, headers = fake_httpx.posts[0]
+        assert url == "/api/chat" and headers == {"Content-Type": "application/json"}
+        payload = json.loads(body)
+        assert payload["messages"][-1] == {"role": "user", "content": "héllo"}
+        assert payload["stream"] is False
+        assert payload["keep_alive"] == "30m"
+        assert provider._client.kwargs["transport"][1]["retries"] == 2
+
+    def test_preloads_model_with_keep_alive(self, fake_httpx, monkeypatch):
+        import json
+        import time
+
+        from agents.llm.providers.ollama_provider import OllamaProvider
+
+        monkeypatch.setenv("OLLAMA_KEEP_ALIVE", "-1")
+        OllamaProvider(LLMConfig(provider="ollama", model="m", ollama_host="http://h"))
+        deadline = time.monotonic() + 2
+        while not fake_httpx.posts and time.monotonic() < deadline:
+            time.sleep(0.01)
+        url, body, _ = fake_httpx.posts[0]
+        assert url == "/api/generate"
+        assert json.loads(body) == {"model": "m", "keep_alive": -1}
+
+
+class TestMaxRetries:
+    def test_passed_to_sync_and_async_clients(self, fake_openai):
+        seen = []
+        fake_openai.OpenAI = lambda **kw: seen.append(("sync", kw["max_retries"]))
+        fake_openai.AsyncOpenAI = lambda **kw: seen.append(("async", kw["max_retries"]))
+        provider = OpenAICompatProvider(LLMConfig(
+            provider="openai_compat", model="m", base_url="http://x/v1", max_retries=7,
+        ))
+        provider._async_factory()
+        assert seen == [("sync", 7), ("async", 7)]
+
+
+class TestOpenAICompatEndpointPool:
+    def _pool(self, fake_openai, urls):
+        class APIConnectionError(Exception):
+            pass
+
+        calls = []
+
+        def make(**kw):
+            def create(**req):
+                calls.append(kw["base_url"])
+                if "down" in kw["base_url"]:
+                    raise APIConnectionError("refused")
+                return _completion(kw["base_url"])
+
+            return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+        fake_openai.APIConnectionError = APIConnectionError
+        fake_openai.OpenAI = make
+        provider = OpenAICompatProvider(LLMConfig(provider="openai_compat", model="m", base_url=urls))
+        return provider, calls
+
+    def test_fails_over_and_cools_down_unreachable_endpoint(self, fake_openai):
+        provider, calls = self._pool(fake_openai, "http://down/v1, http://up/v1")
+        assert provider.complete("sys", _MSGS).text == "http://up/v1"
+        assert provider.complete("sys", _MSGS).text == "http://up/v1"
+        assert calls == ["http://down/v1", "http://up/v1", "http://up/v1"]
+
+    def test_all_endpoints_down_raises(self, fake_openai):
+        from agents.llm.base import LLMProviderError
+
+        provider, calls = self._pool(fake_openai, ["http://down1/v1", "http://down2/v1"])
+        with pytest.raises(LLMProviderError, match="down2"):
+            provider.complete("sys", _MSGS)
+        assert len(calls) == 2
+        assert all(e.in_flight == 0 for e in provider._endpoints)
+
+    def test_picks_least_busy_endpoint(self, fake_openai):
+        provider, _ = self._pool(fake_openai, "http://a/v1,http://b/v1")
+        first = provider._checkout([])
+        second = provider._checkout([])
+        assert {first.url, second.url} == {"http://a/v1", "http://b/v1"}
+
+
+class TestWarmUp:
+    def _with_models(self, fake_openai):
+        import threading
+
+        listed = threading.Event()
+
+        def make(**kw):
+            return SimpleNamespace(models=SimpleNamespace(list=listed.set))
+
+        fake_openai.OpenAI = make
+        return listed
+
+    def test_lists_models_in_background(self, fake_openai):
+        listed = self._with_models(fake_openai)
+        _provider()
+        assert listed.wait(2)
+
+    def test_disabled_by_config(self, fake_openai):
+        listed = self._with_models(fake_openai)
+        OpenAICompatProvider(LLMConfig(
+            provider="openai_compat", model="m", base_url="http://x/v1", warmup=False,
+        ))
+        assert not listed.wait(0.1)
+
+
+class TestKeepRaw:
+    def test_raw_dropped_by_default(self, fake_openai):
+        assert _provider().complete("sys", _MSGS).raw is None
+
+    def test_raw_kept_when_configured(self, fake_openai):
+        provider = OpenAICompatProvider(LLMConfig(
+            provider="openai_compat", model="m", base_url="http://x/v1", keep_raw=True,
+        ))
+        assert provider.complete("sys", _MSGS).raw.choices[0].message.content == "sync:hi"
@@ -0,0 +1,444 @@
+"""
+Tests for agents.llm.registry.LLMRouter — provider dispatch and fallback,
+using in-memory fake providers (no SDKs or network access).
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from agents.llm import LLMMessage, LLMResponse
+from agents.llm.base import BaseLLMProvider, LLMConfig, LLMProviderError
+from agents.llm.registry import CircuitBreakerConfig, LLMRouter
+
+
+class FakeProvider(BaseLLMProvider):
+    """Records calls; optionally fails or advertises prompt caching."""
+
+    def __init__(self, name="fake", fail=False, prompt_cache=False, available=True):
+        self.fail = fail
+        self.prompt_cache = prompt_cache
+        self.available = available
+        self.calls = []
+        super().__init__(LLMConfig(provider=name, model=f"{name}-model"))
+
+    def _setup(self) -> None:
+        self._client = object() if self.available else None
+
+    def complete(self, system, messages, **kwargs):
+        self.calls.append(kwargs)
+        if self.fail:
+            raise LLMProviderError("boom")
+        return LLMResponse(text=self.config.provider, model="m", provider=self.config.provider)
+
+    def supports_prompt_cache(self) -> bool:
+        return self.prompt_cache
+
+
+class StreamingProvider(FakeProvider):
+    """Yields its name letter by letter; optionally fails after N chunks."""
+
+    def __init__(self, name="fake", fail_after=None, **kwargs):
+        self.fail_after = fail_after
+        super().__init__(name, **kwargs)
+
+    def stream(self, system, messages, cache_marker=False):
+        for i, ch in enumerate(self.config.provider):
+            if i == self.fail_after:
+                raise LLMProviderError("mid-stream")
+            yield ch
+
+
+_MSGS = [LLMMessage(role="user", content="hi")]
+
+
+class TestComplete:
+    def test_primary(self):
+        router = LLMRouter(FakeProvider("a"), FakeProvider("b"))
+        assert router.complete("sys", _MSGS).text == "a"
+
+    def test_fallback_on_error(self):
+        router = LLMRouter(FakeProvider("a", fail=True), FakeProvider("b"))
+        assert router.complete("sys", _MSGS).text == "b"
+
+    def test_fallback_when_primary_unavailable(self):
+        router = LLMRouter(FakeProvider("a", available=False), FakeProvider("b"))
+        assert router.complete("sys", _MSGS).text == "b"
+
+    def test_error_without_fallback(self):
+        router = LLMRouter(FakeProvider("a", fail=True))
+        with pytest.raises(LLMProviderError):
+            router.complete("sys", _MSGS)
+
+
+class TestFallbackChain:
+    def test_tries_providers_in_order(self):
+        chain = [FakeProvider("a", fail=True), FakeProvider("b", fail=True), FakeProvider("c")]
+        router = LLMRouter(chain)
+        assert router.complete("sys", _MSGS).text == "c"
+        assert [len(p.calls) for p in chain] == [1, 1, 1]
+
+    def test_skips_unavailable(self):
+        chain = [FakeProvider("a", available=False), FakeProvider("b")]
+        assert LLMRouter(chain).complete("sys", _MSGS).text == "b"
+
+    def test_fallback_reply_is_marked(self):
+        router = LLMRouter(FakeProvider("a", fail=True), FakeProvider("b"))
+        assert router.complete("sys", _MSGS).fallback is True
+        assert LLMRouter(FakeProvider("a")).complete("sys", _MSGS).fallback is False
+
+    def test_stream_reports_fallback(self):
+        fell_back = []
+        router = LLMRouter(StreamingProvider("abc", fail_after=0), StreamingProvider("xy"))
+        assert "".join(router.stream("sys", _MSGS, on_fallback=lambda: fell_back.append(1))) == "xy"
+        assert fell_back == [1]
+
+    def test_last_error_propagates(self):
+        router = LLMRouter([FakeProvider("a", fail=True), FakeProvider("b", fail=True)])
+        with pytest.raises(LLMProviderError):
+            router.complete("sys", _MSGS)
+
+    def test_from_config_accepts_list(self, monkeypatch):
+        from agents.llm import registry
+        monkeypatch.setattr(registry, "_load_provider", lambda cfg: FakeProvider(cfg.provider))
+        router = LLMRouter.from_config(
+            LLMConfig(provider="a"), [LLMConfig(provider="b"), LLMConfig(provider="c")],
+        )
+        assert [p.config.provider for p in router._chain] == ["a", "b", "c"]
+
+
+class TestCircuitBreaker:
+    def _router(self, primary, **kwargs):
+        cfg = CircuitBreakerConfig(failure_threshold=2, **kwargs)
+        return LLMRouter(primary, FakeProvider("b"), breaker=cfg)
+
+    def test_opens_after_threshold(self):
+        primary = FakeProvider("a", fail=True)
+        router = self._router(primary)
+        for _ in range(4):
+            assert router.complete("sys", _MSGS).text == "b"
+        assert len(primary.calls) == 2
+
+    def test_half_open_probe_closes_on_success(self):
+        primary = FakeProvider("a", fail=True)
+        router = self._router(primary, open_duration_secs=0.0)
+        router.complete("sys", _MSGS)
+        router.complete("sys", _MSGS)
+        assert router._breakers[0].state == "open"
+        primary.fail = False
+        assert router.complete("sys", _MSGS).text == "a"
+        assert router._breakers[0].state == "closed"
+
+    def test_client_errors_do_not_count(self):
+        class BadRequest(Exception):
+            status_code = 400
+
+        class Rejecting(FakeProvider):
+            def complete(self, system, messages, **kwargs):
+                self.calls.append(kwargs)
+                raise LLMProviderError("bad request") from BadRequest()
+
+        primary = Rejecting("a")
+        router = self._router(primary)
+        for _ in range(3):
+            router.complete("sys", _MSGS)
+        assert len(primary.calls) == 3
+        assert router._breakers[0].state == "closed"
+
+    def _half_open(self, primary):
+        router = self._router(primary, open_duration_secs=0.0)
+        router.complete("sys", _MSGS)
+        router.complete("sys", _MSGS)
+        assert router._breakers[0].state == "open"
+        return router
+
+    def test_client_error_probe_closes_circuit(self):
+        class BadRequest(Exception):
+            status_code = 400
+
+        class Flaky(FakeProvider):
+            def complete(self, system, messages, **kwargs):
+                self.calls.append(kwargs)
+                if self.fail == "client":
+                    raise LLMProviderError("bad request") from BadRequest()
+                if self.fail:
+                    raise LLMProviderError("boom")
+                return LLMResponse(text="a", model="m", provider="a")
+
+        primary = Flaky("a", fail=True)
+        router = self._half_open(primary)
+        primary.fail = "client"
+        router.complete("sys", _MSGS)
+        assert router._breakers[0].state == "closed"
+        primary.fail = False
+        assert router.complete("sys", _MSGS).text == "a"
+
+    def test_abandoned_stream_probe_closes_circuit(self):
+        primary = StreamingProvider("abc", fail_after=0)
+        router = LLMRouter(primary, StreamingProvider("xy"),
+                           breaker=CircuitBreakerConfig(failure_threshold=2, open_duration_secs=0.0))
+        for _ in range(2):
+            list(router.stream("sys", _MSGS))
+        assert router._breakers[0].state == "open"
+        primary.fail_after = None
+        chunks = router.stream("sys", _MSGS)
+        assert next(chunks) == "a"
+        chunks.close()
+        assert router._breakers[0].state == "closed"
+        assert "".join(router.stream("sys", _MSGS)) == "abc"
+
+    def test_unexpected_error_releases_probe(self):
+        class Broken(FakeProvider):
+            def complete(self, system, messages, **kwargs):
+                self.calls.append(kwargs)
+                if self.fail == "bug":
+                    raise RuntimeError("bug")
+                return super().complete(system, messages, **kwargs)
+
+        primary = Broken("a", fail=True)
+        router = self._half_open(primary)
+        primary.fail = "bug"
+        with pytest.raises(RuntimeError):
+            router.complete("sys", _MSGS)
+        assert router._breakers[0]._probes == 0
+        primary.fail = False
+        assert router.complete("sys", _MSGS).text == "a"
+
+    def test_primary_still_tried_without_fallback(self):
+        primary = FakeProvider("a", fail=True)
+        router = LLMRouter(primary, breaker=CircuitBreakerConfig(failure_threshold=1))
+        for _ in range(2):
+            with pytest.raises(LLMProviderError):
+                router.complete("sys", _MSGS)
+        assert len(primary.calls) == 2
+
+
+class TestCacheMarker:
+    def test_passed_to_caching_provider(self):
+        primary = FakeProvider(prompt_cache=True)
+        LLMRouter(primary).complete("sys", _MSGS, cache_marker=True)
+        assert primary.calls == [{"cache_marker": True}]
+
+    def test_dropped_for_other_providers(self):
+        primary = FakeProvider()
+        LLMRouter(primary).complete("sys", _MSGS, cache_marker=True)
+        assert primary.calls == [{}]
+
+    def test_off_by_default(self):
+        primary = FakeProvider(prompt_cache=True)
+        LLMRouter(primary).complete("sys", _MSGS)
+        assert primary.calls == [{}]
+
+
+class TestStream:
+    def test_default_stream_yields_complete_text(self):
+        router = LLMRouter(FakeProvider("whole"))
+        assert list(router.stream("sys", _MSGS)) == ["whole"]
+
+    def test_incremental_chunks(self):
+        router = LLMRouter(StreamingProvider("abc"))
+        assert list(router.stream("sys", _MSGS)) == ["a", "b", "c"]
+
+    def test_fallback_before_first_chunk(self):
+        router = LLMRouter(StreamingProvider("abc", fail_after=0), StreamingProvider("xy"))
+        assert "".join(router.stream("sys", _MSGS)) == "xy"
+
+    def test_error_after_output_propagates(self):
+        router = LLMRouter(StreamingProvider("abc", fail_after=2), StreamingProvider("xy"))
+        with pytest.raises(LLMProviderError):
+            list(router.stream("sys", _MSGS))
+
+
+class TestLoadProvider:
+    def test_name_is_normalised(self):
+        from agents.llm.providers.subprocess_provider import SubprocessProvider
+        from agents.llm.registry import _load_provider
+        provider = _load_provider(LLMConfig(provider="Subprocess", subprocess_cmd="no-such-cli"))
+        assert isinstance(provider, SubprocessProvider)
+
+    def test_class_is_cached(self, monkeypatch):
+        from agents.llm import registry
+        registry._load_provider(LLMConfig(provider="subprocess", subprocess_cmd="no-such-cli"))
+        monkeypatch.setattr(registry.importlib, "import_module", lambda name: pytest.fail(name))
+        registry._load_provider(LLMConfig(provider="subprocess", subprocess_cmd="no-such-cli"))
+        assert "subprocess" in registry._PROVIDER_CLASS_CACHE
+
+    def test_unknown_provider(self):
+        from agents.llm.registry import _load_provider
+        with pytest.raises(ValueError, match="Unknown provider 'nope'"):
+            _load_provider(LLMConfig(provider="nope"))
+
+
+class TestConfigFromEnv:
+    def test_cached_until_env_changes(self, monkeypatch):
+        from agents.llm import registry
+        monkeypatch.setattr(registry, "_env_config_cache", None)
+        monkeypatch.setenv("LLM_PROVIDER", "ollama")
+        builds = []
+        build = LLMRouter._build_config_from_env
+        monkeypatch.setattr(LLMRouter, "_build_config_from_env",
+                            staticmethod(lambda env: builds.append(1) or build(env)))
+        LLMRouter._config_from_env()
+        LLMRouter._config_from_env()
+        assert len(builds) == 1
+        monkeypatch.setenv("LLM_MODEL", "other")
+        assert LLMRouter._config_from_env().model == "other"
+        assert len(builds) == 2
+
+    def test_hit_skips_environment_snapshot(self, monkeypatch):
+        import os
+        from agents.llm import registry
+        monkeypatch.setattr(registry, "_env_config_cache", None)
+        monkeypatch.setenv("LLM_PROVIDER", "ollama")
+        LLMRouter._config_from_env()
+        monkeypatch.setattr(type(os.environ), "copy", lambda self: pytest.fail("snapshot"))
+        assert LLMRouter._config_from_env().provider == "ollama"
+
+    def test_returns_independent_copies(self, monkeypatch):
+        from agents.llm import registry
+        monkeypatch.setattr(registry, "_env_config_cache", None)
+        monkeypatch.setenv("LLM_PROVIDER", "subprocess")
+        monkeypatch.setenv("LLM_SUBPROCESS_ARGS", "-q")
+        first = LLMRouter._config_from_env()
+        first.model = "changed"
+        first.subprocess_args = ["--other"]
+        again = LLMRouter._config_from_env()
+        assert again is not first
+        assert (again.model, again.subprocess_args) != ("changed", ["--other"])
+        assert again.subprocess_args == ["-q"]
+
+
+class TestFromCliArgs:
+    def _config(self, monkeypatch, **opts):
+        import argparse
+        monkeypatch.setattr(LLMRouter, "from_config", classmethod(lambda cls, cfg: cfg))
+        monkeypatch.setenv("LLM_PROVIDER", "ollama")
+        return LLMRouter.from_cli_args(argparse.Namespace(**opts))
+
+    def test_overrides_applied(self, monkeypatch):
+        cfg = self._config(monkeypatch, llm_model="m", llm_timeout="30",
+                           llm_max_retries=-1, llm_subprocess_args=("-q",))
+        assert (cfg.model, cfg.timeout_seconds, cfg.max_retries) == ("m", 30, 0)
+        assert cfg.subprocess_args == ["-q"]
+
+    def test_unset_and_empty_values_ignored(self, monkeypatch):
+        cfg = self._config(monkeypatch, llm_model="", llm_max_tokens=None)
+        assert cfg.model == LLMConfig().model
+        assert cfg.max_tokens == LLMConfig().max_tokens
+
+    def test_zero_retries_kept(self, monkeypatch):
+        assert self._config(monkeypatch, llm_max_retries=0).max_retries == 0
+
+    def test_no_llm(self, monkeypatch):
+        assert self._config(monkeypatch, no_llm=True) is None
+
+
+class TestWithModel:
+    def test_derived_router_uses_new_model(self, monkeypatch):
+        from agents.llm import registry
+        monkeypatch.setattr(registry, "_load_provider", lambda cfg: FakeProvider(cfg.model))
+        fallback = FakeProvider("fb")
+        router = LLMRouter(FakeProvider("strong"), fallback)
+        cheap = router.with_model("cheap")
+        assert cheap.model_name == "cheap-model"
+        assert cheap._fallback is fallback
+        assert router.model_name == "strong-model"
+
+
+class TestAcomplete:
+    def test_primary(self):
+        router = LLMRouter(FakeProvider("a"), FakeProvider("b"))
+        assert asyncio.run(router.acomplete("sys", _MSGS)).text == "a"
+
+    def test_fallback_on_error(self):
+        router = LLMRouter(FakeProvider("a", fail=True), FakeProvider("b"))
+        assert asyncio.run(router.acomplete("sys", _MSGS)).text == "b"
+
+    def test_cache_marker_forwarded(self):
+        primary = FakeProvider(prompt_cache=True)
+        asyncio.run(LLMRouter(primary).acomplete("sys", _MSGS, cache_marker=True))
+        assert primary.calls == [{"cache_marker": True}]
+
+
+class TestPrefetch:
+    def test_returns_future(self):
+        router = LLMRouter(FakeProvider("a"))
+        assert router.prefetch("sys", _MSGS).result(timeout=5).text == "a"
+        router.close()
+
+    def test_identical_requests_are_coalesced(self):
+        entered, release = threading.Event(), threading.Event()
+
+        class Slow(FakeProvider):
+            def complete(self, system, messages, **kwargs):
+                entered.set()
+                release.wait(5)
+                return super().complete(system, messages, **kwargs)
+
+        primary = Slow("a")
+        router = LLMRouter(primary)
+        first = router.prefetch("sys", _MSGS)
+        assert entered.wait(5)
+        assert router.prefetch("sys", _MSGS) is first
+        release.set()
+        assert first.result(timeout=5).text == "a"
+        assert len(primary.calls) == 1
+        router.close()
+
+    def test_complete_skips_hashing_without_prefetch(self, monkeypatch):
+        monkeypatch.setattr(LLMRouter, "_request_key", staticmethod(lambda *a: pytest.fail("hashed")))
+        assert LLMRouter(FakeProvider("a")).complete("sys", _MSGS).text == "a"
+
+    def test_errors_reach_the_future(self):
+        router = LLMRouter(FakeProvider("a", fail=True))
+        with pytest.raises(LLMProviderError):
+            router.prefetch("sys", _MSGS).result(timeout=5)
+        assert router._inflight == {}
+        router.close()
+
+
+class TestCompleteMany:
+    def test_results_in_order(self):
+        class Echo(FakeProvider):
+            def complete(self, system, messages, **kwargs):
+                return LLMResponse(text=messages[0].content, model="m", provider="echo")
+
+        batch = [[LLMMessage(role="user", content=str(i))] for i in range(5)]
+        responses = LLMRouter(Echo()).complete_many("sys", batch, max_concurrency=2)
+        assert [r.text for r in responses] == ["0", "1", "2", "3", "4"]
+
+    def test_fallback_per_request(self):
+        router = LLMRouter(FakeProvider("a", fail=True), FakeProvider("b"))
+        assert [r.text for r in router.complete_many("sys", [_MSGS, _MSGS])] == ["b", "b"]
+
+    def test_empty_batch(self):
+        assert LLMRouter(FakeProvider()).complete_many("sys", []) == []
+
+    def test_async_clients_closed(self):
+        closed = []
+
+        class Closing(FakeProvider):
+            async def aclose(self):
+                closed.append(self.config.provider)
+
+        router = LLMRouter(Closing("a"), Closing("b"))
+        router.complete_many("sys", [_MSGS])
+        assert closed == ["a", "b"]
+
+
+class TestClose:
+    def test_closes_both_providers(self):
+        class Client:
+            closed = False
+
+            def close(self):
+                self.closed = True
+
+        primary, fallback = FakeProvider("a"), FakeProvider("b")
+        clients = [Client(), Client()]
+        primary._client, fallback._client = clients
+        with LLMRouter(primary, fallback) as router:
+            assert router.is_available
+        assert all(c.closed for c in clients)
+        assert not router.is_available
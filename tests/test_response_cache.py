@@ -0,0 +1,68 @@
+"""
+Tests for agents.llm.response_cache — the SQLite-backed LLM response cache.
+"""
+
+import threading
+
+import pytest
+
+from agents.llm import LLMResponse
+from agents.llm.response_cache import DEFAULT_CACHE_PATH, ResponseCache, default_cache_path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = ResponseCache(tmp_path / "nested" / "cache.db")
+    yield c
+    c.close()
+
+
+class TestResponseCache:
+    def test_miss_then_hit(self, cache):
+        key = ResponseCache.make_key("a", "b")
+        assert cache.get(key) is None
+        cache.put(key, LLMResponse(text="code", model="m", provider="p"))
+        hit = cache.get(key)
+        assert (hit.text, hit.model, hit.provider) == ("code", "m", "p")
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_key_respects_part_boundaries(self):
+        assert ResponseCache.make_key("ab", "c") != ResponseCache.make_key("a", "bc")
+        assert ResponseCache.make_key("x") == ResponseCache.make_key("x")
+
+    def test_persists_across_instances(self, tmp_path):
+        path = tmp_path / "cache.db"
+        first = ResponseCache(path)
+        first.put("k", LLMResponse(text="t", model="m", provider="p"))
+        first.close()
+        second = ResponseCache(path)
+        assert second.get("k").text == "t"
+        second.close()
+
+    def test_shared_across_threads(self, cache):
+        def work(i):
+            cache.put(f"k{i}", LLMResponse(text=str(i), model="m", provider="p"))
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(cache) == 8
+
+    def test_clear(self, cache):
+        cache.put("k", LLMResponse(text="t", model="m", provider="p"))
+        cache.clear()
+        assert len(cache) == 0
+
+
+class TestDefaultPath:
+    def test_env_overrides_directory(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("LLM_CACHE_DIR", str(tmp_path / "llm"))
+        assert default_cache_path() == tmp_path / "llm" / "llm_cache.db"
+        cache = ResponseCache()
+        assert cache.path == tmp_path / "llm" / "llm_cache.db"
+        cache.close()
+
+    def test_falls_back_to_home_cache(self, monkeypatch):
+        monkeypatch.delenv("LLM_CACHE_DIR", raising=False)
+        assert default_cache_path() == DEFAULT_CACHE_PATH
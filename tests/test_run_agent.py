@@ -109,6 +109,12 @@ class TestJobToArgs:
         assert ns.llm_model == "claude-opus-4-5"
         assert ns.no_llm is True
 
+    def test_llm_cache(self):
+        assert _job_to_args({}).llm_cache is None
+        assert _job_to_args({"llm": {"cache": False}}).llm_cache is None
+        assert _job_to_args({"llm": {"cache": True}}).llm_cache is True
+        assert _job_to_args({"llm": {"cache": "/tmp/c.db"}}).llm_cache == "/tmp/c.db"
+
     def test_orchestration_config(self):
         job = {
             "orchestration": {